@@ -13,6 +13,8 @@ from dotenv import load_dotenv
 from routers import pools, analytics, whitelist, positions
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from src.dex.async_web3_client import close_async_web3_client
+from src.dex.rpc_pool import get_rpc_pool_stats
 
 # Load environment variables
 load_dotenv()
@@ -44,6 +46,12 @@ app.include_router(whitelist.router, prefix="/api/whitelist", tags=["whitelist"]
 app.include_router(positions.router, prefix="/api/positions", tags=["positions"])
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Close pooled RPC connections"""
+    await close_async_web3_client()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -74,6 +82,16 @@ async def api_health_check():
         "database": "connected"
     }
 
+@app.get("/api/health/rpc")
+async def rpc_health_check():
+    """Per-endpoint RPC pool latency, error rate and rate limiting"""
+    pools = get_rpc_pool_stats()
+    healthy = all(any(endpoint["healthy"] for endpoint in pool) for pool in pools)
+    return {
+        "status": "healthy" if healthy else "degraded",
+        "pools": pools
+    }
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", os.getenv("BACKEND_PORT", 8000)))
     uvicorn.run(
@@ -3,6 +3,7 @@ Analytics endpoints for price data, volatility, and strategy recommendations
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import pandas as pd
@@ -16,6 +17,13 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from database import get_db, PriceData
+from monte_carlo import (
+    log_returns,
+    sample_interval_minutes,
+    simulate_range_exit,
+    tick_range_barriers,
+    DEFAULT_NUM_PATHS,
+)
 
 # Import the lazy initialization dependency
 from dependencies import ensure_db_initialized
@@ -29,6 +37,9 @@ cg = CoinGeckoAPI()
 price_cache = {}
 cache_duration = 300  # 5 minutes
 
+# Paths for the quick out-of-range estimate used in recommendations
+LIQUIDATION_NUM_PATHS = 20_000
+
 def get_coingecko_api_key() -> Optional[str]:
     """Get CoinGecko API key from environment or return None for free tier"""
     return os.getenv('COINGECKO_API_KEY')
@@ -141,13 +152,26 @@ def calculate_volatility(prices: List[float]) -> float:
     
     return np.std(price_changes) * 100  # Return as percentage
 
-def calculate_liquidation_probability(volatility: float, tick_range: int) -> float:
-    """Calculate probability of position going out of range"""
-    # Simplified calculation based on volatility and tick range
-    # In reality, this would be more sophisticated
-    range_percentage = tick_range / 100  # Convert ticks to percentage
-    probability = min(volatility / range_percentage, 1.0) * 100
-    return round(probability, 2)
+def daily_volatility(returns: np.ndarray, interval_minutes: float) -> float:
+    """Daily volatility of log returns sampled every interval_minutes"""
+    return float(np.std(returns)) * np.sqrt(24 * 60 / interval_minutes)
+
+def calculate_liquidation_probability(price_data: List[dict], tick_range: int, horizon_minutes: float = 24 * 60) -> float:
+    """Simulated probability (%) of position going out of range within the horizon"""
+    returns = log_returns([point["price"] for point in price_data])
+    interval_minutes = sample_interval_minutes([point["timestamp"] for point in price_data])
+    if len(returns) < 2 or not interval_minutes:
+        return 0.0
+    volatility = daily_volatility(returns, interval_minutes)
+    if volatility <= 0:
+        return 0.0
+    lower, upper = tick_range_barriers(tick_range)
+    # Fixed seed so repeated requests for the same inputs agree
+    result = simulate_range_exit(
+        lower, upper, horizon_minutes, volatility,
+        num_paths=LIQUIDATION_NUM_PATHS, seed=0
+    )
+    return round(result["probability_out_of_range"] * 100, 2)
 
 @router.get("/{pool_address}/price-data")
 async def get_price_data(
@@ -158,7 +182,7 @@ async def get_price_data(
     """Get price data for a pool over specified timeframe"""
     
     # Fetch real price data from CoinGecko
-    price_data = fetch_real_price_data(pool_address, timeframe)
+    price_data = await run_in_threadpool(fetch_real_price_data, pool_address, timeframe)
     
     return {
         "pool_address": pool_address,
@@ -175,8 +199,13 @@ async def get_volatility_analysis(
 ):
     """Get volatility analysis for a pool"""
     
-    # Get price data
-    price_data = fetch_real_price_data(pool_address, timeframe)
+    # Get price data (CoinGecko request off the event loop)
+    price_data = await run_in_threadpool(fetch_real_price_data, pool_address, timeframe)
+    
+    return volatility_analysis(pool_address, timeframe, price_data)
+
+def volatility_analysis(pool_address: str, timeframe: str, price_data: List[dict]) -> dict:
+    """Volatility analysis of a pool's price data"""
     prices = [point["price"] for point in price_data]
     
     # Calculate metrics
@@ -228,8 +257,9 @@ async def get_strategy_recommendations(
 ):
     """Get strategy recommendations based on pool analytics"""
     
-    # Get volatility data
-    volatility_data = await get_volatility_analysis(pool_address, "1d", db)
+    # Get volatility data (one price series for the volatility and the simulation)
+    price_data = await run_in_threadpool(fetch_real_price_data, pool_address, "1d")
+    volatility_data = volatility_analysis(pool_address, "1d", price_data)
     volatility = volatility_data["volatility_percentage"]
     current_price = volatility_data["current_price"]
     
@@ -244,8 +274,8 @@ async def get_strategy_recommendations(
         tick_range = max(50, int(volatility * 2))    # Tighter range for higher risk
         check_interval = 60   # 1 minute
     
-    # Calculate liquidation probability
-    liquidation_prob = calculate_liquidation_probability(volatility, tick_range)
+    # Calculate liquidation probability (simulated off the event loop)
+    liquidation_prob = await run_in_threadpool(calculate_liquidation_probability, price_data, tick_range)
     
     # Calculate expected APR (simplified)
     base_apr = 8.0  # Base APR for the pool
@@ -286,12 +316,12 @@ async def get_liquidation_probability(
 ):
     """Calculate liquidation probability for a given tick range"""
     
-    # Get volatility data
-    volatility_data = await get_volatility_analysis(pool_address, timeframe, db)
-    volatility = volatility_data["volatility_percentage"]
+    # Get volatility data (one price series for the volatility and the simulation)
+    price_data = await run_in_threadpool(fetch_real_price_data, pool_address, timeframe)
+    volatility = volatility_analysis(pool_address, timeframe, price_data)["volatility_percentage"]
     
-    # Calculate probability
-    probability = calculate_liquidation_probability(volatility, tick_range)
+    # Calculate probability (simulated off the event loop)
+    probability = await run_in_threadpool(calculate_liquidation_probability, price_data, tick_range)
     
     return {
         "pool_address": pool_address,
@@ -308,55 +338,73 @@ async def get_out_of_range_probability(
     tick_range: int = Query(50, ge=10, le=1000),
     check_interval_minutes: int = Query(60, ge=1, le=1440),
     timeframe: str = Query("1d", regex="^(1d|1m|1y)$"),
+    method: str = Query("gbm", regex="^(gbm|bootstrap)$"),
+    num_paths: int = Query(DEFAULT_NUM_PATHS, ge=1000, le=1_000_000),
+    seed: Optional[int] = Query(None),
     db: Session = Depends(get_db)
 ):
-    """Calculate probability of position going out of range over specified time interval"""
-    
-    # Get volatility data
-    volatility_data = await get_volatility_analysis(pool_address, timeframe, db)
-    volatility = volatility_data["volatility_percentage"]
-    current_price = volatility_data["current_price"]
+    """Simulate probability and timing of position going out of range within the check interval"""
     
-    # Convert volatility from percentage to decimal
-    volatility_decimal = volatility / 100
-    
-    # Calculate range bounds in price terms
-    range_percentage = tick_range / 100  # Convert ticks to percentage
-    price_lower = current_price * (1 - range_percentage / 100)
-    price_upper = current_price * (1 + range_percentage / 100)
-    
-    # Calculate time-adjusted volatility
-    # Assuming volatility scales with square root of time
-    time_factor = np.sqrt(check_interval_minutes / (24 * 60))  # Normalize to daily
-    adjusted_volatility = volatility_decimal * time_factor
-    
-    # Calculate probability using normal distribution
-    # P(out of range) = 1 - P(price stays within bounds)
-    from scipy.stats import norm
-    
-    # Calculate z-scores for upper and lower bounds
-    z_upper = (price_upper - current_price) / (current_price * adjusted_volatility)
-    z_lower = (price_lower - current_price) / (current_price * adjusted_volatility)
-    
-    # Calculate probability of staying within range
-    prob_within_range = norm.cdf(z_upper) - norm.cdf(z_lower)
-    prob_out_of_range = 1 - prob_within_range
+    # Historical returns drive both the GBM volatility and the bootstrap
+    price_data = await run_in_threadpool(fetch_real_price_data, pool_address, timeframe)
+    prices = [point["price"] for point in price_data]
+    returns = log_returns(prices)
+    interval_minutes = sample_interval_minutes([point["timestamp"] for point in price_data])
+    if len(returns) < 2 or not interval_minutes:
+        raise HTTPException(status_code=503, detail="Not enough price history to simulate")
+    
+    current_price = prices[-1]
+    volatility = daily_volatility(returns, interval_minutes)
+    
+    # Symmetric range of tick_range ticks either side of the current price
+    lower, upper = tick_range_barriers(tick_range)
+    price_lower = current_price * np.exp(lower)
+    price_upper = current_price * np.exp(upper)
+    
+    # Keep the event loop free while the simulation runs
+    result = await run_in_threadpool(
+        simulate_range_exit,
+        lower,
+        upper,
+        check_interval_minutes,
+        volatility,
+        returns=returns,
+        returns_interval_minutes=interval_minutes,
+        method=method,
+        num_paths=num_paths,
+        seed=seed
+    )
     
     # Convert to percentage
-    prob_out_of_range_pct = max(0, min(100, prob_out_of_range * 100))
+    prob_out_of_range_pct = result["probability_out_of_range"] * 100
+    expected_exit = result["expected_exit_minutes"]
     
     return {
         "pool_address": pool_address,
         "tick_range": tick_range,
         "check_interval_minutes": check_interval_minutes,
         "timeframe": timeframe,
-        "volatility_percentage": volatility,
+        "volatility_percentage": round(result["daily_volatility"] * 100, 2),
         "current_price": current_price,
         "price_bounds": {
             "lower": round(price_lower, 2),
             "upper": round(price_upper, 2)
         },
         "out_of_range_probability": round(prob_out_of_range_pct, 2),
+        "exit_probability": {
+            "lower": round(result["probability_exit_lower"] * 100, 2),
+            "upper": round(result["probability_exit_upper"] * 100, 2)
+        },
+        "expected_exit_minutes": round(expected_exit, 2) if expected_exit is not None else None,
+        "expected_time_in_range_minutes": round(result["expected_time_in_range_minutes"], 2),
+        "survival_curve": result["survival_curve"],
+        "simulation": {
+            "method": method,
+            "num_paths": result["num_paths"],
+            "num_steps": result["num_steps"],
+            "seed": seed,
+            "elapsed_ms": round(result["elapsed_ms"], 2)
+        },
         "risk_level": "low" if prob_out_of_range_pct < 20 else "medium" if prob_out_of_range_pct < 50 else "high",
         "recommendation": get_risk_recommendation(prob_out_of_range_pct, tick_range)
     }
@@ -6,6 +6,7 @@ Fetches Uniswap V3 pool data and provides it to the frontend
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import asyncio
 import requests
 import time
 from datetime import datetime, timedelta
@@ -13,7 +14,10 @@ from datetime import datetime, timedelta
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 from database import get_db, Pool, PriceData
+from src.dex.async_uniswap import get_async_uniswap
+from src.utils.tick_math import sqrt_price_x96_to_price
 
 # Import the lazy initialization dependency
 from dependencies import ensure_db_initialized
@@ -264,38 +268,83 @@ async def get_pools(
     
     return result
 
+def get_known_pool(pool_address: str) -> Optional[PoolData]:
+    """Find a pool in the hardcoded list by address"""
+    for pool in get_hardcoded_pools():
+        if pool.address.lower() == pool_address.lower():
+            return pool
+    return None
+
 @router.get("/{pool_address}")
 async def get_pool_details(pool_address: str):
     """Get detailed information about a specific pool"""
     
-    # For now, return basic pool info
-    # In production, this would fetch detailed pool data
+    uniswap = get_async_uniswap()
+    try:
+        info = await uniswap.get_pool_info(pool_address)
+        tokens = await uniswap.get_tokens_metadata([info["token0"], info["token1"]])
+    except Exception as e:
+        print(f"Error reading pool {pool_address}: {e}")
+        raise HTTPException(status_code=502, detail=f"Could not read pool {pool_address}")
+    
+    token0 = tokens[info["token0"]]["symbol"]
+    token1 = tokens[info["token1"]]["symbol"]
+    
+    # Market data is not on-chain; use the known pool list where available
+    known = get_known_pool(pool_address)
+    
     return {
         "address": pool_address,
-        "name": "WETH-USDC",  # This would be fetched from the pool
-        "token0": "WETH",
-        "token1": "USDC",
-        "fee_tier": 500,
-        "tvl": 5000000.0,
-        "apr": 12.5,
-        "volume_1d": 1000000.0,
-        "volume_30d": 30000000.0
+        "name": f"{token0}-{token1}",
+        "token0": token0,
+        "token1": token1,
+        "token0_address": info["token0"],
+        "token1_address": info["token1"],
+        "fee_tier": info["fee"],
+        "tick_spacing": info["tickSpacing"],
+        "tvl": known.tvl if known else 0.0,
+        "apr": known.apr if known else 0.0,
+        "volume_1d": known.volume_1d if known else 0.0,
+        "volume_30d": known.volume_30d if known else 0.0
     }
 
 @router.get("/{pool_address}/stats")
 async def get_pool_stats(pool_address: str):
     """Get pool statistics and metrics"""
     
-    # This would calculate real statistics
+    uniswap = get_async_uniswap()
+    try:
+        # Immutables are cached after the first request; state is read fresh
+        info, states = await asyncio.gather(
+            uniswap.get_pool_info(pool_address),
+            uniswap.get_pools_state([pool_address])
+        )
+        if not states:
+            raise ValueError("slot0/liquidity read failed")
+        state = list(states.values())[0]
+        tokens = await uniswap.get_tokens_metadata([info["token0"], info["token1"]])
+    except Exception as e:
+        print(f"Error reading pool {pool_address}: {e}")
+        raise HTTPException(status_code=502, detail=f"Could not read pool {pool_address}")
+    
+    current_price = sqrt_price_x96_to_price(
+        state["sqrtPriceX96"],
+        tokens[info["token0"]]["decimals"],
+        tokens[info["token1"]]["decimals"]
+    )
+    
+    # Price changes and liquidity distribution would need indexed history
     return {
         "pool_address": pool_address,
-        "current_price": 2500.0,  # This would be fetched from the pool
+        "current_price": current_price,
+        "current_tick": state["tick"],
+        "liquidity": state["liquidity"],
         "price_change_1d": 2.5,
         "price_change_7d": -1.2,
         "liquidity_distribution": {
             "concentrated": 0.7,
             "full_range": 0.3
         },
-        "fee_tier": 500,
-        "tick_spacing": 10
+        "fee_tier": info["fee"],
+        "tick_spacing": info["tickSpacing"]
     }
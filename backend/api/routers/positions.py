@@ -3,7 +3,8 @@ Position management endpoints
 Handles user position creation, monitoring, and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
@@ -19,6 +20,9 @@ from dependencies import ensure_db_initialized
 
 router = APIRouter()
 
+# Most rows returned by one change feed page
+CHANGE_FEED_PAGE_SIZE = 1000
+
 class CreatePositionRequest(BaseModel):
     user_address: str
     pool_address: str
@@ -131,6 +135,67 @@ async def get_user_positions_endpoint(
         for pos in positions
     ]
 
+def _monitor_row(pos: UserPosition) -> dict:
+    """Position fields the monitoring service uses"""
+    return {
+        "id": pos.id,
+        "user_address": pos.user_address,
+        "token_id": pos.token_id,
+        "pool_address": pos.pool_address,
+        "tick_lower": pos.tick_lower,
+        "tick_upper": pos.tick_upper,
+        "amount0": pos.amount0,
+        "amount1": pos.amount1,
+        "check_interval": pos.check_interval,
+        "active": pos.active,
+        "created_at": pos.created_at.isoformat(),
+        "updated_at": pos.updated_at.isoformat()
+    }
+
+@router.get("/changes")
+async def get_position_changes(
+    since: Optional[datetime] = None,
+    after_id: int = 0,
+    limit: int = Query(CHANGE_FEED_PAGE_SIZE, ge=1, le=10 * CHANGE_FEED_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """
+    Positions created, updated, paused or deleted since a cursor (for monitoring service)
+    
+    Without since, returns every active position and the cursor to follow
+    changes from. With since, returns the rows whose (updated_at, id) is past
+    (since, after_id), active or not, oldest first and a page at a time;
+    inactive rows mean the position was paused or deleted.
+    """
+    if since is None:
+        # Read the cursor first: rows changed while the snapshot is read are
+        # returned again by the next sync
+        latest = db.query(func.max(UserPosition.updated_at)).scalar()
+        latest_id = db.query(func.max(UserPosition.id)).filter(UserPosition.updated_at == latest).scalar() if latest else 0
+        positions = db.query(UserPosition).filter(UserPosition.active == True).all()
+        return {
+            "positions": [_monitor_row(pos) for pos in positions],
+            "cursor": {"since": latest.isoformat() if latest else None, "after_id": latest_id or 0},
+            "has_more": False
+        }
+    
+    positions = db.query(UserPosition).filter(or_(
+        UserPosition.updated_at > since,
+        and_(UserPosition.updated_at == since, UserPosition.id > after_id)
+    )).order_by(UserPosition.updated_at, UserPosition.id).limit(limit + 1).all()
+    
+    has_more = len(positions) > limit
+    positions = positions[:limit]
+    last = positions[-1] if positions else None
+    return {
+        "positions": [_monitor_row(pos) for pos in positions],
+        "cursor": {
+            "since": last.updated_at.isoformat() if last else since.isoformat(),
+            "after_id": last.id if last else after_id
+        },
+        "has_more": has_more
+    }
+
 @router.get("/{position_id}")
 async def get_position_details(
     position_id: int,
@@ -254,22 +319,7 @@ async def get_all_active_positions(db: Session = Depends(get_db)):
         UserPosition.active == True
     ).all()
     
-    return [
-        {
-            "id": pos.id,
-            "user_address": pos.user_address,
-            "token_id": pos.token_id,
-            "pool_address": pos.pool_address,
-            "tick_lower": pos.tick_lower,
-            "tick_upper": pos.tick_upper,
-            "amount0": pos.amount0,
-            "amount1": pos.amount1,
-            "check_interval": pos.check_interval,
-            "created_at": pos.created_at.isoformat(),
-            "updated_at": pos.updated_at.isoformat()
-        }
-        for pos in active_positions
-    ]
+    return [_monitor_row(pos) for pos in active_positions]
 
 @router.get("/stats/overview")
 async def get_positions_overview(db: Session = Depends(get_db)):
@@ -72,7 +72,7 @@ class UserPosition(Base):
     check_interval = Column(Integer, default=60)  # seconds
     active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Change feed cursor
 
 class PriceData(Base):
     __tablename__ = "price_data"
@@ -82,6 +82,21 @@ class PriceData(Base):
     price = Column(Float, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
 
+class MonitorLease(Base):
+    __tablename__ = "monitor_leases"
+    
+    shard = Column(Integer, primary_key=True)
+    owner = Column(String(128), nullable=True)  # Worker id, None when released
+    expires_at = Column(DateTime, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+class MonitorWorker(Base):
+    __tablename__ = "monitor_workers"
+    
+    worker_id = Column(String(128), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    heartbeat_at = Column(DateTime, nullable=False)
+
 # Database functions
 def get_db():
     """Get database session"""
@@ -94,6 +109,9 @@ def get_db():
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that exist; add indexes introduced since
+    for index in UserPosition.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
     print("✅ Database initialized successfully")
 
 def add_whitelist_user(db, address: str, email: str = None, reason: str = None):
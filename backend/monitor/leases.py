@@ -0,0 +1,221 @@
+"""
+Shard leases for running several monitor workers
+
+The active positions are split into a fixed number of shards (by pool or
+by position id) and each worker monitors only the shards it holds a lease
+on. Leases are rows in the application database. A worker claims one with
+a conditional UPDATE that only matches a free or expired row, and renews
+its leases on every heartbeat, so a shard has at most one owner at a time.
+A worker that dies stops renewing, and the others claim its shards once the
+leases expire (within one lease period).
+
+Workers aim for an equal share of the shards among the live workers (those
+with an unexpired monitor_workers row) and release extras when workers
+join. A released shard only becomes claimable when its lease runs out, and
+confirm() renews a lease right before rebalance commands are sent, so a
+new owner can't act on a shard while the previous owner may still be
+sending a rebalance.
+
+Lease times come from each worker's clock (UTC): workers on several hosts
+need clocks in sync to well within the lease period, and every worker must
+use the same number of shards.
+"""
+
+import math
+import os
+import socket
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Set, Tuple
+
+from sqlalchemy import delete, func, inspect, select, update
+from sqlalchemy.exc import DatabaseError, IntegrityError
+
+from backend.database import MonitorLease, MonitorWorker, SessionLocal
+
+SHARD_BY = ('pool', 'position')
+
+# expires_at of a shard nobody has claimed yet
+NEVER_CLAIMED = datetime(1970, 1, 1)
+
+
+def shard_of(position: Dict[str, Any], shards: int, shard_by: str = 'pool') -> int:
+    """
+    Shard of a position (the same in every process)
+
+    Args:
+        position: Position dict with id and pool_address
+        shards: Number of shards
+        shard_by: 'pool' (a pool's positions stay on one worker, which reads
+            the pool once) or 'position' (even split when there are few pools)
+
+    Returns:
+        Shard number
+    """
+    key = position["pool_address"].lower() if shard_by == 'pool' else str(position["id"])
+    return zlib.crc32(key.encode()) % shards
+
+
+def default_worker_id() -> str:
+    """Worker id unique to this process"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ShardLeases:
+    """Shard leases held by one monitor worker"""
+
+    def __init__(self, shards: int, lease_seconds: float = 30, worker_id: str = None, session_factory=SessionLocal):
+        """
+        Initialize leases (nothing is claimed until the first heartbeat)
+
+        Args:
+            shards: Number of shards the positions are split into
+            lease_seconds: How long a lease lasts without renewal
+            worker_id: Unique id of this worker (default: host:pid)
+            session_factory: SQLAlchemy session factory of the database
+        """
+        if shards < 1:
+            raise ValueError(f"Need at least one shard, got {shards}")
+        self.shards = shards
+        self.lease = timedelta(seconds=lease_seconds)
+        self.worker_id = worker_id or default_worker_id()
+        self.session_factory = session_factory
+        self.owned: Set[int] = set()
+        self._setup_done = False
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        """How often heartbeat() should run (a third of the lease)"""
+        return self.lease.total_seconds() / 3
+
+    def heartbeat(self) -> Tuple[Set[int], Set[int]]:
+        """
+        Renew held leases, then claim or release shards toward an equal share
+
+        Returns:
+            (shards gained, shards lost) since the last heartbeat
+        """
+        now = datetime.utcnow()
+        expires = now + self.lease
+
+        with self.session_factory() as session:
+            if not self._setup_done:
+                self._setup(session)
+
+            worker = session.get(MonitorWorker, self.worker_id)
+            if worker is None:
+                session.add(MonitorWorker(worker_id=self.worker_id, expires_at=expires, heartbeat_at=now))
+            else:
+                worker.expires_at = expires
+                worker.heartbeat_at = now
+            session.execute(
+                update(MonitorLease)
+                .where(MonitorLease.owner == self.worker_id, MonitorLease.shard < self.shards)
+                .values(expires_at=expires, heartbeat_at=now)
+            )
+            session.commit()
+
+            held = set(session.scalars(
+                select(MonitorLease.shard).where(MonitorLease.owner == self.worker_id, MonitorLease.shard < self.shards)
+            ))
+            live_workers = session.scalar(
+                select(func.count()).select_from(MonitorWorker).where(MonitorWorker.expires_at > now)
+            )
+            target = math.ceil(self.shards / max(live_workers, 1))
+
+            if len(held) < target:
+                free = list(session.scalars(
+                    select(MonitorLease.shard)
+                    .where(MonitorLease.shard < self.shards, MonitorLease.expires_at < now)
+                    .order_by(MonitorLease.shard)
+                ))
+                for shard in free:
+                    if len(held) >= target:
+                        break
+                    # Only matches if no other worker claimed it first
+                    result = session.execute(
+                        update(MonitorLease)
+                        .where(MonitorLease.shard == shard, MonitorLease.expires_at < now)
+                        .values(owner=self.worker_id, expires_at=expires, heartbeat_at=now)
+                    )
+                    session.commit()
+                    if result.rowcount == 1:
+                        held.add(shard)
+            elif len(held) > target:
+                # Released leases keep their expiry: nobody claims them until it passes
+                for shard in sorted(held)[target:]:
+                    session.execute(
+                        update(MonitorLease)
+                        .where(MonitorLease.shard == shard, MonitorLease.owner == self.worker_id)
+                        .values(owner=None)
+                    )
+                    held.discard(shard)
+                session.commit()
+
+            # Forget workers that stopped a while ago
+            session.execute(delete(MonitorWorker).where(MonitorWorker.expires_at < now - self.lease))
+            session.commit()
+
+        gained, lost = held - self.owned, self.owned - held
+        self.owned = held
+        return gained, lost
+
+    def confirm(self, shards: Iterable[int]) -> Set[int]:
+        """
+        Renew leases right before acting on their shards
+
+        A renewed lease can't be claimed by another worker for a full lease
+        period, so commands sent after confirm() returns a shard won't
+        overlap another worker's.
+
+        Args:
+            shards: Shards about to be acted on
+
+        Returns:
+            The shards still held by this worker
+        """
+        shards = list(shards)
+        if not shards:
+            return set()
+
+        now = datetime.utcnow()
+        with self.session_factory() as session:
+            session.execute(
+                update(MonitorLease)
+                .where(MonitorLease.owner == self.worker_id, MonitorLease.shard.in_(shards))
+                .values(expires_at=now + self.lease, heartbeat_at=now)
+            )
+            session.commit()
+            return set(session.scalars(
+                select(MonitorLease.shard).where(MonitorLease.owner == self.worker_id, MonitorLease.shard.in_(shards))
+            ))
+
+    def release_all(self):
+        """Give up every lease and leave the live workers (on shutdown)"""
+        with self.session_factory() as session:
+            session.execute(update(MonitorLease).where(MonitorLease.owner == self.worker_id).values(owner=None))
+            session.execute(delete(MonitorWorker).where(MonitorWorker.worker_id == self.worker_id))
+            session.commit()
+        self.owned = set()
+
+    def _setup(self, session):
+        """Create the lease tables and a row per shard if missing"""
+        bind = session.get_bind()
+        for table in (MonitorLease.__table__, MonitorWorker.__table__):
+            try:
+                table.create(bind=bind, checkfirst=True)
+            except DatabaseError:
+                # Created by another worker starting at the same time
+                if not inspect(bind).has_table(table.name):
+                    raise
+
+        existing = set(session.scalars(select(MonitorLease.shard)))
+        for shard in range(self.shards):
+            if shard in existing:
+                continue
+            session.add(MonitorLease(shard=shard, owner=None, expires_at=NEVER_CLAIMED))
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()  # Another worker added it
+        self._setup_done = True
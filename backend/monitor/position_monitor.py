@@ -8,18 +8,62 @@ import time
 import sys
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import requests
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+import aiohttp
 from datetime import datetime, timedelta
 import json
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.dex.uniswap import get_uniswap
+from src.dex.async_uniswap import get_async_uniswap
+from src.dex.head_tracker import get_head_tracker
+from src.dex.pool_mirror import get_pool_mirror
+from src.dex.abis import LIQUIDITY_MANAGER_ABI, POSITION_MANAGER_ABI
 from src.data.price_data import get_price_collector
 from src.utils.config import get_config
+from src.utils.tick_math import get_amounts_for_liquidity, get_sqrt_ratio_at_tick
 from src.utils.logger import log as logger
+from backend.monitor.leases import SHARD_BY, ShardLeases, shard_of
+from backend.monitor.position_table import PositionTable
+from backend.monitor.range_index import RangeIndex
+from backend.monitor.scheduler import CheckScheduler, edge_crossing_interval
+
+UINT128_MAX = 2**128 - 1
+
+# Slippage allowed below the simulated output of a rebalance swap
+SWAP_SLIPPAGE = 0.01
+
+# Rough gas per LiquidityManager command, used to pack executeCommands batches
+# (each batch is estimated on-chain before it is sent)
+COMMAND_GAS = {
+    'decrease_liquidity': 150000,
+    'increase_liquidity': 250000,
+    'collect_fees': 100000,
+    'swap': 180000,
+    'create_position': 600000,
+}
+DEFAULT_COMMAND_GAS = 300000
+EXECUTE_COMMANDS_BASE_GAS = 50000
+
+# Gas cap per executeCommands transaction (below the 2**24 per-transaction cap)
+DEFAULT_BATCH_GAS_LIMIT = 15000000
+
+# How often the local position table is synced with the backend's change feed
+POSITION_REFRESH_SECONDS = 30
+
+# Each sync re-reads changes this far behind its cursor, so a row committed
+# late with an earlier updated_at isn't skipped (applying a row twice is harmless)
+CHANGE_FEED_OVERLAP_SECONDS = 5
+
+BACKEND_TIMEOUT_SECONDS = 30
+
+# Most due positions checked together (one pool read and one gather per batch)
+CHECK_BATCH_SIZE = 500
 
 class MultiUserPositionMonitor:
     """Monitors multiple user positions and handles rebalancing via smart contract"""
@@ -39,13 +83,50 @@ class MultiUserPositionMonitor:
         # Initialize existing components
         self.config = get_config()
         self.uniswap = get_uniswap()
+        self.async_uniswap = get_async_uniswap()  # Reads, without blocking the event loop
         self.price_collector = get_price_collector()
         
+        # Pool change events: positions are checked when their pool's tick
+        # moves, against the local mirror of the configured pools
+        self.pool_mirror = get_pool_mirror()
+        self.head_tracker = get_head_tracker()
+        self.pool_changes = self.head_tracker.subscribe()
+        
+        # Tick ranges of the active positions, sorted per pool, and when
+        # each position's next check is due
+        self.range_index = RangeIndex()
+        self.scheduler = CheckScheduler()
+        self.position_table = PositionTable()
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # Sharded workers: with monitor.shards set, this worker monitors only
+        # the shards it holds a lease on in the database
+        shards = int(os.getenv("MONITOR_SHARDS", self.config.get('monitor.shards', 0)))
+        self.shard_by = self.config.get('monitor.shard_by', 'pool')
+        if self.shard_by not in SHARD_BY:
+            raise ValueError(f"Unknown monitor.shard_by: {self.shard_by}")
+        self.leases = ShardLeases(
+            shards,
+            self.config.get('monitor.lease_seconds', 30),
+            os.getenv("MONITOR_WORKER_ID")
+        ) if shards > 0 else None
+        
+        # Adaptive check intervals: pool prices seen by the monitor feed the
+        # price collector's volatility, keyed by pool address
+        self.adaptive_interval = self.config.get('monitor.adaptive_check_interval', False)
+        self.min_check_interval = self.config.get('monitor.min_check_interval_seconds', 10)
+        self.max_check_interval = self.config.get('monitor.max_check_interval_seconds', 3600)
+        self.edge_crossing_sigmas = self.config.get('monitor.edge_crossing_sigmas', 4)
+        self.volatility_window_hours = self.config.get('data.volatility_window_hours', 24)
+        self.last_price_samples = {}
+        
         # Cache for position data
         self.position_cache = {}
         self.last_check_times = {}
         
         # Smart contract integration
+        self.batch_gas_limit = self.config.get('strategy.max_batch_gas', DEFAULT_BATCH_GAS_LIMIT)
+        self._command_signatures = {}  # LiquidityManager function name -> (selector, input types)
         if contract_address:
             self.liquidity_manager = self.uniswap.w3.eth.contract(
                 address=contract_address,
@@ -61,125 +142,346 @@ class MultiUserPositionMonitor:
     
     def _get_liquidity_manager_abi(self) -> list:
         """Get the LiquidityManager contract ABI"""
-        # Simplified ABI for the key functions we need
-        return [
-            {
-                "inputs": [{"internalType": "bytes[]", "name": "commands", "type": "bytes[]"}],
-                "name": "executeCommands",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "inputs": [{"internalType": "address", "name": "user", "type": "address"}],
-                "name": "isWhitelisted",
-                "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [{"internalType": "address", "name": "user", "type": "address"}],
-                "name": "getUserPositions",
-                "outputs": [{"components": [{"internalType": "uint256", "name": "tokenId", "type": "uint256"}, {"internalType": "address", "name": "token0", "type": "address"}, {"internalType": "address", "name": "token1", "type": "address"}, {"internalType": "uint24", "name": "fee", "type": "uint24"}, {"internalType": "int24", "name": "tickLower", "type": "int24"}, {"internalType": "int24", "name": "tickUpper", "type": "int24"}, {"internalType": "uint256", "name": "depositedAmount0", "type": "uint256"}, {"internalType": "uint256", "name": "depositedAmount1", "type": "uint256"}, {"internalType": "uint256", "name": "createdAt", "type": "uint256"}, {"internalType": "bool", "name": "active", "type": "bool"}], "internalType": "struct LiquidityManager.UserPosition[]", "name": "", "type": "tuple[]"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
+        return LIQUIDITY_MANAGER_ABI
+    
+    async def _get_backend_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a backend API path on a kept-alive session"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=BACKEND_TIMEOUT_SECONDS))
+        async with self._http_session.get(f"{self.backend_url}{path}", params=params) as response:
+            response.raise_for_status()
+            return await response.json()
     
     async def get_active_positions(self) -> List[Dict[str, Any]]:
         """Fetch active positions from backend API"""
         try:
-            response = requests.get(f"{self.backend_url}/api/positions/active/all")
-            response.raise_for_status()
-            return response.json()
+            return await self._get_backend_json("/api/positions/active/all")
         except Exception as e:
             logger.error(f"Error fetching active positions: {e}")
             return []
     
-    async def check_position_range(self, position: Dict[str, Any]) -> Dict[str, Any]:
-        """Check if a position is in range"""
+    async def sync_positions(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], set]:
+        """
+        Bring the local position table up to date with the backend's change feed
+        
+        The first sync loads every active position; after that only rows
+        changed since the table's cursor are fetched.
+        
+        Returns:
+            (positions added or changed, positions removed, pool addresses
+            whose positions changed)
+        """
+        table = self.position_table
+        changed, removed, pools = [], [], set()
         try:
-            # Get pool address and current tick
-            pool_address = position["pool_address"]
-            tick_lower = position["tick_lower"]
-            tick_upper = position["tick_upper"]
-            
-            # Get current tick from pool
-            pool_contract = self.uniswap.w3.eth.contract(
-                address=pool_address,
-                abi=self.uniswap.get_pool_abi()
-            )
-            slot0 = pool_contract.functions.slot0().call()
-            current_tick = slot0[1]
-            
-            in_range = tick_lower <= current_tick <= tick_upper
-            
-            return {
-                "position_id": position["id"],
-                "in_range": in_range,
-                "current_tick": current_tick,
-                "tick_lower": tick_lower,
-                "tick_upper": tick_upper,
-                "distance_from_lower": current_tick - tick_lower,
-                "distance_from_upper": tick_upper - current_tick
-            }
+            if table.cursor is None:
+                page = await self._get_backend_json("/api/positions/changes")
+                changed, removed, pools = table.load(page["positions"])
+                table.advance(**page["cursor"])
+                return changed, removed, pools
             
+            since, _ = table.cursor
+            params = {"since": (since - timedelta(seconds=CHANGE_FEED_OVERLAP_SECONDS)).isoformat(), "after_id": 0}
+            while True:
+                page = await self._get_backend_json("/api/positions/changes", params)
+                page_changed, page_removed, page_pools = table.apply(page["positions"])
+                changed.extend(page_changed)
+                removed.extend(page_removed)
+                pools.update(page_pools)
+                table.advance(**page["cursor"])
+                if not page["has_more"]:
+                    break
+                params = page["cursor"]
         except Exception as e:
-            logger.error(f"Error checking position range for {position['id']}: {e}")
-            return {
-                "position_id": position["id"],
-                "in_range": True,  # Assume in range on error
-                "error": str(e)
+            logger.error(f"Error syncing positions: {e}")
+        
+        return changed, removed, pools
+    
+    async def read_pool_ticks(self, pool_addresses: List[str]) -> Dict[str, int]:
+        """Current tick of each pool, keyed as given (mirrored and tracked pools locally, others in one multicall)"""
+        states = await self.read_pool_states(pool_addresses)
+        return {address: state["tick"] for address, state in states.items()}
+    
+    async def read_pool_states(self, pool_addresses: List[str]) -> Dict[str, Dict[str, int]]:
+        """Current sqrtPriceX96 and tick of each pool, keyed as given (mirrored and tracked pools locally, others in one multicall)"""
+        checksummed = {address: Web3.to_checksum_address(address) for address in pool_addresses}
+        states = {}
+        untracked = []
+        for address in dict.fromkeys(checksummed.values()):
+            state = self.pool_mirror.get_state(address) or self.head_tracker.get_state(address)
+            if state is not None:
+                states[address] = state
+            else:
+                untracked.append(address)
+        
+        if untracked:
+            try:
+                states.update(await self.async_uniswap.get_pools_state(untracked))
+            except Exception as e:
+                logger.error(f"Error reading pool states: {e}")
+        
+        return {address: states[checksum] for address, checksum in checksummed.items() if checksum in states}
+    
+    def record_pool_tick(self, pool_address: str, tick: int):
+        """Record a pool's tick as a price sample (at most one per price_update_interval_seconds)"""
+        key = pool_address.lower()
+        now = time.time()
+        if now - self.last_price_samples.get(key, 0) < self.price_collector.update_interval:
+            return
+        if self.price_collector.add_price(key, 1.0001 ** tick, now):
+            self.last_price_samples[key] = now
+    
+    def next_check_interval(self, position: Dict[str, Any], status: Optional[Dict[str, Any]]) -> float:
+        """
+        Seconds until a position's next check
+        
+        In adaptive mode an in-range position is checked when its pool could
+        plausibly have reached the nearest range edge, within the configured
+        bounds. Otherwise (or before the pool has volatility history) it is
+        the position's check_interval.
+        """
+        if not self.adaptive_interval or status is None or not status.get("in_range", True) or "current_tick" not in status:
+            return position["check_interval"]
+        
+        volatility = self.price_collector.calculate_volatility(
+            position["pool_address"].lower(), self.volatility_window_hours, method='ewma'
+        )
+        if volatility <= 0:
+            return position["check_interval"]
+        
+        distance = min(status["distance_from_lower"], status["distance_from_upper"])
+        interval = edge_crossing_interval(distance, volatility, self.edge_crossing_sigmas)
+        return min(max(interval, self.min_check_interval), self.max_check_interval)
+    
+    @staticmethod
+    def _range_status(position: Dict[str, Any], current_tick: int) -> Dict[str, Any]:
+        """Range status of a position at a tick"""
+        tick_lower = position["tick_lower"]
+        tick_upper = position["tick_upper"]
+        return {
+            "position_id": position["id"],
+            "in_range": tick_lower <= current_tick <= tick_upper,
+            "current_tick": current_tick,
+            "tick_lower": tick_lower,
+            "tick_upper": tick_upper,
+            "distance_from_lower": current_tick - tick_lower,
+            "distance_from_upper": tick_upper - current_tick
+        }
+    
+    async def check_positions_range(self, positions: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Check which positions are in range (each pool read once)"""
+        ticks = await self.read_pool_ticks([position["pool_address"] for position in positions])
+        
+        statuses = {}
+        for position in positions:
+            current_tick = ticks.get(position["pool_address"])
+            if current_tick is None:
+                statuses[position["id"]] = {
+                    "position_id": position["id"],
+                    "in_range": True,  # Assume in range on error
+                    "error": f"Could not read pool {position['pool_address']}"
+                }
+                continue
+            statuses[position["id"]] = self._range_status(position, current_tick)
+        
+        return statuses
+    
+    async def find_out_of_range(
+        self,
+        pool_addresses: List[str],
+        positions_by_id: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Range statuses of just the out-of-range positions of some pools
+        
+        Each pool is read once, and the positions its tick falls outside of
+        are two searchsorted slices of the pool's range index; in-range
+        positions cost no per-position work.
+        """
+        ticks = await self.read_pool_ticks(pool_addresses)
+        
+        statuses = {}
+        for pool_address in pool_addresses:
+            current_tick = ticks.get(pool_address)
+            if current_tick is None:
+                # Assume in range on error
+                logger.error(f"Could not read pool {pool_address}; skipping its positions this cycle")
+                continue
+            for position_id in self.range_index.out_of_range(pool_address, current_tick).tolist():
+                statuses[position_id] = self._range_status(positions_by_id[position_id], current_tick)
+        
+        return statuses
+    
+    async def check_position_range(self, position: Dict[str, Any]) -> Dict[str, Any]:
+        """Check if a position is in range"""
+        statuses = await self.check_positions_range([position])
+        return statuses[position["id"]]
+    
+    async def get_rebalance_context(self, positions: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Read pool tokens, token decimals, on-chain liquidity and the amounts
+        held for several positions in a few multicalls
+        
+        A minted position's amount0/amount1 are what closing it returns now:
+        its liquidity's value at the pool's current sqrtPriceX96 (exact
+        LiquidityAmounts math) plus tokensOwed. Fees accrued since the last
+        poke aren't in tokensOwed yet, so the amounts never exceed what is
+        collected. Unminted positions have no amounts (the deposit is used).
+        """
+        pm_contract = self.async_uniswap.contracts.get(self.async_uniswap.position_manager_address, POSITION_MANAGER_ABI)
+        minted = [position for position in positions if position.get("token_id") is not None]
+        
+        pools, states, results = await asyncio.gather(
+            self.async_uniswap.contracts.get_pools_immutables([position["pool_address"] for position in positions]),
+            self.read_pool_states([position["pool_address"] for position in minted]),
+            self.async_uniswap.multicall.call([(pm_contract, 'positions', (position["token_id"],)) for position in minted])
+        )
+        tokens = await self.async_uniswap.get_tokens_metadata(
+            [token for pool in pools.values() for token in (pool['token0'], pool['token1'])]
+        )
+        
+        held = {}
+        for position, result in zip(minted, results):
+            state = states.get(position["pool_address"])
+            if result is None or state is None:
+                continue
+            liquidity, tokens_owed0, tokens_owed1 = result[7], result[10], result[11]
+            amount0, amount1 = get_amounts_for_liquidity(
+                state["sqrtPriceX96"], get_sqrt_ratio_at_tick(result[5]), get_sqrt_ratio_at_tick(result[6]), liquidity
+            )
+            held[position["id"]] = (liquidity, amount0 + tokens_owed0, amount1 + tokens_owed1)
+        
+        contexts = {}
+        for position in positions:
+            pool = pools[Web3.to_checksum_address(position["pool_address"])]
+            liquidity, amount0, amount1 = held.get(position["id"], (0, None, None))
+            contexts[position["id"]] = {
+                "token0": pool['token0'],
+                "token1": pool['token1'],
+                "fee": pool['fee'],
+                "tick_spacing": pool['tickSpacing'],
+                "decimals0": tokens[pool['token0']]['decimals'],
+                "decimals1": tokens[pool['token1']]['decimals'],
+                "liquidity": liquidity,
+                "amount0": amount0,
+                "amount1": amount1
             }
+        return contexts
+    
+    def plan_rebalance_swap(
+        self,
+        position: Dict[str, Any],
+        status: Dict[str, Any],
+        tick_lower: int,
+        tick_upper: int,
+        amount0: int,
+        amount1: int
+    ) -> Optional[Tuple[bool, int, int, int, int]]:
+        """Rebalance swap as (zero_for_one, amount_in, amount_out_min, amount0, amount1 after), or None if no swap"""
+        plan = self.pool_mirror.solve_swap_to_ratio(position["pool_address"], tick_lower, tick_upper, amount0, amount1)
+        if plan is not None:
+            if plan["amount_in"] == 0:
+                return None
+            logger.debug(
+                f"Position {position['id']}: swap {plan['amount_in']} "
+                f"{'token0' if plan['zero_for_one'] else 'token1'} for ~{plan['amount_out']} "
+                f"(price impact {plan['price_impact']:.4%}), mint {plan['mint_amount0']}/{plan['mint_amount1']}"
+            )
+            amount_out_min = int(plan["amount_out"] * (1 - SWAP_SLIPPAGE))
+            # Mint only what the swap is guaranteed to deliver
+            if plan["zero_for_one"]:
+                return True, plan["amount_in"], amount_out_min, plan["amount0"], amount1 + amount_out_min
+            return False, plan["amount_in"], amount_out_min, amount0 + amount_out_min, plan["amount1"]
+        
+        # Unmirrored pool: sell half of the out-of-range asset without a bound
+        if status["current_tick"] < status["tick_lower"] and amount0 > 0:
+            return True, amount0 // 2, 0, amount0 - amount0 // 2, amount1
+        if status["current_tick"] > status["tick_upper"] and amount1 > 0:
+            return False, amount1 // 2, 0, amount0, amount1 - amount1 // 2
+        return None
     
-    async def calculate_rebalance_commands(self, position: Dict[str, Any], status: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Calculate commands needed to rebalance a position"""
+    async def calculate_rebalance_commands(
+        self,
+        position: Dict[str, Any],
+        status: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Calculate commands needed to rebalance a position (context from get_rebalance_context, read if not given)"""
         commands = []
         
         if not status.get("in_range", True):
             logger.info(f"Position {position['id']} is out of range, calculating rebalance commands")
             
-            # For now, return a simple rebalance command
-            # In production, this would be more sophisticated
-            commands.append({
-                "type": "decrease_liquidity",
-                "token_id": position.get("token_id"),
-                "liquidity": "100%",  # Remove all liquidity
-                "amount0_min": 0,
-                "amount1_min": 0,
-                "deadline": int(time.time()) + 300
-            })
+            if context is None:
+                context = (await self.get_rebalance_context([position]))[position["id"]]
+            
+            deadline = int(time.time()) + 300
+            if position.get("token_id") is not None and context["amount0"] is None:
+                logger.error(f"Could not read position {position['id']} (token {position['token_id']}); not rebalancing")
+                return []
             
-            # Add swap command if needed
-            if status["current_tick"] < status["tick_lower"]:
-                # Price below range - sell token0 for token1
+            # What closing the position returns now; the stored deposit only
+            # for a position that was never minted
+            if context["amount0"] is not None:
+                amount0, amount1 = context["amount0"], context["amount1"]
+            else:
+                amount0 = int(position["amount0"] * 10 ** context["decimals0"])
+                amount1 = int(position["amount1"] * 10 ** context["decimals1"])
+            
+            # Close the old position; the contract keeps the tokens
+            if position.get("token_id") is not None:
+                if context["liquidity"] > 0:
+                    commands.append({
+                        "type": "decrease_liquidity",
+                        "token_id": position["token_id"],
+                        "liquidity": context["liquidity"],  # Remove all liquidity
+                        "amount0_min": 0,
+                        "amount1_min": 0,
+                        "deadline": deadline
+                    })
+                
                 commands.append({
-                    "type": "swap",
-                    "token_in": position["pool_address"].split("-")[0],  # Simplified
-                    "token_out": position["pool_address"].split("-")[1],
-                    "amount_in": position["amount0"] / 2,  # Sell half
-                    "amount_out_min": 0,
-                    "deadline": int(time.time()) + 300
+                    "type": "collect_fees",
+                    "token_id": position["token_id"],
+                    "recipient": self.contract_address,
+                    "amount0_max": UINT128_MAX,  # Collect all
+                    "amount1_max": UINT128_MAX
                 })
-            elif status["current_tick"] > status["tick_upper"]:
-                # Price above range - sell token1 for token0
+            
+            # New range around current price, on the tick spacing
+            tick_spacing = context["tick_spacing"]
+            tick_lower = (status["current_tick"] - 50) // tick_spacing * tick_spacing
+            tick_upper = -(-(status["current_tick"] + 50) // tick_spacing) * tick_spacing
+            
+            # Swap to the new range's ratio so the mint uses all of both tokens
+            # (sized on the pool mirror; sell half of the out-of-range asset if unmirrored)
+            swap = self.plan_rebalance_swap(position, status, tick_lower, tick_upper, amount0, amount1)
+            if swap is not None:
+                zero_for_one, amount_in, amount_out_min, amount0, amount1 = swap
                 commands.append({
                     "type": "swap",
-                    "token_in": position["pool_address"].split("-")[1],
-                    "token_out": position["pool_address"].split("-")[0],
-                    "amount_in": position["amount1"] / 2,
-                    "amount_out_min": 0,
-                    "deadline": int(time.time()) + 300
+                    "token_in": context["token0"] if zero_for_one else context["token1"],
+                    "token_out": context["token1"] if zero_for_one else context["token0"],
+                    "fee": context["fee"],
+                    "amount_in": amount_in,
+                    "amount_out_min": amount_out_min,
+                    "deadline": deadline,
+                    "sqrt_price_limit_x96": 0
                 })
             
-            # Add new position creation command
             commands.append({
                 "type": "create_position",
-                "pool_address": position["pool_address"],
-                "tick_lower": status["current_tick"] - 50,  # New range around current price
-                "tick_upper": status["current_tick"] + 50,
-                "amount0": position["amount0"],
-                "amount1": position["amount1"]
+                "token0": context["token0"],
+                "token1": context["token1"],
+                "fee": context["fee"],
+                "tick_lower": tick_lower,
+                "tick_upper": tick_upper,
+                "amount0": amount0,
+                "amount1": amount1,
+                "amount0_min": 0,
+                "amount1_min": 0,
+                "recipient": self.contract_address,
+                "deadline": deadline
             })
         
         return commands
@@ -189,47 +491,146 @@ class MultiUserPositionMonitor:
         if not commands:
             return True
         
+        successes = await self.execute_rebalance_batches([commands])
+        return successes[0]
+    
+    async def execute_rebalance_batches(self, command_groups: List[List[Dict[str, Any]]]) -> List[bool]:
+        """
+        Execute the rebalance commands of several positions in as few
+        executeCommands transactions as the batch gas limit allows
+        
+        A position's commands always stay in one transaction, in order.
+        Batches are sent back-to-back with consecutive nonces and their
+        receipts awaited together.
+        
+        Returns:
+            Success per command group
+        """
+        successes = [False] * len(command_groups)
+        
         try:
             if not self.liquidity_manager:
                 logger.warning("No contract available - simulating command execution")
-                for i, command in enumerate(commands):
-                    logger.info(f"Simulated command {i+1}: {command['type']}")
-                    await asyncio.sleep(0.1)
-                return True
+                for commands in command_groups:
+                    for i, command in enumerate(commands):
+                        logger.info(f"Simulated command {i+1}: {command['type']}")
+                return [True] * len(command_groups)
             
-            # Encode commands for smart contract
-            encoded_commands = []
-            for command in commands:
-                encoded_cmd = self._encode_command(command)
-                if encoded_cmd:
-                    encoded_commands.append(encoded_cmd)
+            # Encode commands for smart contract (a group with a bad command is dropped whole)
+            encoded_groups = []
+            for commands in command_groups:
+                encoded = [self._encode_command(command) for command in commands]
+                encoded_groups.append(encoded if encoded and all(encoded) else None)
             
-            if not encoded_commands:
+            batches = self._pack_command_batches(command_groups, encoded_groups)
+            if not batches:
                 logger.warning("No valid commands to execute")
-                return True
+                return successes
             
-            logger.info(f"Executing {len(encoded_commands)} rebalance commands on contract")
+            logger.info(
+                f"Executing rebalance commands of {sum(map(len, batches))} positions "
+                f"in {len(batches)} transactions"
+            )
             
-            # Execute multicall transaction
-            tx_hash = self.liquidity_manager.functions.executeCommands(encoded_commands).transact({
-                'from': self.uniswap.web3_client.address,
-                'gas': 500000,  # Adjust based on command complexity
-                'gasPrice': self.uniswap.w3.eth.gas_price
-            })
+            submitted = await asyncio.to_thread(self._submit_command_batches, batches, encoded_groups)
             
-            # Wait for transaction confirmation
-            receipt = self.uniswap.w3.eth.wait_for_transaction_receipt(tx_hash)
+            # Wait for transaction confirmations
+            sent = [(batch, tx_hash) for batch, tx_hash in submitted if tx_hash is not None]
+            receipts = await asyncio.gather(*(
+                asyncio.wrap_future(self.uniswap.web3_client.receipts.track(tx_hash))
+                for _, tx_hash in sent
+            ), return_exceptions=True)
             
-            if receipt['status'] == 1:
-                logger.info(f"Rebalance commands executed successfully: {tx_hash.hex()}")
-                return True
-            else:
-                logger.error(f"Rebalance transaction failed: {tx_hash.hex()}")
-                return False
+            for (batch, tx_hash), receipt in zip(sent, receipts):
+                if isinstance(receipt, Exception):
+                    logger.error(f"Rebalance transaction {tx_hash} not confirmed: {receipt}")
+                elif receipt['status'] == 1:
+                    logger.info(f"Rebalance commands of {len(batch)} positions executed: {tx_hash} ({receipt['gasUsed']} gas)")
+                    for i in batch:
+                        successes[i] = True
+                else:
+                    logger.error(f"Rebalance transaction failed: {tx_hash}")
             
         except Exception as e:
             logger.error(f"Error executing rebalance commands: {e}")
-            return False
+        
+        return successes
+    
+    def _pack_command_batches(
+        self,
+        command_groups: List[List[Dict[str, Any]]],
+        encoded_groups: List[Optional[List[bytes]]]
+    ) -> List[List[int]]:
+        """Greedily pack command groups (by index) into batches under the gas limit"""
+        batches = []
+        batch = []
+        batch_gas = EXECUTE_COMMANDS_BASE_GAS
+        
+        for i, (commands, encoded) in enumerate(zip(command_groups, encoded_groups)):
+            if encoded is None:
+                continue
+            
+            gas = sum(COMMAND_GAS.get(command['type'], DEFAULT_COMMAND_GAS) for command in commands)
+            if batch and batch_gas + gas > self.batch_gas_limit:
+                batches.append(batch)
+                batch = []
+                batch_gas = EXECUTE_COMMANDS_BASE_GAS
+            
+            batch.append(i)
+            batch_gas += gas
+        
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _submit_command_batches(
+        self,
+        batches: List[List[int]],
+        encoded_groups: List[Optional[List[bytes]]]
+    ) -> List[Tuple[List[int], Optional[str]]]:
+        """Estimate and send each batch, halving batches that revert or exceed the gas limit"""
+        web3_client = self.uniswap.web3_client
+        wallet = web3_client.address
+        gas_price = self.uniswap.w3.eth.gas_price
+        gas_buffer = self.config.get('strategy.gas_buffer_multiplier', 1.2)
+        
+        submitted = []
+        pending = list(batches)
+        while pending:
+            batch = pending.pop(0)
+            function = self.liquidity_manager.functions.executeCommands(
+                [command for i in batch for command in encoded_groups[i]]
+            )
+            
+            try:
+                gas = function.estimate_gas({'from': wallet})
+                error = None if gas <= self.batch_gas_limit else f"needs {gas} gas"
+            except Exception as e:
+                gas, error = None, e
+            
+            if error is not None and (gas is None or len(batch) > 1):
+                if len(batch) == 1:
+                    logger.error(f"Rebalance commands would revert: {error}")
+                    submitted.append((batch, None))
+                    continue
+                # One reverting position fails the whole batch; isolate it
+                logger.warning(f"Batch of {len(batch)} rebalances not sendable ({error}), splitting")
+                middle = len(batch) // 2
+                pending[:0] = [batch[:middle], batch[middle:]]
+                continue
+            
+            # Sent without waiting: later batches take the following nonces
+            tx_hash = web3_client.sign_and_send(
+                lambda nonce: function.build_transaction({
+                    'from': wallet,
+                    'nonce': nonce,
+                    'gas': int(gas * gas_buffer),
+                    'gasPrice': gas_price
+                })
+            )
+            submitted.append((batch, tx_hash))
+        
+        return submitted
     
     def _encode_command(self, command: Dict[str, Any]) -> bytes:
         """Encode a command for the smart contract"""
@@ -239,6 +640,12 @@ class MultiUserPositionMonitor:
             if command_type == 'decrease_liquidity':
                 # Encode decreaseLiquidity call
                 return self._encode_decrease_liquidity(command)
+            elif command_type == 'increase_liquidity':
+                # Encode increaseLiquidity call
+                return self._encode_increase_liquidity(command)
+            elif command_type == 'collect_fees':
+                # Encode collectFees call
+                return self._encode_collect_fees(command)
             elif command_type == 'swap':
                 # Encode swap call
                 return self._encode_swap(command)
@@ -253,23 +660,77 @@ class MultiUserPositionMonitor:
             logger.error(f"Error encoding command {command}: {e}")
             return None
     
+    def _encode_call(self, fn_name: str, args: list) -> bytes:
+        """ABI-encode a LiquidityManager call (selector and arguments, without building a ContractFunction)"""
+        signature = self._command_signatures.get(fn_name)
+        if signature is None:
+            fn_abi = self.liquidity_manager.get_function_by_name(fn_name).abi
+            signature = (
+                function_abi_to_4byte_selector(fn_abi),
+                [collapse_if_tuple(arg) for arg in fn_abi['inputs']]
+            )
+            self._command_signatures[fn_name] = signature
+        
+        selector, input_types = signature
+        return selector + self.uniswap.w3.codec.encode(input_types, args)
+    
     def _encode_decrease_liquidity(self, command: Dict[str, Any]) -> bytes:
         """Encode decreaseLiquidity command"""
-        # This would encode the actual function call
-        # For now, return a placeholder
-        return b'\x00' * 32
+        return self._encode_call('decreaseLiquidity', [
+            command['token_id'],
+            command['liquidity'],
+            command['amount0_min'],
+            command['amount1_min'],
+            command['deadline']
+        ])
+    
+    def _encode_increase_liquidity(self, command: Dict[str, Any]) -> bytes:
+        """Encode increaseLiquidity command"""
+        return self._encode_call('increaseLiquidity', [
+            command['token_id'],
+            command['amount0'],
+            command['amount1'],
+            command['amount0_min'],
+            command['amount1_min'],
+            command['deadline']
+        ])
+    
+    def _encode_collect_fees(self, command: Dict[str, Any]) -> bytes:
+        """Encode collectFees command"""
+        return self._encode_call('collectFees', [
+            command['token_id'],
+            Web3.to_checksum_address(command['recipient']),
+            command['amount0_max'],
+            command['amount1_max']
+        ])
     
     def _encode_swap(self, command: Dict[str, Any]) -> bytes:
         """Encode swap command"""
-        # This would encode the actual swap function call
-        # For now, return a placeholder
-        return b'\x00' * 32
+        return self._encode_call('swapTokens', [
+            Web3.to_checksum_address(command['token_in']),
+            Web3.to_checksum_address(command['token_out']),
+            command['fee'],
+            command['amount_in'],
+            command['amount_out_min'],
+            command['deadline'],
+            command.get('sqrt_price_limit_x96', 0)
+        ])
     
     def _encode_create_position(self, command: Dict[str, Any]) -> bytes:
         """Encode createPosition command"""
-        # This would encode the actual position creation call
-        # For now, return a placeholder
-        return b'\x00' * 32
+        return self._encode_call('createPosition', [(
+            Web3.to_checksum_address(command['token0']),
+            Web3.to_checksum_address(command['token1']),
+            command['fee'],
+            command['tick_lower'],
+            command['tick_upper'],
+            command['amount0'],
+            command['amount1'],
+            command['amount0_min'],
+            command['amount1_min'],
+            Web3.to_checksum_address(command['recipient']),
+            command['deadline']
+        )])
     
     async def update_position_status(self, position_id: int, status: Dict[str, Any]):
         """Update position status in backend"""
@@ -281,81 +742,265 @@ class MultiUserPositionMonitor:
         except Exception as e:
             logger.error(f"Error updating position status: {e}")
     
-    async def monitor_position(self, position: Dict[str, Any]):
-        """Monitor a single position"""
+    def is_check_due(self, position: Dict[str, Any]) -> bool:
+        """Check if enough time has passed since the position was last checked"""
+        last_check = self.last_check_times.get(position["id"], 0)
+        return time.time() - last_check >= position["check_interval"]
+    
+    async def monitor_position(
+        self,
+        position: Dict[str, Any],
+        status: Optional[Dict[str, Any]] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Monitor a single position (status from a batched range check, if available)
+        
+        Returns:
+            Rebalance commands if the position is out of range; the caller
+            executes them, batched with other positions'
+        """
         position_id = position["id"]
         user_address = position["user_address"]
-        check_interval = position["check_interval"]
         
-        # Check if enough time has passed since last check
-        last_check = self.last_check_times.get(position_id, 0)
-        if time.time() - last_check < check_interval:
-            return
+        if status is None:
+            if not self.is_check_due(position):
+                return []
+            status = await self.check_position_range(position)
         
         logger.info(f"Checking position {position_id} for user {user_address}")
         
-        # Check if position is in range
-        status = await self.check_position_range(position)
-        
         # Update last check time
         self.last_check_times[position_id] = time.time()
         
-        # If out of range, calculate and execute rebalance commands
+        # If out of range, calculate rebalance commands
+        commands = []
         if not status.get("in_range", True):
             logger.warning(f"Position {position_id} is out of range!")
-            
-            # Calculate rebalance commands
-            commands = await self.calculate_rebalance_commands(position, status)
-            
-            if commands:
-                # Execute commands
-                success = await self.execute_rebalance_commands(commands)
-                
-                if success:
-                    logger.info(f"Position {position_id} rebalanced successfully")
-                else:
-                    logger.error(f"Failed to rebalance position {position_id}")
+            commands = await self.calculate_rebalance_commands(position, status, context)
         
         # Update position status
         await self.update_position_status(position_id, status)
+        
+        return commands
+    
+    async def rebalance_positions(self, rebalances: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]):
+        """Execute the rebalance commands of every out-of-range position found in a cycle, batched"""
+        if self.leases is not None:
+            # Only rebalance shards whose lease is renewed just now, so no other
+            # worker can take them over while the transactions are sent
+            shards = {position["id"]: shard_of(position, self.leases.shards, self.shard_by) for position, _ in rebalances}
+            held = await asyncio.to_thread(self.leases.confirm, set(shards.values()))
+            for position, _ in rebalances:
+                if shards[position["id"]] not in held:
+                    logger.warning(f"Lease on shard {shards[position['id']]} lost; not rebalancing position {position['id']}")
+            rebalances = [(position, commands) for position, commands in rebalances if shards[position["id"]] in held]
+            if not rebalances:
+                return
+        
+        successes = await self.execute_rebalance_batches([commands for _, commands in rebalances])
+        
+        for (position, _), success in zip(rebalances, successes):
+            if success:
+                logger.info(f"Position {position['id']} rebalanced successfully")
+            else:
+                logger.error(f"Failed to rebalance position {position['id']}")
+    
+    def owns(self, position: Dict[str, Any]) -> bool:
+        """Whether this worker monitors a position (always, unless sharded)"""
+        return self.leases is None or shard_of(position, self.leases.shards, self.shard_by) in self.leases.owned
+    
+    async def refresh_positions(self):
+        """Sync the position table and apply its changes to the range index and check schedule"""
+        changed, removed, pools = await self.sync_positions()
+        if not (changed or removed):
+            return
+        
+        for position in removed:
+            self.unschedule(position)
+        
+        # New and changed positions are checked right away
+        now = time.monotonic()
+        for position in changed:
+            if self.owns(position):
+                self.scheduler.schedule(position["id"], now)
+            else:
+                self.unschedule(position)
+        
+        await self.index_pools(pools)
+        logger.info(
+            f"Monitoring {self.monitored_count()} of {len(self.position_table)} active positions "
+            f"({len(changed)} added or changed, {len(removed)} removed)"
+        )
+    
+    def unschedule(self, position: Dict[str, Any]):
+        """Stop checking a position"""
+        self.scheduler.remove(position["id"])
+        self.last_check_times.pop(position["id"], None)
+    
+    def monitored_count(self) -> int:
+        """Positions this worker monitors"""
+        return sum(len(index) for index in self.range_index.pools.values())
+    
+    async def index_pools(self, pool_addresses: Iterable[str]):
+        """Re-index the monitored positions of some pools and follow pools that are new"""
+        followed = set(self.range_index.pools)
+        for pool_address in pool_addresses:
+            self.range_index.update_pool(pool_address, [
+                position for position in self.position_table.by_pool.get(pool_address, {}).values()
+                if self.owns(position)
+            ])
+        
+        # Follow every monitored pool (new ones are read once)
+        if set(self.range_index.pools) - followed:
+            await asyncio.to_thread(self.head_tracker.watch, list(self.range_index.pools))
+    
+    async def lease_loop(self):
+        """Heartbeat the shard leases and start or stop checking the shards gained or lost"""
+        while self.running:
+            try:
+                gained, lost = await asyncio.to_thread(self.leases.heartbeat)
+                if gained or lost:
+                    await self.apply_shard_changes(gained, lost)
+            except Exception as e:
+                logger.error(f"Error renewing monitor leases: {e}")
+            await asyncio.sleep(self.leases.heartbeat_seconds)
+    
+    async def apply_shard_changes(self, gained: Set[int], lost: Set[int]):
+        """Schedule the positions of gained shards right away and drop those of lost shards"""
+        now = time.monotonic()
+        pools = set()
+        for position in self.position_table.positions.values():
+            shard = shard_of(position, self.leases.shards, self.shard_by)
+            if shard in gained:
+                self.scheduler.schedule(position["id"], now)
+                pools.add(position["pool_address"])
+            elif shard in lost:
+                self.unschedule(position)
+                pools.add(position["pool_address"])
+        
+        await self.index_pools(pools)
+        logger.info(
+            f"Worker {self.leases.worker_id} holds shards {sorted(self.leases.owned)} "
+            f"(gained {sorted(gained)}, lost {sorted(lost)}); monitoring {self.monitored_count()} positions"
+        )
+    
+    async def schedule_moved_pools(self, changes: List[Dict[str, Any]]):
+        """Make the positions that pool changes moved out of range due now"""
+        for change in changes:
+            self.record_pool_tick(change["pool"], change["tick"])
+        
+        changed_pools = {change["pool"].lower() for change in changes}
+        pool_addresses = [pool_address for pool_address in self.range_index.pools if pool_address.lower() in changed_pools]
+        if not pool_addresses:
+            return
+        
+        statuses = await self.find_out_of_range(pool_addresses, self.position_table.positions)
+        now = time.monotonic()
+        for position_id in statuses:
+            due = self.scheduler.due_at(position_id)
+            if due is None or due > now:
+                self.scheduler.schedule(position_id, now)
+    
+    async def check_due_positions(self, position_ids: List[int]):
+        """Check a batch of due positions, rebalance the out-of-range ones and schedule their next checks"""
+        positions = [
+            self.position_table.positions[position_id] for position_id in position_ids
+            if position_id in self.position_table and self.owns(self.position_table.positions[position_id])
+        ]
+        ticks = await self.read_pool_ticks([position["pool_address"] for position in positions])
+        
+        for pool_address, current_tick in ticks.items():
+            self.record_pool_tick(pool_address, current_tick)
+        
+        now = time.monotonic()
+        statuses = {}
+        for position in positions:
+            current_tick = ticks.get(position["pool_address"])
+            if current_tick is None:
+                # Assume in range on error; retried at the next check
+                logger.error(f"Could not read pool {position['pool_address']}; skipping position {position['id']}")
+                self.scheduler.schedule(position["id"], now + position["check_interval"])
+                continue
+            status = statuses[position["id"]] = self._range_status(position, current_tick)
+            self.scheduler.schedule(position["id"], now + self.next_check_interval(position, status))
+        
+        # Everything the rebalance commands need, read for all out-of-range positions at once
+        checked = [position for position in positions if position["id"] in statuses]
+        out_of_range = [position for position in checked if not statuses[position["id"]]["in_range"]]
+        contexts = await self.get_rebalance_context(out_of_range) if out_of_range else {}
+        
+        results = await asyncio.gather(*(
+            self.monitor_position(position, statuses[position["id"]], contexts.get(position["id"]))
+            for position in checked
+        ), return_exceptions=True)
+        
+        # Rebalance every out-of-range position in as few transactions as fit
+        rebalances = []
+        for position, result in zip(checked, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error monitoring position {position['id']}: {result}")
+            elif result:
+                rebalances.append((position, result))
+        
+        if rebalances:
+            await self.rebalance_positions(rebalances)
     
     async def monitor_loop(self):
         """Main monitoring loop"""
         logger.info("🚀 Starting multi-user position monitoring...")
         self.running = True
+        next_refresh = 0.0
+        lease_task = asyncio.create_task(self.lease_loop()) if self.leases is not None else None
         
         while self.running:
             try:
-                # Get all active positions
-                positions = await self.get_active_positions()
-                
-                if not positions:
-                    logger.info("No active positions to monitor")
-                    await asyncio.sleep(60)  # Wait 1 minute before checking again
-                    continue
-                
-                logger.info(f"Monitoring {len(positions)} active positions")
-                
-                # Monitor each position
-                tasks = []
-                for position in positions:
-                    task = asyncio.create_task(self.monitor_position(position))
-                    tasks.append(task)
+                if time.monotonic() >= next_refresh:
+                    await self.refresh_positions()
+                    next_refresh = time.monotonic() + POSITION_REFRESH_SECONDS
+                    
+                    if not self.position_table:
+                        logger.info("No active positions to monitor")
+                        await asyncio.sleep(60)  # Wait 1 minute before checking again
+                        continue
                 
-                # Wait for all position checks to complete
-                await asyncio.gather(*tasks, return_exceptions=True)
+                # Check only the positions that are due, a batch at a time
+                while self.running:
+                    due = self.scheduler.pop_due(time.monotonic(), limit=CHECK_BATCH_SIZE)
+                    if not due:
+                        break
+                    await self.check_due_positions(due)
                 
-                # Wait before next round
-                await asyncio.sleep(30)  # Check every 30 seconds
+                # Sleep until the next check is due or a pool moves, whichever is first
+                next_due = self.scheduler.next_due()
+                wake = next_refresh if next_due is None else min(next_due, next_refresh)
+                if lease_task is not None:
+                    # Shards gained by the lease loop are checked soon after
+                    wake = min(wake, time.monotonic() + self.leases.heartbeat_seconds)
+                changes = await self.pool_changes.get_async(timeout=max(wake - time.monotonic(), 0))
+                if changes:
+                    await self.schedule_moved_pools(changes)
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute on error
+        
+        if lease_task is not None:
+            lease_task.cancel()
     
     def stop(self):
         """Stop the monitoring service"""
         logger.info("Stopping position monitoring...")
         self.running = False
+        self.pool_changes.close()
+    
+    async def close(self):
+        """Release pooled RPC and backend connections"""
+        await self.async_uniswap.close()
+        if self.leases is not None:
+            await asyncio.to_thread(self.leases.release_all)
+        if self._http_session is not None:
+            await self._http_session.close()
 
 async def main():
     """Main function to run the monitoring service"""
@@ -376,6 +1021,7 @@ async def main():
         logger.info("Monitoring stopped by user")
     finally:
         monitor.stop()
+        await monitor.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Local table of the active positions, synced from the backend's change feed
+
+The monitor loads every active position once, then applies only the rows
+created, updated, paused or deleted since its cursor. Applying a row is
+idempotent, so a sync may safely re-read rows it has already seen.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class PositionTable:
+    """Active positions by id and by pool, and the change feed cursor"""
+
+    def __init__(self):
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.by_pool: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.cursor: Optional[Tuple[datetime, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, position_id: int) -> bool:
+        return position_id in self.positions
+
+    def get(self, position_id: int) -> Optional[Dict[str, Any]]:
+        """Position by id, or None if it isn't active"""
+        return self.positions.get(position_id)
+
+    def load(self, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Set[str]]:
+        """
+        Replace the table with a snapshot of the active positions
+
+        Args:
+            rows: Every active position row
+
+        Returns:
+            Same as apply()
+        """
+        ids = {row["id"] for row in rows}
+        gone = [dict(position, active=False) for position_id, position in self.positions.items() if position_id not in ids]
+        return self.apply(rows + gone)
+
+    def apply(self, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Set[str]]:
+        """
+        Apply change feed rows
+
+        Args:
+            rows: Position rows; inactive rows remove the position
+
+        Returns:
+            (positions added or changed, positions removed, pool addresses
+            whose positions changed); rows identical to the table are skipped
+        """
+        changed, removed = [], []
+        pools = set()
+        for row in rows:
+            current = self.positions.get(row["id"])
+            if row.get("active", True):
+                if current == row:
+                    continue
+                if current is not None and current["pool_address"] != row["pool_address"]:
+                    self._remove(current)
+                    pools.add(current["pool_address"])
+                self.positions[row["id"]] = row
+                self.by_pool.setdefault(row["pool_address"], {})[row["id"]] = row
+                changed.append(row)
+                pools.add(row["pool_address"])
+            elif current is not None:
+                self._remove(current)
+                removed.append(current)
+                pools.add(current["pool_address"])
+        return changed, removed, pools
+
+    def advance(self, since: Optional[str], after_id: int):
+        """Move the cursor forward to a change feed cursor (never back)"""
+        if since is None:
+            return
+        cursor = (datetime.fromisoformat(since), after_id)
+        if self.cursor is None or cursor > self.cursor:
+            self.cursor = cursor
+
+    def _remove(self, position: Dict[str, Any]):
+        del self.positions[position["id"]]
+        pool = self.by_pool[position["pool_address"]]
+        del pool[position["id"]]
+        if not pool:
+            del self.by_pool[position["pool_address"]]
@@ -0,0 +1,139 @@
+"""
+Interval index of position tick ranges, per pool
+
+Each pool's positions are kept in two NumPy arrays sorted by tick_lower and
+by tick_upper. A position is out of range when tick_lower > tick or
+tick_upper < tick, so all out-of-range positions of a pool are two slices
+found with searchsorted, instead of a comparison per position.
+
+The index lives across monitoring cycles: update() regroups the active
+positions and re-sorts only the pools whose ranges changed, and
+update_pool() re-sorts one pool when its positions are known to have
+changed.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# (position ids, tick_lowers, tick_uppers) of one pool, in position list order
+PoolRanges = Tuple[List[int], List[int], List[int]]
+
+
+class PoolRangeIndex:
+    """Tick ranges of one pool's positions, sorted for searchsorted lookups"""
+
+    def __init__(self, ids: List[int], lowers: List[int], uppers: List[int]):
+        """
+        Build the index
+
+        Args:
+            ids: Position ids
+            lowers: tick_lower of each position
+            uppers: tick_upper of each position
+        """
+        ids = np.array(ids, dtype=np.int64)
+        lowers = np.array(lowers, dtype=np.int64)
+        uppers = np.array(uppers, dtype=np.int64)
+
+        by_lower = np.argsort(lowers, kind="stable")
+        by_upper = np.argsort(uppers, kind="stable")
+        self.ids_by_lower = ids[by_lower]
+        self.lowers = lowers[by_lower]
+        self.ids_by_upper = ids[by_upper]
+        self.uppers = uppers[by_upper]
+
+    def __len__(self) -> int:
+        return len(self.lowers)
+
+    def below(self, tick: int) -> np.ndarray:
+        """Ids of positions the tick is below (tick_lower > tick)"""
+        return self.ids_by_lower[np.searchsorted(self.lowers, tick, side="right"):]
+
+    def above(self, tick: int) -> np.ndarray:
+        """Ids of positions the tick is above (tick_upper < tick)"""
+        return self.ids_by_upper[:np.searchsorted(self.uppers, tick, side="left")]
+
+    def out_of_range(self, tick: int) -> np.ndarray:
+        """Ids of every position the tick is outside of"""
+        return np.concatenate((self.below(tick), self.above(tick)))
+
+
+class RangeIndex:
+    """Per-pool range indexes of all monitored positions"""
+
+    def __init__(self):
+        self.pools: Dict[str, PoolRangeIndex] = {}
+        self._ranges: Dict[str, PoolRanges] = {}
+        self.rebuilds = 0
+
+    def update(self, positions: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Index the current positions, re-sorting only pools whose ranges changed
+
+        Args:
+            positions: Position dicts with id, pool_address, tick_lower, tick_upper
+
+        Returns:
+            Pool addresses (as given in the positions) whose ranges changed
+        """
+        grouped: Dict[str, PoolRanges] = {}
+        for position in positions:
+            ranges = grouped.get(position["pool_address"])
+            if ranges is None:
+                ranges = grouped[position["pool_address"]] = ([], [], [])
+            ranges[0].append(position["id"])
+            ranges[1].append(position["tick_lower"])
+            ranges[2].append(position["tick_upper"])
+
+        changed = [pool for pool, ranges in grouped.items() if self._ranges.get(pool) != ranges]
+        for pool in changed:
+            self.pools[pool] = PoolRangeIndex(*grouped[pool])
+            self.rebuilds += 1
+        for pool in set(self.pools) - set(grouped):
+            del self.pools[pool]
+
+        self._ranges = grouped
+        return changed
+
+    def update_pool(self, pool_address: str, positions: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Index one pool's current positions, leaving the other pools as they are
+
+        Args:
+            pool_address: Pool address as given in the positions
+            positions: All of the pool's position dicts (none removes the pool)
+
+        Returns:
+            True if the pool's ranges changed
+        """
+        ranges: PoolRanges = ([], [], [])
+        for position in positions:
+            ranges[0].append(position["id"])
+            ranges[1].append(position["tick_lower"])
+            ranges[2].append(position["tick_upper"])
+
+        if not ranges[0]:
+            self._ranges.pop(pool_address, None)
+            return self.pools.pop(pool_address, None) is not None
+        if self._ranges.get(pool_address) == ranges:
+            return False
+
+        self._ranges[pool_address] = ranges
+        self.pools[pool_address] = PoolRangeIndex(*ranges)
+        self.rebuilds += 1
+        return True
+
+    def out_of_range(self, pool_address: str, tick: int) -> np.ndarray:
+        """
+        Ids of a pool's positions the tick is outside of
+
+        Args:
+            pool_address: Pool address as given in the positions
+            tick: Pool's current tick
+
+        Returns:
+            Position ids (empty if the pool has no positions)
+        """
+        index = self.pools.get(pool_address)
+        return index.out_of_range(tick) if index is not None else np.empty(0, dtype=np.int64)
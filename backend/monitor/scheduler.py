@@ -0,0 +1,115 @@
+"""
+Deadline scheduler for per-position checks
+
+A min-heap of (next due time, position id). The monitor sleeps until the
+earliest deadline and pops only the positions that are due, so each
+position is checked on its own check_interval and positions that aren't
+due cost nothing. Rescheduling or removing a position leaves its old heap
+entry behind; stale entries are skipped when they reach the top.
+
+edge_crossing_interval sizes adaptive intervals: how long until the pool
+price could plausibly reach a position's nearest range edge.
+"""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+SECONDS_PER_DAY = 86400
+
+# ln(1.0001): log-price change of one tick
+LOG_TICK = math.log(1.0001)
+
+
+class CheckScheduler:
+    """Next check time of every monitored position"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, position_id: int) -> bool:
+        return position_id in self._due
+
+    def schedule(self, position_id: int, due: float):
+        """
+        Set when a position is next checked (replacing any earlier deadline)
+
+        Args:
+            position_id: Position id
+            due: Monotonic time the check is due
+        """
+        self._due[position_id] = due
+        heapq.heappush(self._heap, (due, position_id))
+        # Stale entries pile up when positions are rescheduled early; rebuild
+        # once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(due, position_id) for position_id, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, position_id: int):
+        """Stop checking a position"""
+        self._due.pop(position_id, None)
+
+    def due_at(self, position_id: int) -> Optional[float]:
+        """When a position is next due, or None if it isn't scheduled"""
+        return self._due.get(position_id)
+
+    def next_due(self) -> Optional[float]:
+        """Earliest deadline, or None if nothing is scheduled"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float, limit: Optional[int] = None) -> List[int]:
+        """
+        Take the positions due by now, earliest first
+
+        Popped positions are unscheduled until schedule() is called again.
+
+        Args:
+            now: Current monotonic time
+            limit: Most positions to take (default: all due)
+
+        Returns:
+            Position ids
+        """
+        due = []
+        while self._heap and (limit is None or len(due) < limit):
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, position_id = heapq.heappop(self._heap)
+            del self._due[position_id]
+            due.append(position_id)
+        return due
+
+    def _drop_stale(self):
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+
+def edge_crossing_interval(distance_ticks: float, daily_volatility: float, sigmas: float) -> float:
+    """
+    Time until a move of distance_ticks becomes likely
+
+    The log price is treated as a random walk with the given daily
+    volatility, so its standard deviation after t seconds is
+    daily_volatility * sqrt(t / 1 day). The interval is the t at which the
+    distance equals sigmas standard deviations.
+
+    Args:
+        distance_ticks: Ticks to the nearest range edge
+        daily_volatility: Daily volatility of the pool's log price
+        sigmas: Standard deviations the distance must span
+
+    Returns:
+        Seconds (0 at the edge, infinite without volatility)
+    """
+    if distance_ticks <= 0:
+        return 0.0
+    if daily_volatility <= 0:
+        return math.inf
+    return SECONDS_PER_DAY * (distance_ticks * LOG_TICK / (sigmas * daily_volatility)) ** 2
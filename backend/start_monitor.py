@@ -29,6 +29,8 @@ async def main():
     
     print(f"Backend URL: {backend_url}")
     print(f"Contract Address: {contract_address or 'Not set (simulation mode)'}")
+    if os.getenv("MONITOR_SHARDS"):
+        print(f"Shards: {os.getenv('MONITOR_SHARDS')} (leased with the other workers through the database)")
     print("=" * 50)
     
     try:
@@ -2,14 +2,30 @@
 Backtesting framework for strategies.
 """
 import sys
+import time
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
+
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.logger import log
 from src.utils.config import get_config
+from src.backtest.engine import (
+    BacktestEngine,
+    generate_price_history,
+    load_price_history,
+    parse_interval,
+)
+from src.backtest.sweep import (
+    DEFAULT_GRID,
+    DEFAULT_RANGES,
+    build_grid,
+    format_results_table,
+    run_sweep,
+    sample_params,
+)
 
 
 def parse_args():
@@ -49,17 +65,148 @@ def parse_args():
         '--interval',
         type=str,
         default='1h',
-        help='Data interval (e.g., 1h, 4h, 1d)'
+        help='Data interval (e.g., 1m, 1h, 4h, 1d)'
+    )
+    
+    parser.add_argument(
+        '--data',
+        type=str,
+        default=None,
+        help='CSV price history (timestamp,price); synthetic GBM prices if omitted'
+    )
+    
+    parser.add_argument(
+        '--fee-apr',
+        type=float,
+        default=0.08,
+        help='Fee APR of a full-range position while in range (default: 0.08)'
+    )
+    
+    parser.add_argument(
+        '--volatility',
+        type=float,
+        default=0.04,
+        help='Daily volatility for synthetic prices (default: 0.04)'
+    )
+    
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Random seed for synthetic prices'
+    )
+    
+    parser.add_argument(
+        '--sweep',
+        type=str,
+        default=None,
+        choices=['grid', 'random'],
+        help='Sweep strategy parameters instead of running a single backtest'
+    )
+    
+    parser.add_argument(
+        '--param',
+        type=str,
+        action='append',
+        default=[],
+        help='Sweep values, e.g. rebalance_threshold=0.02,0.05 (grid) or '
+             'rebalance_threshold=0.01:0.3 (random); repeatable'
+    )
+    
+    parser.add_argument(
+        '--samples',
+        type=int,
+        default=200,
+        help='Parameter sets to draw in random sweeps (default: 200)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for sweeps (default: all cores)'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=20,
+        help='Rows to show in the sweep results table (default: 20)'
     )
     
     return parser.parse_args()
 
 
-def run_backtest(strategy_type: str, pool_name: str, capital: float, days: int, interval: str):
+def parse_sweep_params(specs, mode: str):
+    """
+    Parse --param overrides on top of the default grid/ranges.
+    
+    Args:
+        specs: NAME=v1,v2,... (grid) or NAME=low:high (random) strings
+        mode: 'grid' or 'random'
+        
+    Returns:
+        Grid values or sampling ranges keyed by config key
+    """
+    values = dict(DEFAULT_GRID if mode == 'grid' else DEFAULT_RANGES)
+    
+    for spec in specs:
+        name, _, raw = spec.partition('=')
+        key = name if name.startswith('strategy.') else f'strategy.{name}'
+        if key not in DEFAULT_GRID:
+            raise ValueError(f"Unknown sweep parameter: {name}")
+        
+        is_integer = DEFAULT_RANGES[key][2]
+        if mode == 'grid':
+            cast = int if is_integer else float
+            values[key] = [cast(v) for v in raw.split(',')]
+        else:
+            low, high = raw.split(':')
+            values[key] = (float(low), float(high), is_integer)
+    
+    return values
+
+
+def load_prices(data_path: str, days: int, interval: str, volatility: float, seed: int):
+    """
+    Load the price history to replay.
+    
+    Returns:
+        (timestamps, prices)
+    """
+    interval_seconds = parse_interval(interval)
+    
+    if data_path is None:
+        log.warning("No --data given - using synthetic GBM prices")
+        return generate_price_history(days, interval_seconds, daily_volatility=volatility, seed=seed)
+    
+    timestamps, prices = load_price_history(data_path)
+    
+    # Keep the last `days` of history, resampled to the requested interval
+    keep = timestamps >= timestamps[-1] - days * 86400
+    timestamps, prices = timestamps[keep], prices[keep]
+    buckets = np.floor((timestamps - timestamps[0]) / interval_seconds)
+    last_in_bucket = np.append(buckets[1:] != buckets[:-1], True)
+    
+    return timestamps[last_in_bucket], prices[last_in_bucket]
+
+
+def run_backtest(
+    strategy_type: str,
+    pool_name: str,
+    capital: float,
+    days: int,
+    interval: str,
+    data_path: str = None,
+    fee_apr: float = 0.08,
+    volatility: float = 0.04,
+    seed: int = None
+):
     """
     Run backtest for strategy.
     
-    This is a placeholder - implement full backtesting logic.
+    Replays the price history through the optimizer's range selection and
+    rebalance rules, accounting for fees, impermanent loss and gas.
     """
     log.info("=" * 80)
     log.info("BACKTESTING")
@@ -71,36 +218,62 @@ def run_backtest(strategy_type: str, pool_name: str, capital: float, days: int,
     log.info(f"Interval: {interval}")
     log.info("=" * 80)
     
-    # TODO: Implement backtesting
-    # 1. Load historical price data
-    # 2. Simulate strategy execution
-    # 3. Track positions, fees, gas costs
-    # 4. Calculate performance metrics
-    # 5. Generate report and charts
-    
-    log.warning("Backtesting not yet implemented - this is a placeholder")
-    
-    # Placeholder results
-    results = {
-        'total_return': 15.5,  # %
-        'fees_earned': 1750,   # USD
-        'gas_costs': 150,      # USD
-        'net_profit': 1600,    # USD
-        'roi': 16.0,           # %
-        'num_rebalances': 12,
-        'avg_position_duration': 2.5,  # days
-        'sharpe_ratio': 1.8
-    }
+    timestamps, prices = load_prices(data_path, days, interval, volatility, seed)
+    log.info(f"Loaded {len(prices):,} price samples")
+    
+    engine = BacktestEngine(timestamps, prices, pool_name, base_fee_apr=fee_apr)
+    results = engine.run(strategy_type, capital)
     
     log.info("\nBacktest Results:")
-    log.info(f"  Total Return: {results['total_return']:.2f}%")
+    log.info(f"  Total Return: {results['total_return']:.2f}% (HODL: {results['hodl_return']:.2f}%)")
     log.info(f"  Fees Earned: ${results['fees_earned']:,.2f}")
     log.info(f"  Gas Costs: ${results['gas_costs']:,.2f}")
+    log.info(f"  Impermanent Loss: ${results['impermanent_loss']:,.2f}")
     log.info(f"  Net Profit: ${results['net_profit']:,.2f}")
     log.info(f"  ROI: {results['roi']:.2f}%")
     log.info(f"  Rebalances: {results['num_rebalances']}")
     log.info(f"  Avg Position Duration: {results['avg_position_duration']:.1f} days")
+    log.info(f"  Time In Range: {results['time_in_range']:.1f}%")
     log.info(f"  Sharpe Ratio: {results['sharpe_ratio']:.2f}")
+    log.info(f"  Replay Time: {results['elapsed_seconds']:.2f}s")
+    
+    return results
+
+
+def run_parameter_sweep(args):
+    """Run a parallel parameter sweep and log the ranked results."""
+    log.info("=" * 80)
+    log.info(f"PARAMETER SWEEP ({args.sweep})")
+    log.info("=" * 80)
+    log.info(f"Strategy: {args.strategy}")
+    log.info(f"Pool: {args.pool}")
+    log.info(f"Capital: ${args.capital:,.2f}")
+    log.info(f"Period: {args.days} days @ {args.interval}")
+    
+    values = parse_sweep_params(args.param, args.sweep)
+    if args.sweep == 'grid':
+        param_sets = build_grid(values)
+    else:
+        param_sets = sample_params(values, args.samples, seed=args.seed)
+    
+    timestamps, prices = load_prices(args.data, args.days, args.interval, args.volatility, args.seed)
+    log.info(f"Loaded {len(prices):,} price samples, {len(param_sets):,} parameter sets")
+    
+    start = time.perf_counter()
+    results = run_sweep(
+        timestamps,
+        prices,
+        args.pool,
+        args.strategy,
+        args.capital,
+        param_sets,
+        workers=args.workers,
+        base_fee_apr=args.fee_apr
+    )
+    elapsed = time.perf_counter() - start
+    
+    log.info(f"Swept {len(results):,} parameter sets in {elapsed:.2f}s")
+    log.info("\n" + format_results_table(results, top=args.top))
     
     return results
 
@@ -109,12 +282,21 @@ def main():
     """Main entry point."""
     args = parse_args()
     
+    if args.sweep:
+        run_parameter_sweep(args)
+        log.info("\nSweep complete!")
+        return
+    
     results = run_backtest(
         strategy_type=args.strategy,
         pool_name=args.pool,
         capital=args.capital,
         days=args.days,
-        interval=args.interval
+        interval=args.interval,
+        data_path=args.data,
+        fee_apr=args.fee_apr,
+        volatility=args.volatility,
+        seed=args.seed
     )
     
     log.info("\nBacktest complete!")
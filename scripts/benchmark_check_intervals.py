@@ -0,0 +1,191 @@
+"""
+Benchmark fixed vs adaptive position check intervals.
+
+Simulates a pool tick path (a random walk with the given daily volatility,
+one step per block) and positions of random widths around the starting
+tick, then polls each position the way the monitor would: every
+check_interval seconds, or adaptively by how soon its nearest range edge
+could be reached (edge_crossing_interval, within the monitor's bounds).
+Reports checks made (pool reads when the pool isn't tracked) and how long
+each position spent out of range before a check saw it (or until the end,
+if none did). Adaptive mode must not lengthen that time: each adaptive run
+is flagged if its mean or p99 is worse than the fixed interval's.
+
+No RPC connection is needed.
+
+Usage:
+    python scripts/benchmark_check_intervals.py
+    python scripts/benchmark_check_intervals.py --volatility 0.08 --hours 48 --sigmas 2 3 4
+"""
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.monitor.scheduler import LOG_TICK, SECONDS_PER_DAY, edge_crossing_interval
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark fixed vs adaptive check intervals')
+
+    parser.add_argument(
+        '--positions',
+        type=int,
+        default=200,
+        help='Positions to simulate (default: 200)'
+    )
+
+    parser.add_argument(
+        '--hours',
+        type=float,
+        default=24,
+        help='Simulated hours (default: 24)'
+    )
+
+    parser.add_argument(
+        '--volatility',
+        type=float,
+        default=0.05,
+        help='Daily volatility of the pool price (default: 0.05)'
+    )
+
+    parser.add_argument(
+        '--block-time',
+        type=float,
+        default=2.0,
+        help='Seconds per block (default: 2)'
+    )
+
+    parser.add_argument(
+        '--check-interval',
+        type=float,
+        default=60,
+        help='Fixed check interval in seconds (default: 60)'
+    )
+
+    parser.add_argument(
+        '--min-interval',
+        type=float,
+        default=10,
+        help='Shortest adaptive interval in seconds (default: 10)'
+    )
+
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        default=3600,
+        help='Longest adaptive interval in seconds (default: 3600)'
+    )
+
+    parser.add_argument(
+        '--sigmas',
+        type=float,
+        nargs='+',
+        default=[4.0],
+        help='Edge crossing standard deviations to try (default: 4, the monitor default)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed (default: 42)'
+    )
+
+    return parser.parse_args()
+
+
+def make_path(hours: float, volatility: float, block_time: float, rng) -> np.ndarray:
+    """Pool tick at each block of a random walk with the given daily volatility."""
+    blocks = int(hours * 3600 / block_time)
+    step = volatility * np.sqrt(block_time / SECONDS_PER_DAY) / LOG_TICK
+    return np.round(np.cumsum(rng.normal(0.0, step, blocks))).astype(np.int64)
+
+
+def make_positions(count: int, rng):
+    """Ranges of random width (10 to 2000 ticks per side) around tick 0."""
+    half_widths = rng.integers(10, 2000, count)
+    offsets = (rng.random(count) - 0.5) * half_widths
+    return [(int(offset - width), int(offset + width)) for offset, width in zip(offsets, half_widths)]
+
+
+def poll(ticks: np.ndarray, block_time: float, tick_lower: int, tick_upper: int, next_interval):
+    """
+    Check one position until it is seen out of range.
+
+    Returns:
+        (checks made, seconds spent out of range until then, or None if the
+        position never left its range)
+    """
+    outside = (ticks < tick_lower) | (ticks > tick_upper)
+    time_outside = np.cumsum(outside) * block_time
+
+    checks = 0
+    t = 0.0
+    end = len(ticks) * block_time
+    while t < end:
+        block = int(t / block_time)
+        checks += 1
+        if outside[block]:
+            return checks, float(time_outside[block])
+        t += next_interval(int(ticks[block]), tick_lower, tick_upper)
+    return checks, float(time_outside[-1]) if outside.any() else None
+
+
+def summarize(name: str, results, hours: float):
+    """Print checks and out-of-range time before detection of one strategy; returns (checks, mean, p99)."""
+    checks = sum(count for count, _ in results)
+    delays = np.array([delay for _, delay in results if delay is not None])
+    mean_delay = delays.mean() if len(delays) else 0.0
+    p99_delay = np.percentile(delays, 99) if len(delays) else 0.0
+    print(
+        f"  {name:<26} {checks:>10,} {checks / hours:>11,.0f} "
+        f"{mean_delay:>10.1f}s {p99_delay:>10.1f}s {delays.sum() / 3600:>10.2f}h"
+    )
+    return checks, mean_delay, p99_delay
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    ticks = make_path(args.hours, args.volatility, args.block_time, rng)
+    positions = make_positions(args.positions, rng)
+
+    print("=" * 80)
+    print("POSITION CHECKS: FIXED vs ADAPTIVE INTERVALS")
+    print("=" * 80)
+    print(
+        f"\n{args.positions} positions, {args.hours:g}h at {args.volatility:.1%} daily volatility "
+        f"(tick range {ticks.min()} to {ticks.max()})"
+    )
+    print(f"  {'strategy':<26} {'checks':>10} {'per hour':>11} {'mean out':>11} {'p99 out':>11} {'total out':>11}")
+
+    fixed = [
+        poll(ticks, args.block_time, lower, upper, lambda *_: args.check_interval)
+        for lower, upper in positions
+    ]
+    fixed_checks, fixed_mean, fixed_p99 = summarize(f"fixed {args.check_interval:g}s", fixed, args.hours)
+
+    for sigmas in args.sigmas:
+        def adaptive_interval(tick, tick_lower, tick_upper, sigmas=sigmas):
+            distance = min(tick - tick_lower, tick_upper - tick)
+            interval = edge_crossing_interval(distance, args.volatility, sigmas)
+            return min(max(interval, args.min_interval), args.max_interval)
+
+        adaptive = [poll(ticks, args.block_time, lower, upper, adaptive_interval) for lower, upper in positions]
+        checks, mean_delay, p99_delay = summarize(f"adaptive {sigmas:g} sigma", adaptive, args.hours)
+        worse = mean_delay > fixed_mean or p99_delay > fixed_p99
+        print(
+            f"  {'':<26} {fixed_checks / max(checks, 1):>9.1f}x fewer checks, "
+            f"out-of-range time {'WORSE than' if worse else 'no worse than'} fixed"
+        )
+
+
+if __name__ == '__main__':
+    main()
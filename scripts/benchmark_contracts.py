@@ -0,0 +1,115 @@
+"""
+Benchmark per-call contract overhead with and without the registry.
+
+Measures the local cost of getting a ready-to-call contract object (the
+part paid before any RPC request): checksumming the address and building
+the Contract from its ABI on every call, versus a ContractRegistry lookup.
+No RPC connection is needed.
+
+Usage:
+    python scripts/benchmark_contracts.py
+    python scripts/benchmark_contracts.py --calls 5000 --pools 50
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from web3 import Web3
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.dex.abis import POOL_ABI, POSITION_MANAGER_ABI
+from src.dex.contracts import ContractRegistry, to_checksum_address
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark contract object overhead')
+
+    parser.add_argument(
+        '--calls',
+        type=int,
+        default=1000,
+        help='Lookups per measurement (default: 1000)'
+    )
+
+    parser.add_argument(
+        '--pools',
+        type=int,
+        default=20,
+        help='Distinct pool addresses cycled through (default: 20)'
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Timing repetitions, best is reported (default: 3)'
+    )
+
+    return parser.parse_args()
+
+
+def best_time(fn, repeat: int) -> float:
+    """Best wall time of fn over repeat runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    w3 = Web3()
+    registry = ContractRegistry(w3)
+    addresses = [f"0x{i:040x}" for i in range(1, args.pools + 1)]
+    lookups = [addresses[i % len(addresses)] for i in range(args.calls)]
+
+    def checksum_uncached():
+        for address in lookups:
+            Web3.to_checksum_address(address)
+
+    def checksum_cached():
+        for address in lookups:
+            to_checksum_address(address)
+
+    def contract_per_call(abi):
+        def run():
+            for address in lookups:
+                w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        return run
+
+    def contract_registry(abi):
+        # Steady state: each contract was built by an earlier call
+        for address in addresses:
+            registry.get(address, abi)
+
+        def run():
+            for address in lookups:
+                registry.get(address, abi)
+        return run
+
+    cases = [
+        ('checksum address', checksum_uncached, checksum_cached),
+        ('pool contract', contract_per_call(POOL_ABI), contract_registry(POOL_ABI)),
+        ('position manager contract', contract_per_call(POSITION_MANAGER_ABI), contract_registry(POSITION_MANAGER_ABI)),
+    ]
+
+    print("=" * 80)
+    print(f"CONTRACT OVERHEAD ({args.calls:,} calls over {args.pools} addresses)")
+    print("=" * 80)
+    print(f"  {'':<28} {'before (us/call)':>17} {'after (us/call)':>16} {'speedup':>9}")
+
+    for name, before_fn, after_fn in cases:
+        before = best_time(before_fn, args.repeat) / args.calls * 1e6
+        after = best_time(after_fn, args.repeat) / args.calls * 1e6
+        print(f"  {name:<28} {before:>17.2f} {after:>16.2f} {before / after:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""
+Micro-benchmarks for the liquidity math utilities.
+
+Compares the scalar functions in src/utils/math.py (called in a Python loop)
+with the array versions in src/utils/vector_math.py, and the float tick math
+with the exact integer port in src/utils/tick_math.py (after checking the
+port against known on-chain vectors).
+
+Usage:
+    python scripts/benchmark_math.py
+    python scripts/benchmark_math.py --sizes 10000 1000000 --repeat 3
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import math as scalar_math
+from src.utils import vector_math
+from src.utils import tick_math
+
+
+# Known results from the Uniswap V3 core/periphery test suites
+# (TickMath.spec, SqrtPriceMath.spec, SwapMath.spec, LiquidityAmounts.spec)
+SQRT_RATIO_VECTORS = [
+    (tick_math.MIN_TICK, 4295128739),
+    (-1, 79224201403219477170569942574),
+    (0, 79228162514264337593543950336),
+    (1, 79232123823359799118286999568),
+    (tick_math.MAX_TICK, 1461446703485210103287273052203988822378723970342),
+]
+
+# encodePriceSqrt(1, 1), encodePriceSqrt(101, 100), encodePriceSqrt(121, 100), encodePriceSqrt(100, 110),
+# encodePriceSqrt(110, 100), encodePriceSqrt(99, 110), encodePriceSqrt(111, 100)
+PRICE_1_1 = 79228162514264337593543950336
+PRICE_101_100 = 79623317895830914510639640423
+PRICE_121_100 = 87150978765690771352898345369
+PRICE_100_110 = 75541088972021052633037516895
+PRICE_110_100 = 83095197869223157895945127772
+PRICE_99_110 = 75162434512514379355950439203
+PRICE_111_100 = 83472048772503575395047779114
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark scalar vs vectorized tick math')
+
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[10_000, 1_000_000],
+        help='Number of elements per benchmark'
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Repetitions per measurement (best time is reported)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed for the generated inputs'
+    )
+
+    return parser.parse_args()
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the best wall-clock time of fn() over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_inputs(size: int, seed: int) -> dict:
+    """Generate a realistic mix of in-range, below-range and above-range inputs."""
+    rng = np.random.default_rng(seed)
+
+    prices = 2500.0 * np.exp(rng.normal(0.0, 0.05, size))
+    centers = 2500.0 * np.exp(rng.normal(0.0, 0.05, size))
+    widths = rng.uniform(0.005, 0.10, size)
+
+    return {
+        'prices': prices,
+        'ticks': vector_math.price_to_tick(prices),
+        'price_lower': centers * (1 - widths),
+        'price_upper': centers * (1 + widths),
+        'range_percent': widths,
+        'amount0': rng.uniform(0.1, 10.0, size),
+        'amount1': rng.uniform(100.0, 10_000.0, size),
+        'liquidity': rng.uniform(1e3, 1e6, size),
+    }
+
+
+def benchmark_cases(data: dict) -> list:
+    """Build (name, scalar_fn, vector_fn) benchmark triples."""
+    prices = data['prices']
+    ticks = data['ticks']
+    lower = data['price_lower']
+    upper = data['price_upper']
+    pct = data['range_percent']
+    a0 = data['amount0']
+    a1 = data['amount1']
+    liq = data['liquidity']
+
+    # Scalar versions receive plain Python floats, as in production call sites
+    prices_l, ticks_l = prices.tolist(), ticks.tolist()
+    lower_l, upper_l, pct_l = lower.tolist(), upper.tolist(), pct.tolist()
+    a0_l, a1_l, liq_l = a0.tolist(), a1.tolist(), liq.tolist()
+
+    return [
+        (
+            'price_to_tick',
+            lambda: [scalar_math.price_to_tick(p, 10) for p in prices_l],
+            lambda: vector_math.price_to_tick(prices, 10),
+        ),
+        (
+            'tick_to_price',
+            lambda: [scalar_math.tick_to_price(t) for t in ticks_l],
+            lambda: vector_math.tick_to_price(ticks),
+        ),
+        (
+            'get_tick_range',
+            lambda: [scalar_math.get_tick_range(p, r, 10) for p, r in zip(prices_l, pct_l)],
+            lambda: vector_math.get_tick_range(prices, pct, 10),
+        ),
+        (
+            'calculate_liquidity',
+            lambda: [
+                scalar_math.calculate_liquidity(x, y, p, lo, hi)
+                for x, y, p, lo, hi in zip(a0_l, a1_l, prices_l, lower_l, upper_l)
+            ],
+            lambda: vector_math.calculate_liquidity(a0, a1, prices, lower, upper),
+        ),
+        (
+            'calculate_amounts_from_liquidity',
+            lambda: [
+                scalar_math.calculate_amounts_from_liquidity(l, p, lo, hi)
+                for l, p, lo, hi in zip(liq_l, prices_l, lower_l, upper_l)
+            ],
+            lambda: vector_math.calculate_amounts_from_liquidity(liq, prices, lower, upper),
+        ),
+    ]
+
+
+def check_agreement(data: dict, sample: int = 1000):
+    """Verify the vectorized results match the scalar ones on a sample."""
+    n = min(sample, len(data['prices']))
+    prices = data['prices'][:n]
+    lower = data['price_lower'][:n]
+    upper = data['price_upper'][:n]
+
+    ticks = vector_math.price_to_tick(prices, 10)
+    expected = [scalar_math.price_to_tick(p, 10) for p in prices.tolist()]
+    # math.log(x, base) and log(x)/log(base) can differ in the last ulp, which
+    # only matters for prices sitting exactly on a tick boundary
+    mismatches = int(np.count_nonzero(ticks != np.array(expected)))
+    if mismatches > n // 1000:
+        raise AssertionError(f"price_to_tick mismatch on {mismatches}/{n} samples")
+
+    liq = vector_math.calculate_liquidity(data['amount0'][:n], data['amount1'][:n], prices, lower, upper)
+    expected = [
+        scalar_math.calculate_liquidity(x, y, p, lo, hi)
+        for x, y, p, lo, hi in zip(data['amount0'][:n], data['amount1'][:n], prices, lower, upper)
+    ]
+    np.testing.assert_allclose(liq, expected, rtol=1e-9)
+
+    amount0, amount1 = vector_math.calculate_amounts_from_liquidity(data['liquidity'][:n], prices, lower, upper)
+    expected = [
+        scalar_math.calculate_amounts_from_liquidity(l, p, lo, hi)
+        for l, p, lo, hi in zip(data['liquidity'][:n], prices, lower, upper)
+    ]
+    np.testing.assert_allclose(amount0, [e[0] for e in expected], rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(amount1, [e[1] for e in expected], rtol=1e-9, atol=1e-9)
+
+
+def verify_exact_vectors():
+    """Check the integer port against known on-chain results."""
+    for tick, expected in SQRT_RATIO_VECTORS:
+        actual = tick_math.get_sqrt_ratio_at_tick(tick)
+        assert actual == expected, f"getSqrtRatioAtTick({tick}) = {actual}, expected {expected}"
+
+    assert tick_math.get_tick_at_sqrt_ratio(tick_math.MIN_SQRT_RATIO) == tick_math.MIN_TICK
+    assert tick_math.get_tick_at_sqrt_ratio(tick_math.MAX_SQRT_RATIO - 1) == tick_math.MAX_TICK - 1
+    for tick in (-500000, -60, -1, 0, 1, 60, 195000, 500000):
+        sqrt_ratio = tick_math.get_sqrt_ratio_at_tick(tick)
+        assert tick_math.get_tick_at_sqrt_ratio(sqrt_ratio) == tick
+        assert tick_math.get_tick_at_sqrt_ratio(sqrt_ratio - 1) == tick - 1
+
+    one = 10 ** 18
+    assert tick_math.get_amount0_delta(PRICE_1_1, PRICE_121_100, one, True) == 90909090909090910
+    assert tick_math.get_amount0_delta(PRICE_1_1, PRICE_121_100, one, False) == 90909090909090909
+    assert tick_math.get_amount1_delta(PRICE_1_1, PRICE_121_100, one, True) == 100000000000000000
+    assert tick_math.get_amount1_delta(PRICE_1_1, PRICE_121_100, one, False) == 99999999999999999
+
+    cases = [
+        (PRICE_1_1, 2148, (99, 99)),      # price inside range
+        (PRICE_99_110, 1048, (99, 0)),    # price below range
+        (PRICE_111_100, 2097, (0, 199)),  # price above range
+    ]
+    for sqrt_price, liquidity, amounts in cases:
+        assert tick_math.get_liquidity_for_amounts(
+            sqrt_price, PRICE_100_110, PRICE_110_100, 100, 200
+        ) == liquidity
+        assert tick_math.get_amounts_for_liquidity(
+            sqrt_price, PRICE_100_110, PRICE_110_100, liquidity
+        ) == amounts
+
+    # SwapMath.spec: exact amount in, capped at the price target, one for zero
+    assert tick_math.compute_swap_step(PRICE_1_1, PRICE_101_100, 2 * one, one, 600) == (
+        PRICE_101_100, 9975124224178055, 9925619580021728, 5988667735148
+    )
+
+    table = tick_math.get_sqrt_ratio_table(10)
+    for tick in (-887270, -100, 0, 10, 887270):
+        assert table.get(tick) == tick_math.get_sqrt_ratio_at_tick(tick)
+
+
+def benchmark_exact(size: int, repeat: int, seed: int):
+    """Compare the float tick math with the exact integer port."""
+    rng = np.random.default_rng(seed)
+    tick_spacing = 10
+    ticks = (rng.integers(190000, 200000, size) // tick_spacing * tick_spacing).tolist()
+    # Prices just above a tick boundary, where float rounding matters most
+    sqrt_prices = [tick_math.get_sqrt_ratio_at_tick(t) + 1 for t in ticks]
+    prices = [(s / 2 ** 96) ** 2 for s in sqrt_prices]
+
+    table = tick_math.get_sqrt_ratio_table(tick_spacing)
+    table.warm(min(ticks), max(ticks))
+
+    cases = [
+        (
+            'tick -> price',
+            lambda: [scalar_math.tick_to_price(t) for t in ticks],
+            lambda: [tick_math.get_sqrt_ratio_at_tick(t) for t in ticks],
+        ),
+        (
+            'tick -> price (cached table)',
+            lambda: [scalar_math.tick_to_price(t) for t in ticks],
+            lambda: [table.get(t) for t in ticks],
+        ),
+        (
+            'price -> tick',
+            lambda: [scalar_math.price_to_tick(p) for p in prices],
+            lambda: [tick_math.get_tick_at_sqrt_ratio(s) for s in sqrt_prices],
+        ),
+        (
+            'mint amounts',
+            lambda: [
+                scalar_math.calculate_amounts_from_liquidity(
+                    10 ** 15, p, scalar_math.tick_to_price(t - 500), scalar_math.tick_to_price(t + 500)
+                )
+                for p, t in zip(prices, ticks)
+            ],
+            lambda: [
+                tick_math.get_mint_amounts(s, t - 500, t + 500, 10 ** 18, 10 ** 9, tick_spacing)
+                for s, t in zip(sqrt_prices, ticks)
+            ],
+        ),
+    ]
+
+    print(f"\n{size:,} elements (float vs exact integer)")
+    print(f"  {'operation':<34} {'float':>12} {'exact':>12} {'ratio':>10}")
+    for name, float_fn, exact_fn in cases:
+        float_time = best_time(float_fn, repeat)
+        exact_time = best_time(exact_fn, repeat)
+        print(f"  {name:<34} {float_time * 1e3:>10.2f}ms {exact_time * 1e3:>10.2f}ms "
+              f"{exact_time / float_time:>9.1f}x")
+
+    # How far the float path drifts from on-chain ticks
+    float_ticks = np.array([scalar_math.price_to_tick(p) for p in prices])
+    exact_ticks = np.array([tick_math.get_tick_at_sqrt_ratio(s) for s in sqrt_prices])
+    drift = np.count_nonzero(float_ticks != exact_ticks)
+    print(f"  float price_to_tick differs from getTickAtSqrtRatio on {drift:,}/{size:,} inputs")
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("SCALAR vs VECTORIZED TICK MATH")
+    print("=" * 80)
+
+    check_agreement(make_inputs(10_000, args.seed))
+    print("Vectorized results agree with scalar implementation")
+
+    verify_exact_vectors()
+    print("Integer tick math matches on-chain vectors")
+
+    for size in args.sizes:
+        data = make_inputs(size, args.seed)
+        print(f"\n{size:,} elements")
+        print(f"  {'function':<34} {'scalar':>12} {'vectorized':>12} {'speedup':>10}")
+
+        for name, scalar_fn, vector_fn in benchmark_cases(data):
+            scalar_time = best_time(scalar_fn, args.repeat)
+            vector_time = best_time(vector_fn, args.repeat)
+            print(f"  {name:<34} {scalar_time * 1e3:>10.2f}ms {vector_time * 1e3:>10.2f}ms "
+                  f"{scalar_time / vector_time:>9.1f}x")
+
+    benchmark_exact(min(args.sizes), args.repeat, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark and accuracy check for the range-exit Monte Carlo engine.
+
+Compares the simulated out-of-range probability of a driftless log-price
+with the closed-form double-barrier result, then times the GBM and
+bootstrap engines at the path counts the analytics endpoint uses.
+
+Usage:
+    python scripts/benchmark_monte_carlo.py
+    python scripts/benchmark_monte_carlo.py --paths 100000 1000000 --repeat 5
+"""
+import sys
+import time
+import math
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from monte_carlo import simulate_range_exit, tick_range_barriers
+
+
+# (tick_range, horizon_minutes, daily_volatility)
+ACCURACY_CASES = [
+    (50, 60, 0.04),
+    (200, 240, 0.04),
+    (500, 1440, 0.04),
+    (1000, 1440, 0.08),
+]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark the range-exit Monte Carlo engine')
+
+    parser.add_argument(
+        '--paths',
+        type=int,
+        nargs='+',
+        default=[100_000],
+        help='Path counts to benchmark (default: 100000)'
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Timing repetitions, best is reported (default: 5)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed (default: 42)'
+    )
+
+    return parser.parse_args()
+
+
+def double_barrier_exit_probability(lower: float, upper: float, horizon_days: float, volatility: float) -> float:
+    """Exit probability of a driftless Brownian motion started at 0 (eigenfunction series)."""
+    width = upper - lower
+    stay = 0.0
+    for k in range(1, 2001, 2):
+        stay += (4 / (k * math.pi)) * math.sin(k * math.pi * -lower / width) * math.exp(
+            -(k * math.pi * volatility) ** 2 * horizon_days / (2 * width ** 2)
+        )
+    return 1 - stay
+
+
+def check_accuracy(seed: int):
+    """Simulated exit probabilities must match the closed form within sampling error."""
+    print(f"  {'ticks':>6} {'minutes':>8} {'analytic':>10} {'simulated':>10} {'steps':>6}")
+    for tick_range, horizon_minutes, volatility in ACCURACY_CASES:
+        lower, upper = tick_range_barriers(tick_range)
+        expected = double_barrier_exit_probability(lower, upper, horizon_minutes / 1440, volatility)
+
+        # Drift of sigma^2 / 2 cancels the GBM convexity term (driftless log-price)
+        result = simulate_range_exit(
+            lower, upper, horizon_minutes, volatility,
+            daily_drift=volatility ** 2 / 2, num_paths=400_000, seed=seed
+        )
+        simulated = result['probability_out_of_range']
+        print(f"  {tick_range:>6} {horizon_minutes:>8} {expected:>10.4f} {simulated:>10.4f} {result['num_steps']:>6}")
+
+        tolerance = 4 * math.sqrt(expected * (1 - expected) / 400_000) + 0.002
+        assert abs(simulated - expected) < tolerance, f"{tick_range} ticks: {simulated} vs {expected}"
+
+
+def best_time(fn, repeat: int) -> float:
+    """Best wall time of fn over repeat runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("RANGE-EXIT MONTE CARLO")
+    print("=" * 80)
+
+    check_accuracy(args.seed)
+    print("Simulated exit probabilities match the double-barrier closed form")
+
+    lower, upper = tick_range_barriers(200)
+    returns = np.random.default_rng(args.seed).standard_t(4, 2000) * 0.004
+
+    for num_paths in args.paths:
+        gbm = best_time(
+            lambda: simulate_range_exit(lower, upper, 240, 0.04, num_paths=num_paths, seed=args.seed),
+            args.repeat
+        )
+        bootstrap = best_time(
+            lambda: simulate_range_exit(
+                lower, upper, 240, returns=returns, returns_interval_minutes=60,
+                method='bootstrap', num_paths=num_paths, seed=args.seed
+            ),
+            args.repeat
+        )
+        print(f"\n{num_paths:,} paths")
+        print(f"  gbm        {gbm * 1e3:>8.2f}ms")
+        print(f"  bootstrap  {bootstrap * 1e3:>8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark the monitor's per-pool range index.
+
+Times one monitoring cycle's range check over many positions spread across
+a few pools: the per-position comparison loop against the monitor's
+RangeIndex, which regroups the positions each cycle (re-sorting only pools
+whose ranges changed) and finds the out-of-range ones with searchsorted.
+Both find the same positions (checked first).
+
+No RPC connection is needed: pool ticks are drawn at random.
+
+Usage:
+    python scripts/benchmark_range_index.py
+    python scripts/benchmark_range_index.py --positions 10000 100000 --pools 20
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.monitor.range_index import RangeIndex
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark the per-pool range index')
+
+    parser.add_argument(
+        '--positions',
+        type=int,
+        nargs='+',
+        default=[10_000, 100_000],
+        help='Position counts to benchmark (default: 10000 100000)'
+    )
+
+    parser.add_argument(
+        '--pools',
+        type=int,
+        default=10,
+        help='Pools the positions are spread over (default: 10)'
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Timing repetitions, best is reported (default: 5)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed (default: 42)'
+    )
+
+    return parser.parse_args()
+
+
+def best_time(fn, repeat: int) -> float:
+    """Best wall time of fn over repeat runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_positions(count: int, pools: int, seed: int):
+    """Random positions around each pool's tick, and the pools' current ticks."""
+    rng = np.random.default_rng(seed)
+    pool_addresses = [f"0x{i + 1:040x}" for i in range(pools)]
+    centers = rng.integers(-200000, 200000, pools)
+    ticks = {address: int(center + rng.integers(-300, 300)) for address, center in zip(pool_addresses, centers)}
+
+    pool_ids = rng.integers(0, pools, count)
+    mids = centers[pool_ids] + rng.integers(-2000, 2000, count)
+    widths = rng.integers(10, 2000, count)
+    positions = [
+        {
+            "id": i,
+            "pool_address": pool_addresses[pool_id],
+            "tick_lower": int(mid - width),
+            "tick_upper": int(mid + width),
+        }
+        for i, (pool_id, mid, width) in enumerate(zip(pool_ids, mids, widths))
+    ]
+    return positions, ticks
+
+
+def loop_out_of_range(positions, ticks):
+    """Per-position comparison (one status per position)."""
+    statuses = {}
+    for position in positions:
+        current_tick = ticks[position["pool_address"]]
+        statuses[position["id"]] = position["tick_lower"] <= current_tick <= position["tick_upper"]
+    return {position_id for position_id, in_range in statuses.items() if not in_range}
+
+
+def index_out_of_range(index: RangeIndex, positions, ticks):
+    """Update the index (a no-op re-sort when nothing changed), searchsorted per pool."""
+    index.update(positions)
+    out_of_range = set()
+    for pool_address in index.pools:
+        out_of_range.update(index.out_of_range(pool_address, ticks[pool_address]).tolist())
+    return out_of_range
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("RANGE CHECK: PER POSITION vs PER-POOL INDEX")
+    print("=" * 80)
+
+    for count in args.positions:
+        positions, ticks = make_positions(count, args.pools, args.seed)
+        expected = loop_out_of_range(positions, ticks)
+
+        index = RangeIndex()
+        start = time.perf_counter()
+        index.update(positions)
+        build_time = time.perf_counter() - start
+        assert index_out_of_range(index, positions, ticks) == expected, "index disagrees with the loop"
+
+        loop_time = best_time(lambda: loop_out_of_range(positions, ticks), args.repeat)
+        cycle_time = best_time(lambda: index_out_of_range(index, positions, ticks), args.repeat)
+        query_time = best_time(
+            lambda: [index.out_of_range(pool, ticks[pool]) for pool in index.pools], args.repeat
+        )
+
+        print(f"\n{count:,} positions in {args.pools} pools ({len(expected):,} out of range)")
+        print(f"  {'per-position loop':<34} {loop_time * 1e3:>10.2f}ms")
+        print(f"  {'index first build':<34} {build_time * 1e3:>10.2f}ms")
+        print(f"  {'index cycle (update + query)':<34} {cycle_time * 1e3:>10.2f}ms")
+        print(f"  {'index query only (searchsorted)':<34} {query_time * 1e3:>10.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -94,7 +94,7 @@ def create_position(pool_name: str, amount0: float, amount1: float,
     
     # Get current price for display
     try:
-        current_price = price_collector.fetch_current_price(pool_name)
+        current_price = price_collector.fetch_display_price(pool_name)
         logger.info(f"Current price: ${current_price:,.2f}")
     except Exception as e:
         logger.warning(f"Could not fetch current price for display: {e}")
@@ -0,0 +1,209 @@
+"""
+Load test the RPC endpoint pool against local fake endpoints.
+
+Starts several fake JSON-RPC servers on localhost, each with its own
+latency, requests-per-second limit (answered with HTTP 429 above it) and
+failure rate, then sends eth_blockNumber calls through an RPCPoolProvider
+from several threads. One endpoint can be taken down partway through to
+check failover. Prints throughput, client latency and the pool's
+per-endpoint statistics next to what each server actually saw.
+
+No RPC connection is needed.
+
+Usage:
+    python scripts/load_test_rpc_pool.py
+    python scripts/load_test_rpc_pool.py --threads 16 --duration 20 --outage 5
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.dex.rpc_pool import RPCEndpoint, RPCPoolProvider, TokenBucket
+
+# (name, latency seconds, server-side requests per second, failure rate)
+FAKE_ENDPOINTS = [
+    ('fast', 0.010, 40, 0.00),
+    ('slow', 0.080, 200, 0.00),
+    ('flaky', 0.020, 200, 0.20),
+]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Load test the RPC endpoint pool')
+
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=8,
+        help='Concurrent callers (default: 8)'
+    )
+
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Seconds to run (default: 10)'
+    )
+
+    parser.add_argument(
+        '--outage',
+        type=float,
+        default=None,
+        help='Take the fast endpoint down after this many seconds (default: never)'
+    )
+
+    parser.add_argument(
+        '--client-rps',
+        type=float,
+        default=None,
+        help='Client-side requests per second per endpoint '
+             '(default: each server\'s limit, so 429s should not happen)'
+    )
+
+    return parser.parse_args()
+
+
+class FakeRPCServer:
+    """Local JSON-RPC endpoint with latency, a rate limit and random failures."""
+
+    def __init__(self, name: str, latency: float, requests_per_second: float, failure_rate: float):
+        self.name = name
+        self.latency = latency
+        self.limit = TokenBucket(requests_per_second)
+        self.failure_rate = failure_rate
+        self.down = False
+        self.counts = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                status, payload = server.handle(body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/{name}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def handle(self, body):
+        """Answer one request: (HTTP status, JSON payload)."""
+        self._count('requests')
+        if self.down:
+            time.sleep(0.5)
+            self._count('failed')
+            return 503, {'error': 'service unavailable'}
+        if self.limit.wait_time() > 0:
+            self._count('rate_limited')
+            return 429, {'error': 'too many requests'}
+        self.limit.reserve()
+
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            self._count('failed')
+            return 502, {'error': 'bad gateway'}
+
+        self._count('ok')
+        return 200, {'jsonrpc': '2.0', 'id': body.get('id'), 'result': hex(int(time.time()))}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+
+def run_callers(provider: RPCPoolProvider, threads: int, duration: float):
+    """Call eth_blockNumber from several threads; returns (latencies, errors)."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def caller():
+        while time.monotonic() < stop_at:
+            start = time.monotonic()
+            try:
+                provider.make_request('eth_blockNumber', [])
+                elapsed = time.monotonic() - start
+                with lock:
+                    latencies.append(elapsed)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    workers = [threading.Thread(target=caller) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    return latencies, errors
+
+
+def main():
+    """Run the load test."""
+    args = parse_args()
+
+    servers = [FakeRPCServer(*spec) for spec in FAKE_ENDPOINTS]
+    endpoints = [
+        RPCEndpoint(server.url, requests_per_second=args.client_rps or server.limit.rate, name=server.name)
+        for server in servers
+    ]
+    provider = RPCPoolProvider(endpoints, timeout=5)
+
+    if args.outage is not None:
+        def outage():
+            servers[0].down = True
+            print(f"[{args.outage:.0f}s] {servers[0].name} endpoint down")
+        threading.Timer(args.outage, outage).start()
+
+    print(f"Load testing {len(servers)} endpoints with {args.threads} threads for {args.duration:.0f}s...")
+    latencies, errors = run_callers(provider, args.threads, args.duration)
+
+    latencies.sort()
+    print()
+    print(f"Calls:       {len(latencies)} ok, {len(errors)} failed")
+    print(f"Throughput:  {len(latencies) / args.duration:.1f} calls/s")
+    if latencies:
+        print(
+            f"Latency:     p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms"
+        )
+    if errors:
+        print(f"First error: {errors[0]}")
+
+    print()
+    print(f"{'endpoint':<10}{'requests':>10}{'failures':>10}{'429s':>8}{'ewma ms':>10}{'err rate':>10}"
+          f"{'  server ok/429/failed':>24}")
+    for server, stats in zip(servers, provider.pool.stats()):
+        counts = server.counts
+        latency = f"{stats['latency_ms']:.1f}" if stats['latency_ms'] is not None else '-'
+        print(
+            f"{stats['name']:<10}{stats['requests']:>10}{stats['failures']:>10}{stats['rate_limited']:>8}"
+            f"{latency:>10}{stats['error_rate']:>10.3f}"
+            f"{counts['ok']:>12}/{counts['rate_limited']}/{counts['failed']}"
+        )
+
+    for server in servers:
+        server.httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,7 @@ rebalances when the price moves out of range.
 
 MVP Specifications:
 - Position range: ±50 ticks (±0.5% from current price)
-- Check interval: Every 1 minute
+- Checks: On every block where the pool's tick moves (no reads on idle blocks)
 - Auto-rebalance: When price exits the position's tick range
 
 Usage:
@@ -15,7 +15,6 @@ Usage:
 """
 
 import argparse
-import time
 import sys
 import math
 from pathlib import Path
@@ -23,11 +22,20 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.dex.head_tracker import get_head_tracker
+from src.dex.pool_mirror import get_pool_mirror
 from src.dex.uniswap import get_uniswap
-from src.dex.abis import POOL_ABI, POSITION_MANAGER_ABI
+from src.dex.abis import POSITION_MANAGER_ABI
 from src.data.price_data import get_price_collector
 from src.utils.config import get_config
 from src.utils.logger import log as logger
+from scripts.swap_tokens import FEE_TIERS
+
+# Fee tier name (as swap_tokens takes it) for a pool fee
+FEE_TIER_NAMES = {fee: name for name, fee in FEE_TIERS.items()}
+
+# Slippage allowed below the simulated output of a rebalance swap
+SWAP_SLIPPAGE_PERCENT = 1.0
 
 
 class PositionMonitor:
@@ -40,7 +48,7 @@ class PositionMonitor:
         Args:
             pool_name: Pool identifier (e.g., "WETH-USDC")
             tick_range: Number of ticks for position range (default: 50 = ±0.5%)
-            check_interval: Seconds between range checks (default: 60)
+            check_interval: Seconds between status heartbeats while the pool is idle (default: 60)
             dry_run: If True, simulate operations without executing transactions
         """
         self.pool_name = pool_name
@@ -68,6 +76,22 @@ class PositionMonitor:
         self.fee = pool_config.get('fee_tier', 500)
         self.tick_spacing = 60 if self.fee == 3000 else (10 if self.fee == 500 else 200)
         
+        # Token decimals from pools.yaml, or read from the token contracts
+        self.decimals0, self.decimals1 = (
+            pool_config[key] if key in pool_config else self.uniswap.contracts.erc20(token).functions.decimals().call()
+            for key, token in (('decimals0', self.token0), ('decimals1', self.token1))
+        )
+        
+        # Range checks run when the pool's tick moves, not on a timer, and
+        # read the tick from the local pool mirror
+        self.pool_mirror = get_pool_mirror()
+        self.pool_mirror.add([self.pool_address])
+        self.head_tracker = get_head_tracker()
+        self.pool_changes = self.head_tracker.subscribe([self.pool_address])
+        
+        # A position's ticks never change, so they are read once per token ID
+        self.position_ticks = {}
+        
         # Create position manager contract object
         self.position_manager = self.uniswap.w3.eth.contract(
             address=self.uniswap.position_manager_address,
@@ -112,27 +136,16 @@ class PositionMonitor:
             return []
     
     def get_current_tick(self) -> int:
-        """Get current tick from the pool"""
-        pool_contract = self.uniswap.w3.eth.contract(
-            address=self.pool_address,
-            abi=POOL_ABI
-        )
-        slot0 = pool_contract.functions.slot0().call()
-        return slot0[1]
+        """Get current tick from the pool (mirrored locally)"""
+        return self.uniswap.get_pool_slot0(self.pool_address)['tick']
     
-    def create_position(self, amount0: float, amount1: float) -> int:
+    def get_centered_ticks(self) -> tuple:
         """
-        Create a new LP position centered around current price
+        Get a tick range of ±tick_range around the current tick
         
-        Args:
-            amount0: Amount of token0 to deposit
-            amount1: Amount of token1 to deposit
-            
         Returns:
-            Position NFT token ID
+            Tuple of (tick_lower, tick_upper) aligned to the tick spacing
         """
-        logger.info(f"Creating new position with {amount0} token0 and {amount1} token1")
-        
         # Get current tick from pool
         current_tick = self.get_current_tick()
         logger.info(f"Current tick: {current_tick}")
@@ -157,15 +170,47 @@ class PositionMonitor:
         
         # Get current price for display
         try:
-            current_price = self.price_collector.fetch_current_price(self.pool_name)
+            current_price = self.price_collector.fetch_display_price(self.pool_name)
             logger.info(f"Current price: ${current_price:,.2f}")
         except Exception as e:
             logger.warning(f"Could not fetch current price for display: {e}")
         
-        # Convert amounts to wei
-        amount0_wei = int(amount0 * 1e18)  # WETH has 18 decimals
-        amount1_wei = int(amount1 * 1e6)   # USDC has 6 decimals
+        return tick_lower, tick_upper
+    
+    def create_position(self, amount0: float, amount1: float) -> int:
+        """
+        Create a new LP position centered around current price
+        
+        Args:
+            amount0: Amount of token0 to deposit
+            amount1: Amount of token1 to deposit
+            
+        Returns:
+            Position NFT token ID
+        """
+        logger.info(f"Creating new position with {amount0} token0 and {amount1} token1")
+        
+        tick_lower, tick_upper = self.get_centered_ticks()
+        
+        # Convert amounts to raw units
+        amount0_wei = int(amount0 * 10 ** self.decimals0)
+        amount1_wei = int(amount1 * 10 ** self.decimals1)
+        
+        return self.mint_position(tick_lower, tick_upper, amount0_wei, amount1_wei)
+    
+    def mint_position(self, tick_lower: int, tick_upper: int, amount0_wei: int, amount1_wei: int) -> int:
+        """
+        Mint a position in the given range
         
+        Args:
+            tick_lower: Lower tick of the range
+            tick_upper: Upper tick of the range
+            amount0_wei: Desired token0 amount (raw units)
+            amount1_wei: Desired token1 amount (raw units)
+            
+        Returns:
+            Position NFT token ID
+        """
         # Create the position
         logger.info("Creating position...")
         result = self.uniswap.add_liquidity(
@@ -219,9 +264,10 @@ class PositionMonitor:
             Dict with status info: {in_range: bool, current_tick: int, tick_lower: int, tick_upper: int}
         """
         # Get position details
-        position = self.position_manager.functions.positions(token_id).call()
-        tick_lower = position[5]
-        tick_upper = position[6]
+        if token_id not in self.position_ticks:
+            position = self.uniswap.get_position(token_id)
+            self.position_ticks[token_id] = (position['tickLower'], position['tickUpper'])
+        tick_lower, tick_upper = self.position_ticks[token_id]
         
         # Get current tick
         current_tick = self.get_current_tick()
@@ -273,7 +319,7 @@ class PositionMonitor:
                 if result.get('dry_run'):
                     logger.info("Liquidity removal simulated (dry run)")
                     # Return mock amounts for dry run (half of what was originally deposited)
-                    return (int(0.00001 * 1e18), int(0.025 * 1e6))  # Mock collected amounts
+                    return (int(0.00001 * 10 ** self.decimals0), int(0.025 * 10 ** self.decimals1))  # Mock collected amounts
                 else:
                     logger.info(f"Liquidity removed: {result['tx_hash']}")
                     return (result.get('amount0', 0), result.get('amount1', 0))
@@ -284,79 +330,183 @@ class PositionMonitor:
             logger.error(f"Error removing liquidity: {e}")
             raise
     
-    def rebalance_position(self, old_token_id: int, amount0: float, amount1: float, status: dict) -> int:
+    def rebalance_position(self, old_token_id: int) -> int:
         """
-        Rebalance position: remove old position, sell half into out-of-range asset, and create new one
+        Rebalance position: swap to the new range's ratio, then close the old
+        position and mint the new one in a single transaction
+        
+        What closing will return is computed before closing (the position's
+        liquidity at the mirrored price plus fees owed), so the swap is sized
+        up front on the local pool mirror and paid from the wallet's balance;
+        the bundle then collects the old position and mints with the
+        post-swap amounts. If the wallet holds too little of the token being
+        sold, the position is closed first and the swap and mint follow as
+        separate transactions.
         
         Args:
             old_token_id: Token ID of position to close
-            amount0: Amount of token0 for new position
-            amount1: Amount of token1 for new position
-            status: Position status dict with in_range, current_tick, etc.
             
         Returns:
             New position token ID
         """
         logger.info("🔄 Starting rebalance...")
         
-        # Remove old position
-        collected_amounts = self.remove_position(old_token_id)
-        amount0_collected, amount1_collected = collected_amounts
+        tick_lower, tick_upper = self.get_centered_ticks()
         
-        logger.info(f"Collected: {amount0_collected} token0, {amount1_collected} token1")
+        held = self.uniswap.get_position_amounts(old_token_id, self.pool_address)
+        amount0, amount1 = held['amount0'], held['amount1']
+        logger.info(f"Closing will return ~{amount0} token0, {amount1} token1")
         
-        # Determine which asset is out of range and sell half of it
-        if status['current_tick'] < status['tick_lower']:
-            # Price is below range - we have too much token0 (WETH), sell half for token1 (USDC)
-            sell_amount = amount0_collected / 2
-            if sell_amount > 0:
-                logger.info(f"Price below range - selling {sell_amount} token0 for token1")
-                try:
-                    swap_result = self.uniswap.swap_tokens(
-                        token_in=self.pool_name.split('-')[0],  # token0 symbol
-                        token_out=self.pool_name.split('-')[1],  # token1 symbol
-                        amount_in=sell_amount / (10 ** 18),  # Convert from wei to ether
-                        fee_tier='medium',
-                        slippage=1.0,
-                        dry_run=self.dry_run
-                    )
-                    if swap_result['success']:
-                        logger.info("✅ Swap completed successfully")
-                    else:
-                        logger.error(f"❌ Swap failed: {swap_result.get('error', 'Unknown error')}")
-                except Exception as e:
-                    logger.error(f"Swap error: {e}")
-        elif status['current_tick'] > status['tick_upper']:
-            # Price is above range - we have too much token1 (USDC), sell half for token0 (WETH)
-            sell_amount = amount1_collected / 2
-            if sell_amount > 0:
-                logger.info(f"Price above range - selling {sell_amount} token1 for token0")
-                try:
-                    swap_result = self.uniswap.swap_tokens(
-                        token_in=self.pool_name.split('-')[1],  # token1 symbol
-                        token_out=self.pool_name.split('-')[0],  # token0 symbol
-                        amount_in=sell_amount / (10 ** 6),  # Convert from wei to USDC (6 decimals)
-                        fee_tier='medium',
-                        slippage=1.0,
-                        dry_run=self.dry_run
-                    )
-                    if swap_result['success']:
-                        logger.info("✅ Swap completed successfully")
-                    else:
-                        logger.error(f"❌ Swap failed: {swap_result.get('error', 'Unknown error')}")
-                except Exception as e:
-                    logger.error(f"Swap error: {e}")
+        plan = self.uniswap.plan_swap_to_ratio(self.pool_address, tick_lower, tick_upper, amount0, amount1)
+        if plan is not None and plan['amount_in'] > 0:
+            token_in = self.token0 if plan['zero_for_one'] else self.token1
+            balance = self.uniswap.contracts.erc20(token_in).functions.balanceOf(self.uniswap.web3_client.address).call()
+            if balance < plan['amount_in']:
+                logger.warning(
+                    f"Wallet holds {balance} of the {plan['amount_in']} the swap sells - "
+                    f"closing before swapping (separate transactions)"
+                )
+                return self.close_swap_and_mint(old_token_id, tick_lower, tick_upper)
+        
+        amount0, amount1 = self.swap_to_range_ratio(tick_lower, tick_upper, amount0, amount1, plan)
         
-        # Wait a bit for tokens to settle
-        time.sleep(2)
+        # decreaseLiquidity + collect + mint as one Position Manager multicall
+        result = self.uniswap.rebalance_position(
+            token_id=old_token_id,
+            tick_lower=tick_lower,
+            tick_upper=tick_upper,
+            token0_amount=amount0,
+            token1_amount=amount1,
+            token0_address=self.token0,
+            token1_address=self.token1,
+            fee=self.fee,
+            dry_run=self.dry_run
+        )
+        
+        if not result['success']:
+            raise Exception(f"Rebalance bundle failed: {result['tx_hash']}")
+        
+        if result.get('dry_run'):
+            logger.info("Rebalance bundle simulated (dry run)")
+            new_token_id = 999999  # Mock token ID for dry run
+        else:
+            new_token_id = result['token_id']
+            gas = result['gas']
+            logger.info(f"Transaction: https://basescan.org/tx/{result['tx_hash']}")
+            logger.info(f"Collected: {result['amount0']} token0, {result['amount1']} token1")
+            logger.info(
+                f"Gas: {gas['gas_used']:,} in {gas['transactions']} tx ({gas['approvals']} approvals); "
+                f"separate transactions: estimated >= {gas['multi_tx_gas_estimate']:,} in {gas['multi_tx_transactions']} tx"
+            )
+        
+        logger.info(f"✅ Rebalance complete! New position: {new_token_id}")
+        
+        return new_token_id
+    
+    def close_swap_and_mint(self, old_token_id: int, tick_lower: int, tick_upper: int) -> int:
+        """
+        Rebalance in separate transactions: close the old position, swap the
+        collected tokens to the new range's ratio, then mint with all of them
+        
+        Args:
+            old_token_id: Token ID of position to close
+            tick_lower: Lower tick of the new range
+            tick_upper: Upper tick of the new range
+            
+        Returns:
+            New position token ID
+        """
+        # decreaseLiquidity + collect as one Position Manager multicall
+        result = self.uniswap.close_position(old_token_id, dry_run=self.dry_run)
+        
+        if not result['success']:
+            raise Exception(f"Closing position failed: {result['tx_hash']}")
+        
+        if result.get('dry_run'):
+            logger.info("Position close simulated (dry run)")
+            # Mock collected amounts for dry run
+            amount0, amount1 = int(0.00001 * 10 ** self.decimals0), int(0.025 * 10 ** self.decimals1)
+        else:
+            amount0, amount1 = result['amount0'], result['amount1']
+            logger.info(f"Transaction: https://basescan.org/tx/{result['tx_hash']}")
+        
+        logger.info(f"Collected: {amount0} token0, {amount1} token1")
         
-        # Create new position with the amounts (modified or not)
-        new_token_id = self.create_position(amount0, amount1)
+        amount0, amount1 = self.swap_to_range_ratio(tick_lower, tick_upper, amount0, amount1)
+        
+        new_token_id = self.mint_position(tick_lower, tick_upper, amount0, amount1)
         
         logger.info(f"✅ Rebalance complete! New position: {new_token_id}")
         
         return new_token_id
     
+    def swap_to_range_ratio(self, tick_lower: int, tick_upper: int, amount0: int, amount1: int, plan: dict = None) -> tuple:
+        """
+        Swap so the balances match the token ratio of the new range
+        
+        The swap size is solved on the local pool mirror (no Quoter call), and
+        the expected output less SWAP_SLIPPAGE_PERCENT becomes the swap's
+        amountOutMinimum. If the swap fails the amounts are minted as they are.
+        
+        Args:
+            tick_lower: Lower tick of the new range
+            tick_upper: Upper tick of the new range
+            amount0: Token0 available (raw units)
+            amount1: Token1 available (raw units)
+            plan: Swap already planned for these amounts (default: plan it here)
+            
+        Returns:
+            Tuple of (amount0, amount1) held for the mint after the swap
+        """
+        if plan is None:
+            plan = self.uniswap.plan_swap_to_ratio(self.pool_address, tick_lower, tick_upper, amount0, amount1)
+        if plan is None:
+            logger.warning(f"Pool {self.pool_address} is not mirrored - minting without a swap")
+            return amount0, amount1
+        if plan['amount_in'] == 0:
+            logger.info("Tokens already match the range ratio - no swap needed")
+            return amount0, amount1
+        
+        zero_for_one = plan['zero_for_one']
+        symbol0, symbol1 = self.pool_name.split('-')[:2]
+        token_in, token_out = (symbol0, symbol1) if zero_for_one else (symbol1, symbol0)
+        decimals_in = self.decimals0 if zero_for_one else self.decimals1
+        amount_out_minimum = int(plan['amount_out'] * (1 - SWAP_SLIPPAGE_PERCENT / 100))
+        
+        logger.info(
+            f"Swapping {plan['amount_in']} {token_in} for ~{plan['amount_out']} {token_out} "
+            f"(price impact {plan['price_impact']:.4%}, minimum {amount_out_minimum}); "
+            f"mint takes {plan['mint_amount0']} token0 + {plan['mint_amount1']} token1 "
+            f"of {plan['amount0']} + {plan['amount1']}"
+        )
+        
+        try:
+            swap_result = self.uniswap.swap_tokens(
+                token_in=token_in,
+                token_out=token_out,
+                amount_in=plan['amount_in'] / (10 ** decimals_in),
+                amount_in_raw=plan['amount_in'],
+                fee_tier=FEE_TIER_NAMES.get(self.fee, 'medium'),
+                slippage=SWAP_SLIPPAGE_PERCENT,
+                dry_run=self.dry_run,
+                amount_out_minimum=amount_out_minimum
+            )
+        except Exception as e:
+            logger.error(f"Swap error: {e}")
+            return amount0, amount1
+        
+        if self.dry_run:
+            return plan['amount0'], plan['amount1']
+        if not swap_result['success']:
+            logger.error(f"❌ Swap failed: {swap_result.get('error', 'Unknown error')}")
+            return amount0, amount1
+        
+        logger.info("✅ Swap completed successfully")
+        swap = swap_result['result']
+        if zero_for_one:
+            return amount0 - swap['amount_in_raw'], amount1 + swap['amount_out_raw']
+        return amount0 + swap['amount_out_raw'], amount1 - swap['amount_in_raw']
+    
     def monitor_loop(self, initial_amount0: float, initial_amount1: float, 
                     initial_token_id: int = None):
         """
@@ -386,7 +536,7 @@ class PositionMonitor:
             self.current_position_id = initial_token_id
         
         logger.info("🚀 Starting monitoring loop...")
-        logger.info(f"Will check position every {self.check_interval} seconds")
+        logger.info("Will check position whenever the pool price moves")
         
         rebalance_count = 0
         check_count = 0
@@ -400,7 +550,7 @@ class PositionMonitor:
                 
                 # Get current price
                 try:
-                    current_price = self.price_collector.fetch_current_price(self.pool_name)
+                    current_price = self.price_collector.fetch_display_price(self.pool_name)
                 except Exception:
                     current_price = self.uniswap.get_pool_price(self.pool_address)
                 
@@ -440,12 +590,7 @@ class PositionMonitor:
                     
                     # Rebalance the position
                     logger.info("=" * 80)
-                    self.current_position_id = self.rebalance_position(
-                        self.current_position_id,
-                        initial_amount0,
-                        initial_amount1,
-                        status
-                    )
+                    self.current_position_id = self.rebalance_position(self.current_position_id)
                     rebalance_count += 1
                     logger.info("=" * 80)
                     logger.info(f"✅ REBALANCE COMPLETE!")
@@ -453,12 +598,16 @@ class PositionMonitor:
                     logger.info(f"🆕 New Position ID: {self.current_position_id}")
                 
                 logger.info("=" * 80)
-                logger.info(f"⏳ Next check in {self.check_interval} seconds...")
+                logger.info("⏳ Waiting for the pool price to move...")
                 logger.info("=" * 80)
                 logger.info("")  # Blank line for readability
                 
-                # Wait before next check
-                time.sleep(self.check_interval)
+                # Wait for the tick to move; idle blocks cost no reads
+                changes = self.pool_changes.get(timeout=self.check_interval)
+                while not changes:
+                    logger.info(f"💤 Pool unchanged for {self.check_interval}s (block {self.head_tracker.block_number})")
+                    changes = self.pool_changes.get(timeout=self.check_interval)
+                logger.info(f"🔔 Pool tick {changes[-1]['previous_tick']} → {changes[-1]['tick']} at block {changes[-1]['block_number']}")
                 
         except KeyboardInterrupt:
             logger.info("\n⛔ Monitoring stopped by user")
@@ -480,7 +629,7 @@ def main():
     parser.add_argument('--tick-range', type=int, default=50,
                        help='Tick range for position (default: 50 = ±0.5%%)')
     parser.add_argument('--interval', type=int, default=60,
-                       help='Check interval in seconds (default: 60)')
+                       help='Seconds between status heartbeats while the pool is idle (default: 60)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Dry run mode - simulate swaps without executing transactions')
     parser.add_argument('--position-id', type=int, default=None,
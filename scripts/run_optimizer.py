@@ -2,13 +2,14 @@
 Main execution script for the optimizer.
 """
 import sys
-import time
 import argparse
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.dex.head_tracker import get_head_tracker
+from src.dex.pool_mirror import get_pool_mirror
 from src.utils.config import get_config
 from src.utils.logger import log
 from src.strategies.concentrated_follower import ConcentratedFollowerStrategy
@@ -45,7 +46,8 @@ def parse_args():
         '--interval',
         type=int,
         default=300,
-        help='Check interval in seconds (default: 300)'
+        help='Seconds between heartbeats while the pool is idle; the strategy '
+             'runs whenever the pool price moves (default: 300)'
     )
     
     parser.add_argument(
@@ -131,16 +133,25 @@ def main():
         success = run_iteration(strategy, args.pool, args.capital)
         sys.exit(0 if success else 1)
     
-    # Run loop
-    log.info(f"Running in loop mode (interval: {args.interval}s)")
+    # Run loop: once now, then on every block where the pool's tick moved
+    log.info("Running in loop mode (on pool price changes)")
     log.info("Press Ctrl+C to stop")
     
+    # Pool reads come from the local mirror; the loop wakes on its changes
+    get_pool_mirror().add([pool_config['address']])
+    head_tracker = get_head_tracker()
+    pool_changes = head_tracker.subscribe([pool_config['address']])
+    
     try:
         while True:
             run_iteration(strategy, args.pool, args.capital)
             
-            log.info(f"Sleeping for {args.interval} seconds...")
-            time.sleep(args.interval)
+            log.info("Waiting for the pool price to move...")
+            changes = pool_changes.get(timeout=args.interval)
+            while not changes:
+                log.info(f"Pool unchanged for {args.interval}s (block {head_tracker.block_number})")
+                changes = pool_changes.get(timeout=args.interval)
+            log.info(f"Pool tick moved to {changes[-1]['tick']} at block {changes[-1]['block_number']}")
     
     except KeyboardInterrupt:
         log.info("Interrupted by user")
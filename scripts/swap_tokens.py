@@ -95,7 +95,9 @@ def swap_tokens(
     amount_in: float,
     fee_tier: str = 'medium',
     slippage: float = 1.0,
-    dry_run: bool = False
+    dry_run: bool = False,
+    amount_out_minimum: int = 0,
+    amount_in_raw: int = None
 ):
     """
     Swap one token for another on Uniswap V3.
@@ -107,6 +109,10 @@ def swap_tokens(
         fee_tier: Fee tier to use ('lowest', 'low', 'medium', 'high')
         slippage: Maximum slippage tolerance in percent (default: 1%)
         dry_run: If True, only simulate, don't execute
+        amount_out_minimum: Minimum output in raw token units; the swap
+            reverts below it (0 accepts any amount)
+        amount_in_raw: Exact input in raw token units, used instead of
+            amount_in (no float round trip)
     """
     logger.info("=" * 60)
     logger.info(f"SWAP: {token_in} → {token_out}")
@@ -152,7 +158,11 @@ def swap_tokens(
     balance_in, decimals_in, symbol_in = get_token_balance(w3, token_in_address, wallet, token_in)
     balance_out, decimals_out, symbol_out = get_token_balance(w3, token_out_address, wallet, token_out)
     
-    amount_in_wei = int(amount_in * (10 ** decimals_in))
+    if amount_in_raw is not None:
+        amount_in_wei = amount_in_raw
+        amount_in = amount_in_raw / (10 ** decimals_in)
+    else:
+        amount_in_wei = int(amount_in * (10 ** decimals_in))
     
     logger.info(f"\n💰 Current Balances:")
     logger.info(f"  {symbol_in}: {balance_in / (10 ** decimals_in):.6f}")
@@ -172,9 +182,12 @@ def swap_tokens(
     # Build swap parameters
     deadline = int(time.time()) + 1200  # 20 minutes
     
-    # Calculate minimum output with slippage (simplified - in production use price oracle)
-    # For now, accept any amount but log it
-    amount_out_minimum = 0  # We'll improve this with price quotes
+    # Callers that simulated the swap pass the minimum output; without one
+    # any amount is accepted
+    if amount_out_minimum:
+        logger.info(f"  Minimum output: {amount_out_minimum / (10 ** decimals_out):.6f} {symbol_out}")
+    else:
+        logger.warning("  No minimum output set - accepting any amount")
     
     swap_params = {
         'tokenIn': Web3.to_checksum_address(token_in_address),
@@ -256,6 +269,8 @@ def swap_tokens(
                 'tx_hash': tx_hash.hex(),
                 'amount_in': amount_in,
                 'amount_out': amount_out,
+                'amount_in_raw': amount_in_wei,
+                'amount_out_raw': new_balance_out - balance_out,
                 'token_in': symbol_in,
                 'token_out': symbol_out
             }
@@ -52,7 +52,7 @@ def test_create_lp_position(capital_usd: float = 0.40):
     # Get current price
     logger.info(f"\n💰 Fetching current price...")
     try:
-        current_price = price_collector.fetch_current_price(pool_name)
+        current_price = price_collector.fetch_display_price(pool_name)
         logger.info(f"  Current Price: ${current_price:,.2f}")
     except Exception as e:
         logger.error(f"Failed to fetch price: {e}")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Exercise monitor shard leases with several worker processes on SQLite.
+
+Starts worker processes that heartbeat ShardLeases against a scratch SQLite
+database, kills one without letting it release its leases, then starts a
+replacement. Each worker reports the windows in which it may act on a shard
+(from a successful confirm() until that lease would expire). The test
+checks that:
+
+  - every shard ends up held once the workers settle
+  - a killed worker's shards are taken over within one lease period (plus
+    a heartbeat)
+  - no two workers' windows for the same shard ever overlap
+
+No RPC connection or backend server is needed.
+
+Usage:
+    python scripts/test_monitor_leases.py
+    python scripts/test_monitor_leases.py --workers 4 --shards 16 --lease 2
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+import tempfile
+import multiprocessing
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Test monitor shard leases with several processes')
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=3,
+        help='Worker processes (default: 3)'
+    )
+
+    parser.add_argument(
+        '--shards',
+        type=int,
+        default=12,
+        help='Shards (default: 12)'
+    )
+
+    parser.add_argument(
+        '--lease',
+        type=float,
+        default=3.0,
+        help='Lease seconds (default: 3)'
+    )
+
+    return parser.parse_args()
+
+
+def run_worker(worker_id: str, shards: int, lease_seconds: float, reports):
+    """Heartbeat leases forever, reporting held shards and confirmed windows."""
+    from backend.monitor.leases import ShardLeases
+
+    leases = ShardLeases(shards, lease_seconds, worker_id)
+    while True:
+        try:
+            leases.heartbeat()
+            start = time.time()
+            held = leases.confirm(leases.owned)
+            reports.put((worker_id, start, start + lease_seconds, sorted(held)))
+        except Exception as e:
+            # SQLite lock contention; retried at the next heartbeat
+            reports.put((worker_id, time.time(), None, str(e)))
+        time.sleep(leases.heartbeat_seconds)
+
+
+def drain(reports, windows, held_by, errors):
+    """Collect worker reports."""
+    while not reports.empty():
+        worker_id, start, end, held = reports.get()
+        if end is None:
+            errors.append(f"{worker_id}: {held}")
+            continue
+        held_by[worker_id] = set(held)
+        for shard in held:
+            windows[shard].append((start, end, worker_id))
+
+
+def wait_settled(reports, windows, held_by, errors, workers, shards, timeout):
+    """Wait until the given workers hold every shard between them; returns seconds waited."""
+    start = time.time()
+    while time.time() - start < timeout:
+        time.sleep(0.1)
+        drain(reports, windows, held_by, errors)
+        held = set().union(*(held_by.get(worker_id, set()) for worker_id in workers))
+        if len(held) == shards:
+            return time.time() - start
+    return None
+
+
+def overlaps(windows):
+    """Pairs of windows of different workers on the same shard that overlap."""
+    found = []
+    for shard, shard_windows in windows.items():
+        # Windows of one worker may overlap each other (renewals); only
+        # handovers between workers matter
+        shard_windows.sort()
+        latest_end = {}
+        for start, end, worker_id in shard_windows:
+            for other, other_end in latest_end.items():
+                if other != worker_id and other_end > start:
+                    found.append((shard, other, worker_id, other_end - start))
+            latest_end[worker_id] = max(latest_end.get(worker_id, 0), end)
+    return found
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    db_path = Path(tempfile.mkdtemp()) / "leases.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    print("=" * 80)
+    print(f"MONITOR SHARD LEASES: {args.workers} workers, {args.shards} shards, {args.lease:g}s leases")
+    print("=" * 80)
+    print(f"Database: {db_path}")
+
+    context = multiprocessing.get_context("spawn")
+    reports = context.Queue()
+    processes = {}
+    windows = defaultdict(list)
+    held_by = {}
+    errors = []
+    takeover_limit = args.lease + args.lease / 3 + 1.0
+
+    def start(worker_id):
+        process = context.Process(target=run_worker, args=(worker_id, args.shards, args.lease, reports), daemon=True)
+        process.start()
+        processes[worker_id] = process
+
+    ok = True
+    try:
+        for i in range(args.workers):
+            start(f"worker-{i}")
+        # Shards are spread after a full lease period, once released leases expire
+        settled = wait_settled(reports, windows, held_by, errors, processes, args.shards, 3 * takeover_limit + 10)
+        print(f"\nAll shards held after {settled:.1f}s" if settled is not None else "\nShards never all held")
+        ok &= settled is not None
+        time.sleep(2 * takeover_limit)
+        drain(reports, windows, held_by, errors)
+        for worker_id in sorted(processes):
+            print(f"  {worker_id}: {sorted(held_by.get(worker_id, []))}")
+
+        victim = "worker-0"
+        lost = held_by.get(victim, set())
+        print(f"\nKilling {victim} (held {sorted(lost)})")
+        os.kill(processes[victim].pid, signal.SIGKILL)
+        processes.pop(victim).join()
+        held_by.pop(victim, None)
+
+        takeover = wait_settled(reports, windows, held_by, errors, processes, args.shards, 3 * takeover_limit)
+        if takeover is not None:
+            print(f"  Shards taken over after {takeover:.1f}s (limit {takeover_limit:.1f}s)")
+        else:
+            print("  Shards never taken over")
+        ok &= takeover is not None and takeover <= takeover_limit
+
+        print("\nStarting worker-new")
+        start("worker-new")
+        time.sleep(3 * takeover_limit)
+        drain(reports, windows, held_by, errors)
+        for worker_id in sorted(processes):
+            print(f"  {worker_id}: {sorted(held_by.get(worker_id, []))}")
+        ok &= len(held_by.get("worker-new", ())) > 0
+    finally:
+        for process in processes.values():
+            process.terminate()
+
+    found = overlaps(windows)
+    print(f"\nConfirmed windows: {sum(map(len, windows.values()))}, overlapping between workers: {len(found)}")
+    for shard, first, second, seconds in found[:10]:
+        print(f"  shard {shard}: {first} and {second} overlap by {seconds:.2f}s")
+    if errors:
+        print(f"Transient errors: {len(errors)} (first: {errors[0]})")
+    ok &= not found
+
+    print("\nPASS" if ok else "\nFAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
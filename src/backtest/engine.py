@@ -0,0 +1,483 @@
+"""
+Event-driven backtesting engine for LP strategies.
+
+A historical price series is replayed through the same range selection
+(LiquidityOptimizer.calculate_optimal_range) and rebalance triggers
+(LiquidityOptimizer.should_rebalance) the live strategies use. Instead of
+stepping through every sample in Python, the engine jumps from one rebalance
+to the next: the trigger search and all per-step accounting (fees while in
+range, position value, impermanent loss) are NumPy operations over the
+samples between two rebalances, so Python only runs once per rebalance.
+"""
+import csv
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import log
+from ..utils.config import get_config
+from ..utils import vector_math
+from ..optimizer.liquidity_optimizer import LiquidityOptimizer
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_YEAR = 365 * SECONDS_PER_DAY
+
+# Strategy parameters read from config that a backtest can override
+STRATEGY_PARAMS = (
+    'strategy.rebalance_threshold',
+    'strategy.min_tick_range',
+    'strategy.max_tick_range',
+    'strategy.max_gas_cost_ratio',
+)
+
+# Layout used by MultiPositionStrategy.analyze() for its default 3 positions
+MULTI_POSITION_CONCENTRATIONS = [0.8, 0.5, 0.3]
+MULTI_POSITION_ALLOCATIONS = [0.4, 0.3, 0.3]
+
+# Initial scan window (in samples) when searching for the next rebalance
+_SCAN_WINDOW = 256
+
+
+def parse_interval(interval: str) -> int:
+    """
+    Convert an interval string to seconds.
+
+    Args:
+        interval: Interval (e.g., 1m, 5m, 1h, 4h, 1d)
+
+    Returns:
+        Interval in seconds
+    """
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': SECONDS_PER_DAY}
+    try:
+        return int(interval[:-1]) * units[interval[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid interval: {interval}")
+
+
+def load_price_history(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a price history CSV.
+
+    The file needs a header row and two columns: timestamp (unix seconds,
+    unix milliseconds or ISO 8601) and price (token1/token0).
+
+    Args:
+        path: CSV file path
+
+    Returns:
+        (timestamps in seconds, prices) sorted by time
+    """
+    try:
+        data = np.loadtxt(path, delimiter=',', skiprows=1, usecols=(0, 1), ndmin=2)
+        timestamps, prices = data[:, 0], data[:, 1]
+    except ValueError:
+        # Non-numeric timestamps
+        timestamps, prices = [], []
+        with open(path, 'r') as f:
+            reader = csv.reader(f)
+            next(reader)
+            for row in reader:
+                timestamps.append(datetime.fromisoformat(row[0].replace('Z', '+00:00')).timestamp())
+                prices.append(float(row[1]))
+        timestamps, prices = np.array(timestamps), np.array(prices)
+
+    if len(timestamps) and timestamps.max() > 1e11:
+        timestamps = timestamps / 1000.0  # milliseconds
+
+    order = np.argsort(timestamps, kind='stable')
+    return timestamps[order], prices[order]
+
+
+def generate_price_history(
+    days: int,
+    interval_seconds: int,
+    start_price: float = 2500.0,
+    daily_volatility: float = 0.04,
+    seed: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate a synthetic geometric Brownian motion price history.
+
+    Args:
+        days: Days of history
+        interval_seconds: Seconds between samples
+        start_price: First price
+        daily_volatility: Daily standard deviation of log returns
+        seed: Random seed
+
+    Returns:
+        (timestamps in seconds, prices)
+    """
+    rng = np.random.default_rng(seed)
+    n = int(days * SECONDS_PER_DAY // interval_seconds) + 1
+    step_volatility = daily_volatility * np.sqrt(interval_seconds / SECONDS_PER_DAY)
+
+    log_returns = rng.normal(-0.5 * step_volatility ** 2, step_volatility, n - 1)
+    prices = start_price * np.exp(np.concatenate(([0.0], np.cumsum(log_returns))))
+    timestamps = time.time() - (n - 1 - np.arange(n)) * interval_seconds
+
+    return timestamps, prices
+
+
+def rolling_volatility(
+    timestamps: np.ndarray,
+    prices: np.ndarray,
+    window_hours: float
+) -> np.ndarray:
+    """
+    Daily volatility of log returns over a trailing time window, at every sample.
+
+    Uses cumulative sums so the whole series costs O(n).
+
+    Args:
+        timestamps: Sample timestamps (seconds)
+        prices: Prices
+        window_hours: Trailing window in hours
+
+    Returns:
+        Daily volatility (std of log returns scaled to one day) per sample
+    """
+    n = len(prices)
+    returns = np.diff(np.log(prices), prepend=np.log(prices[0]))
+    s1 = np.concatenate(([0.0], np.cumsum(returns)))
+    s2 = np.concatenate(([0.0], np.cumsum(returns * returns)))
+
+    # Returns in the window ending at i are indices [start + 1, i]
+    start = np.searchsorted(timestamps, timestamps - window_hours * 3600, side='left')
+    count = np.arange(n) - start
+    sums = s1[np.arange(n) + 1] - s1[start + 1]
+    sums_sq = s2[np.arange(n) + 1] - s2[start + 1]
+
+    volatility = np.zeros(n)
+    valid = count >= 2
+    mean = sums[valid] / count[valid]
+    variance = np.maximum(sums_sq[valid] - count[valid] * mean * mean, 0.0) / (count[valid] - 1)
+    elapsed = timestamps[valid] - timestamps[start[valid]]
+    samples_per_day = SECONDS_PER_DAY * count[valid] / np.maximum(elapsed, 1e-9)
+    volatility[valid] = np.sqrt(variance * samples_per_day)
+
+    return volatility
+
+
+class _ReplayPriceCollector:
+    """Price collector stand-in that serves the volatility at the replay cursor."""
+
+    def __init__(self):
+        self.volatility = 0.0
+
+    def calculate_volatility(self, pool_name: str, window_hours: int = 24) -> float:
+        return self.volatility
+
+
+class _ConfigOverlay:
+    """Config wrapper that lets a backtest override individual keys."""
+
+    def __init__(self, config, overrides: Optional[Dict[str, Any]] = None):
+        self._config = config
+        self.overrides = dict(overrides or {})
+
+    def get(self, key: str, default=None) -> Any:
+        if key in self.overrides:
+            return self.overrides[key]
+        return self._config.get(key, default)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._config, name)
+
+
+class _ReplayOptimizer(LiquidityOptimizer):
+    """LiquidityOptimizer bound to replay config and price data instead of live ones."""
+
+    def __init__(self, config, price_collector):
+        self.config = config
+        self.price_collector = price_collector
+
+
+class BacktestEngine:
+    """Replay a price history through the LP strategies."""
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        pool_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        base_fee_apr: float = 0.08,
+        config=None
+    ):
+        """
+        Initialize engine.
+
+        Args:
+            timestamps: Sample timestamps in seconds (ascending)
+            prices: Prices (token1/token0) per sample
+            pool_name: Pool name from pools.yaml (for fee tier / tick spacing)
+            params: Overrides for STRATEGY_PARAMS (dot-notation keys)
+            base_fee_apr: Fee APR earned by a full-range position while in range
+            config: Config to read defaults from (default: global config)
+        """
+        if len(timestamps) != len(prices) or len(prices) < 2:
+            raise ValueError("Need at least two samples with matching timestamps and prices")
+
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.pool_name = pool_name
+        self.base_fee_apr = base_fee_apr
+
+        self.config = _ConfigOverlay(config or get_config(), params)
+        self.price_collector = _ReplayPriceCollector()
+        self.optimizer = _ReplayOptimizer(self.config, self.price_collector)
+
+        pool_config = self.config.get_pool_by_name(pool_name)
+        if not pool_config:
+            raise ValueError(f"Pool {pool_name} not found in config")
+        self.tick_spacing = self.optimizer._get_tick_spacing(pool_config['fee_tier'])
+
+        # Per-sample series shared by every run
+        self.ticks = vector_math.price_to_tick(self.prices)
+        self.sqrt_prices = np.sqrt(self.prices)
+        self.dt = np.diff(self.timestamps, append=self.timestamps[-1])
+        window_hours = self.config.get('data.volatility_window_hours', 24)
+        self.volatility = rolling_volatility(self.timestamps, self.prices, window_hours)
+
+    def set_params(self, params: Dict[str, Any]):
+        """
+        Replace the strategy parameter overrides.
+
+        Args:
+            params: Overrides for STRATEGY_PARAMS (dot-notation keys)
+        """
+        self.config.overrides = dict(params)
+
+    def run(self, strategy_type: str, capital: float) -> Dict[str, Any]:
+        """
+        Run a backtest.
+
+        Args:
+            strategy_type: 'concentrated_follower' or 'multi_position'
+            capital: Starting capital in token1 (USD for USD-quoted pools)
+
+        Returns:
+            Performance results
+        """
+        started = time.perf_counter()
+        gas_cost = self.optimizer._estimate_rebalance_cost_usd()
+
+        if strategy_type == 'concentrated_follower':
+            layers = [(capital, self._optimal_range_fn(strategy_type))]
+        elif strategy_type == 'multi_position':
+            layers = [
+                (capital * allocation, self._multi_position_range_fn(concentration))
+                for concentration, allocation in zip(
+                    MULTI_POSITION_CONCENTRATIONS, MULTI_POSITION_ALLOCATIONS
+                )
+            ]
+        else:
+            raise ValueError(f"Unknown strategy: {strategy_type}")
+
+        # calculate_optimal_range logs every call; keep replays quiet
+        log.disable(LiquidityOptimizer.__module__)
+        try:
+            replays = [self._replay(layer_capital, range_fn, gas_cost) for layer_capital, range_fn in layers]
+        finally:
+            log.enable(LiquidityOptimizer.__module__)
+
+        results = self._summarize(replays, capital)
+        results['elapsed_seconds'] = time.perf_counter() - started
+        return results
+
+    def _optimal_range_fn(self, strategy_type: str) -> Callable[[int, float], Tuple[int, int]]:
+        """Range selection through LiquidityOptimizer.calculate_optimal_range."""
+        def range_fn(index: int, capital: float) -> Tuple[int, int]:
+            self.price_collector.volatility = float(self.volatility[index])
+            lower_tick, upper_tick, _ = self.optimizer.calculate_optimal_range(
+                pool_name=self.pool_name,
+                current_price=float(self.prices[index]),
+                capital_usd=capital,
+                strategy_type=strategy_type
+            )
+            return lower_tick, upper_tick
+        return range_fn
+
+    def _multi_position_range_fn(self, concentration: float) -> Callable[[int, float], Tuple[int, int]]:
+        """Range selection for one MultiPositionStrategy layer."""
+        def range_fn(index: int, capital: float) -> Tuple[int, int]:
+            price_range = min(float(self.volatility[index]) * (2.0 - concentration), 0.99)
+            lower_tick, upper_tick = vector_math.get_tick_range(
+                self.prices[index], price_range, self.tick_spacing
+            )
+            return int(lower_tick), int(upper_tick)
+        return range_fn
+
+    def _next_rebalance(
+        self,
+        start: int,
+        tick_lower: int,
+        tick_upper: int
+    ) -> Optional[int]:
+        """
+        Find the first sample after start where should_rebalance would fire.
+
+        Out of range (tick <= lower or tick >= upper) fires, and so does
+        deviation from the range center beyond rebalance_threshold. As in
+        the live rule, min_rebalance_interval_hours doesn't hold either back.
+
+        Returns:
+            Sample index, or None if the position survives to the end
+        """
+        ticks = self.ticks
+        n = len(ticks)
+
+        center = (tick_lower + tick_upper) / 2
+        max_deviation = self.config.get('strategy.rebalance_threshold', 0.05) * (tick_upper - tick_lower)
+
+        # Scan in doubling windows so short-lived positions don't touch the whole series
+        lo = start + 1
+        window = _SCAN_WINDOW
+        while lo < n:
+            hi = min(n, lo + window)
+            segment = ticks[lo:hi]
+
+            trigger = (segment <= tick_lower) | (segment >= tick_upper) | (np.abs(segment - center) > max_deviation)
+
+            if trigger.any():
+                return lo + int(trigger.argmax())
+
+            lo = hi
+            window *= 2
+
+        return None
+
+    def _replay(
+        self,
+        capital: float,
+        range_fn: Callable[[int, float], Tuple[int, int]],
+        gas_cost: float
+    ) -> Dict[str, Any]:
+        """Replay one position (re-opened at every rebalance) over the history."""
+        n = len(self.prices)
+
+        equity = np.empty(n)
+        in_range_time = 0.0
+        fees_total = gas_total = il_total = 0.0
+        durations: List[float] = []
+
+        value = capital
+        index = 0
+        while True:
+            tick_lower, tick_upper = range_fn(index, value)
+            if tick_upper <= tick_lower:
+                tick_upper = tick_lower + self.tick_spacing
+
+            sqrt_lower = np.sqrt(vector_math.tick_to_price(tick_lower))
+            sqrt_upper = np.sqrt(vector_math.tick_to_price(tick_upper))
+
+            # Liquidity that puts the whole position value to work at the entry price
+            amount0_per_l, amount1_per_l = vector_math.calculate_amounts_from_liquidity(
+                1.0, self.prices[index], sqrt_lower ** 2, sqrt_upper ** 2
+            )
+            value_per_l = amount0_per_l * self.prices[index] + amount1_per_l
+            liquidity = value / value_per_l
+            hodl0, hodl1 = liquidity * amount0_per_l, liquidity * amount1_per_l
+
+            end = self._next_rebalance(index, tick_lower, tick_upper)
+            stop = n - 1 if end is None else end
+
+            # Vectorized accounting over [index, stop]
+            prices = self.prices[index:stop + 1]
+            amount0, amount1 = vector_math.calculate_amounts_from_liquidity(
+                liquidity, prices, sqrt_lower ** 2, sqrt_upper ** 2
+            )
+            position_value = amount0 * prices + amount1
+
+            # Fees accrue over [t_k, t_k+1) while the tick is active. A
+            # full-range position worth 2 * L * sqrt(p) earns base_fee_apr, so
+            # per unit of liquidity the fee rate is 2 * sqrt(p) * apr.
+            ticks = self.ticks[index:stop]
+            active = (ticks >= tick_lower) & (ticks < tick_upper)
+            dt = self.dt[index:stop]
+            step_fees = np.where(
+                active,
+                2.0 * liquidity * self.sqrt_prices[index:stop] * self.base_fee_apr * dt / SECONDS_PER_YEAR,
+                0.0
+            )
+            fees = np.concatenate(([0.0], np.cumsum(step_fees)))
+
+            # Position value already carries earlier fees and gas via `value`
+            equity[index:stop + 1] = position_value + fees
+            in_range_time += float(dt[active].sum())
+
+            fees_segment = float(fees[-1])
+            hodl_value = float(hodl0 * prices[-1] + hodl1)
+            il_total += hodl_value - float(position_value[-1])
+            fees_total += fees_segment
+            durations.append(float(self.timestamps[stop] - self.timestamps[index]))
+
+            if end is None:
+                value = float(position_value[-1]) + fees_segment
+                break
+
+            # Rebalance: withdraw, collect fees, pay gas, re-open at the new range
+            gas_total += gas_cost
+            value = float(position_value[-1]) + fees_segment - gas_cost
+            if value <= 0:
+                equity[stop + 1:] = 0.0
+                value = 0.0
+                break
+            index = end
+
+        return {
+            'final_value': value,
+            'fees_earned': fees_total,
+            'gas_costs': gas_total,
+            'impermanent_loss': il_total,
+            'num_rebalances': len(durations) - 1,
+            'durations': durations,
+            'in_range_time': in_range_time,
+            'equity': equity,
+        }
+
+    def _summarize(self, replays: List[Dict[str, Any]], capital: float) -> Dict[str, Any]:
+        """Combine per-position replays into strategy-level results."""
+        final_value = sum(r['final_value'] for r in replays)
+        fees = sum(r['fees_earned'] for r in replays)
+        gas = sum(r['gas_costs'] for r in replays)
+        il = sum(r['impermanent_loss'] for r in replays)
+        durations = [d for r in replays for d in r['durations']]
+        equity = np.sum([r['equity'] for r in replays], axis=0)
+
+        total_time = max(float(self.timestamps[-1] - self.timestamps[0]), 1e-9)
+        in_range = sum(r['in_range_time'] for r in replays) / (total_time * len(replays))
+
+        # 50/50 hold of the starting capital, for reference
+        hodl_value = capital / 2 * float(self.prices[-1] / self.prices[0]) + capital / 2
+
+        # Sharpe ratio of daily equity returns
+        daily = np.searchsorted(self.timestamps, np.arange(self.timestamps[0], self.timestamps[-1], SECONDS_PER_DAY))
+        daily_equity = np.append(equity[daily], equity[-1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily_returns = np.diff(daily_equity) / daily_equity[:-1]
+        daily_returns = daily_returns[np.isfinite(daily_returns)]
+        std = daily_returns.std() if len(daily_returns) > 1 else 0.0
+        sharpe = float(daily_returns.mean() / std * np.sqrt(365)) if std > 0 else 0.0
+
+        net_profit = fees - gas - il
+
+        return {
+            'total_return': (final_value - capital) / capital * 100,
+            'hodl_return': (hodl_value - capital) / capital * 100,
+            'fees_earned': fees,
+            'gas_costs': gas,
+            'impermanent_loss': il,
+            'net_profit': net_profit,
+            'roi': net_profit / capital * 100,
+            'final_value': final_value,
+            'num_rebalances': sum(r['num_rebalances'] for r in replays),
+            'avg_position_duration': float(np.mean(durations)) / SECONDS_PER_DAY if durations else 0.0,
+            'time_in_range': in_range * 100,
+            'sharpe_ratio': sharpe,
+            'num_samples': len(self.prices),
+        }
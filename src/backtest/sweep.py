@@ -0,0 +1,209 @@
+"""
+Parallel parameter sweeps over the backtesting engine.
+
+Runs one backtest per strategy parameter set across a ProcessPoolExecutor.
+The price history lives in a single shared memory block that every worker
+maps at startup, so tasks only carry the (tiny) parameter dict and workers
+build their BacktestEngine once and reuse it for every task they receive.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import BacktestEngine, STRATEGY_PARAMS
+
+# Default grid over the tunable strategy parameters (values in config.yaml units)
+DEFAULT_GRID = {
+    'strategy.rebalance_threshold': [0.02, 0.05, 0.1, 0.2],
+    'strategy.min_tick_range': [20, 50, 100],
+    'strategy.max_tick_range': [500, 1000],
+    'strategy.max_gas_cost_ratio': [0.01, 0.02, 0.05],
+}
+
+# Default ranges for random sampling: (low, high, integer?)
+DEFAULT_RANGES = {
+    'strategy.rebalance_threshold': (0.01, 0.3, False),
+    'strategy.min_tick_range': (10, 200, True),
+    'strategy.max_tick_range': (200, 2000, True),
+    'strategy.max_gas_cost_ratio': (0.005, 0.1, False),
+}
+
+# Per-worker state, set by _init_worker
+_worker_engine: Optional[BacktestEngine] = None
+_worker_shm: Optional[SharedMemory] = None
+_worker_task: Dict[str, Any] = {}
+
+
+def build_grid(values: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the full cartesian grid of parameter sets.
+
+    Args:
+        values: Parameter key -> candidate values
+
+    Returns:
+        List of parameter dicts
+    """
+    _check_keys(values)
+    keys = list(values)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values[k] for k in keys))]
+
+
+def sample_params(
+    ranges: Dict[str, Tuple[float, float, bool]],
+    num_samples: int,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Draw random parameter sets uniformly from ranges.
+
+    Args:
+        ranges: Parameter key -> (low, high, is_integer)
+        num_samples: Number of parameter sets
+        seed: Random seed
+
+    Returns:
+        List of parameter dicts
+    """
+    _check_keys(ranges)
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for key, (low, high, is_integer) in ranges.items():
+        if is_integer:
+            columns[key] = rng.integers(int(low), int(high) + 1, num_samples).tolist()
+        else:
+            columns[key] = rng.uniform(low, high, num_samples).tolist()
+    return [{key: columns[key][i] for key in ranges} for i in range(num_samples)]
+
+
+def _check_keys(params: Dict[str, Any]):
+    unknown = set(params) - set(STRATEGY_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+
+def _init_worker(shm_name: str, num_samples: int, task: Dict[str, Any]):
+    """Attach to the shared price history and build this worker's engine."""
+    global _worker_engine, _worker_shm, _worker_task
+
+    # Workers share the parent's resource tracker, so attaching here doesn't
+    # take ownership of the block; the parent unlinks it after the sweep
+    _worker_shm = SharedMemory(name=shm_name)
+    history = np.ndarray((2, num_samples), dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_engine = BacktestEngine(
+        history[0], history[1], task['pool_name'], base_fee_apr=task['base_fee_apr']
+    )
+    _worker_task = task
+
+
+def _run_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one backtest in a worker."""
+    _worker_engine.set_params(params)
+    results = _worker_engine.run(_worker_task['strategy_type'], _worker_task['capital'])
+    results['params'] = params
+    return results
+
+
+def run_sweep(
+    timestamps: np.ndarray,
+    prices: np.ndarray,
+    pool_name: str,
+    strategy_type: str,
+    capital: float,
+    param_sets: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    base_fee_apr: float = 0.08,
+    rank_by: str = 'net_profit'
+) -> List[Dict[str, Any]]:
+    """
+    Backtest every parameter set in parallel and rank the results.
+
+    Args:
+        timestamps: Sample timestamps in seconds
+        prices: Prices per sample
+        pool_name: Pool name
+        strategy_type: Strategy to backtest
+        capital: Starting capital
+        param_sets: Parameter dicts (see build_grid / sample_params)
+        workers: Worker processes (default: all cores)
+        base_fee_apr: Fee APR of a full-range position while in range
+        rank_by: Result key to sort by (descending)
+
+    Returns:
+        Results (each with a 'params' entry), best first
+    """
+    workers = workers or os.cpu_count() or 1
+    num_samples = len(prices)
+
+    shm = SharedMemory(create=True, size=2 * num_samples * np.dtype(np.float64).itemsize)
+    try:
+        history = np.ndarray((2, num_samples), dtype=np.float64, buffer=shm.buf)
+        history[0] = timestamps
+        history[1] = prices
+
+        task = {
+            'pool_name': pool_name,
+            'strategy_type': strategy_type,
+            'capital': capital,
+            'base_fee_apr': base_fee_apr,
+        }
+
+        # A few chunks per worker keeps IPC low while still balancing load
+        chunksize = max(1, len(param_sets) // (workers * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, num_samples, task)
+        ) as executor:
+            results = list(executor.map(_run_params, param_sets, chunksize=chunksize))
+
+        del history
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results.sort(key=lambda r: r[rank_by], reverse=True)
+    return results
+
+
+def format_results_table(results: List[Dict[str, Any]], top: int = 20) -> str:
+    """
+    Render ranked sweep results as a text table.
+
+    Args:
+        results: Output of run_sweep
+        top: Number of rows to show
+
+    Returns:
+        Table text
+    """
+    param_keys = list(results[0]['params']) if results else []
+    short = [key.split('.', 1)[-1] for key in param_keys]
+
+    header = ['#'] + short + ['net_profit', 'fees', 'gas', 'il', 'rebalances', 'return%', 'sharpe']
+    rows = []
+    for rank, r in enumerate(results[:top], start=1):
+        rows.append(
+            [str(rank)]
+            + [f"{r['params'][k]:.4g}" for k in param_keys]
+            + [
+                f"{r['net_profit']:,.2f}",
+                f"{r['fees_earned']:,.2f}",
+                f"{r['gas_costs']:,.2f}",
+                f"{r['impermanent_loss']:,.2f}",
+                str(r['num_rebalances']),
+                f"{r['total_return']:.2f}",
+                f"{r['sharpe_ratio']:.2f}",
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ['  '.join(cell.rjust(w) for cell, w in zip(header, widths))]
+    lines.append('  '.join('-' * w for w in widths))
+    lines.extend('  '.join(cell.rjust(w) for cell, w in zip(row, widths)) for row in rows)
+    return '\n'.join(lines)
@@ -0,0 +1,406 @@
+"""
+Pool price collection and rolling volatility.
+
+Each pool's history lives in a fixed-capacity ring buffer of timestamps and
+prices (historical_data_days at price_update_interval_seconds). Volatility
+windows keep Welford and EWMA statistics of the log returns that are
+updated as samples arrive, so a volatility lookup never rescans history.
+"""
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..dex.uniswap import get_uniswap
+from ..utils.config import get_config
+from ..utils.logger import log
+from ..utils.tick_math import sqrt_price_x96_to_price
+
+SECONDS_PER_DAY = 86400
+
+VOLATILITY_METHODS = ('welford', 'ewma')
+
+
+class _RollingStats:
+    """Log-return statistics over a trailing time window of one buffer."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self.start = 0          # Sequence number of the first sample in the window
+        self.count = 0          # Returns in the window (samples after start)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma_rate = None   # EWMA of squared return per second
+
+    def add(self, log_return: float):
+        self.count += 1
+        delta = log_return - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (log_return - self.mean)
+
+    def remove(self, log_return: float):
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = log_return - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (log_return - self.mean), 0.0)
+
+    def update_ewma(self, log_return: float, dt: float):
+        # Time-decayed, so irregular sampling weights each return by its span
+        rate = log_return * log_return / dt
+        if self.ewma_rate is None:
+            self.ewma_rate = rate
+        else:
+            alpha = 1.0 - math.exp(-dt / self.window_seconds)
+            self.ewma_rate += alpha * (rate - self.ewma_rate)
+
+
+class PriceBuffer:
+    """Fixed-capacity ring buffer of price samples for one pool."""
+
+    def __init__(self, capacity: int):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Maximum number of samples kept
+        """
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity)
+        self.prices = np.zeros(capacity)
+        self.log_prices = np.zeros(capacity)
+
+        # Samples are numbered by a running sequence; slot = seq % capacity
+        self.next_seq = 0
+        self._windows: Dict[float, _RollingStats] = {}
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained sample."""
+        return max(0, self.next_seq - self.capacity)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """
+        Get the newest sample.
+
+        Returns:
+            (timestamp, price) or None if empty
+        """
+        if self.next_seq == 0:
+            return None
+        slot = (self.next_seq - 1) % self.capacity
+        return float(self.timestamps[slot]), float(self.prices[slot])
+
+    def append(self, timestamp: float, price: float) -> bool:
+        """
+        Add a sample and update every volatility window.
+
+        Args:
+            timestamp: Sample time (seconds)
+            price: Price
+
+        Returns:
+            False if the sample was dropped (not newer than the last one, or
+            not a positive price)
+        """
+        if price <= 0:
+            return False
+
+        latest = self.latest()
+        if latest is not None and timestamp <= latest[0]:
+            return False
+
+        # The slot about to be overwritten may still open a window
+        if len(self) == self.capacity:
+            oldest = self.first_seq
+            for stats in self._windows.values():
+                if stats.start == oldest:
+                    self._evict_oldest(stats)
+
+        seq = self.next_seq
+        slot = seq % self.capacity
+        self.timestamps[slot] = timestamp
+        self.prices[slot] = price
+        self.log_prices[slot] = math.log(price)
+        self.next_seq += 1
+
+        if latest is not None:
+            prev_slot = (seq - 1) % self.capacity
+            log_return = self.log_prices[slot] - self.log_prices[prev_slot]
+            dt = timestamp - latest[0]
+            for stats in self._windows.values():
+                stats.add(log_return)
+                stats.update_ewma(log_return, dt)
+                self._evict_expired(stats)
+        else:
+            for stats in self._windows.values():
+                stats.start = seq
+
+        return True
+
+    def history(self, hours: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get samples in time order.
+
+        Args:
+            hours: Only the trailing window (all samples if None)
+
+        Returns:
+            (timestamps, prices) copies
+        """
+        order = np.arange(self.first_seq, self.next_seq) % self.capacity
+        timestamps = self.timestamps[order]
+        prices = self.prices[order]
+
+        if hours is not None and len(timestamps):
+            keep = timestamps >= timestamps[-1] - hours * 3600
+            timestamps, prices = timestamps[keep], prices[keep]
+
+        return timestamps, prices
+
+    def volatility(self, window_hours: float, method: str = 'welford') -> float:
+        """
+        Get daily volatility of log returns over a trailing window.
+
+        The first lookup of a window size builds its statistics from the
+        buffer; after that they are maintained by append() and a lookup is
+        O(1).
+
+        Args:
+            window_hours: Trailing window in hours
+            method: 'welford' (sample std over the window) or 'ewma'
+                (exponentially weighted, time constant = window)
+
+        Returns:
+            Daily volatility (0.0 if there is not enough history)
+        """
+        window_seconds = window_hours * 3600
+        stats = self._windows.get(window_seconds)
+        if stats is None:
+            stats = self._build_window(window_seconds)
+            self._windows[window_seconds] = stats
+
+        if method == 'ewma':
+            if stats.ewma_rate is None:
+                return 0.0
+            return math.sqrt(stats.ewma_rate * SECONDS_PER_DAY)
+
+        if stats.count < 2:
+            return 0.0
+
+        # Same scaling as the backtester: sample variance x samples per day
+        elapsed = self.latest()[0] - self.timestamps[stats.start % self.capacity]
+        variance = stats.m2 / (stats.count - 1)
+        samples_per_day = SECONDS_PER_DAY * stats.count / max(elapsed, 1e-9)
+        return math.sqrt(variance * samples_per_day)
+
+    def _build_window(self, window_seconds: float) -> _RollingStats:
+        stats = _RollingStats(window_seconds)
+        timestamps, prices = self.history()
+        if len(timestamps) == 0:
+            stats.start = self.next_seq
+            return stats
+
+        first = int(np.searchsorted(timestamps, timestamps[-1] - window_seconds, side='left'))
+        stats.start = self.first_seq + first
+
+        log_prices = np.log(prices)
+        returns = np.diff(log_prices[first:])
+        if len(returns):
+            stats.count = len(returns)
+            stats.mean = float(returns.mean())
+            stats.m2 = float(((returns - stats.mean) ** 2).sum())
+
+        # EWMA over the whole buffer in closed form: each return's weight is
+        # its alpha decayed by the time since it was observed
+        all_returns = np.diff(log_prices)
+        if len(all_returns):
+            dt = np.diff(timestamps)
+            rates = all_returns * all_returns / dt
+            alphas = 1.0 - np.exp(-dt / window_seconds)
+            alphas[0] = 1.0
+            decay = np.exp(-(timestamps[-1] - timestamps[1:]) / window_seconds)
+            stats.ewma_rate = float((alphas * decay * rates).sum())
+
+        return stats
+
+    def _evict_oldest(self, stats: _RollingStats):
+        if stats.start + 1 < self.next_seq:
+            stats.remove(
+                self.log_prices[(stats.start + 1) % self.capacity]
+                - self.log_prices[stats.start % self.capacity]
+            )
+        stats.start += 1
+
+    def _evict_expired(self, stats: _RollingStats):
+        cutoff = self.latest()[0] - stats.window_seconds
+        while stats.start < self.next_seq - 1 and self.timestamps[stats.start % self.capacity] < cutoff:
+            self._evict_oldest(stats)
+
+
+class PriceCollector:
+    """Collects pool prices and serves cached prices and volatility."""
+
+    def __init__(self):
+        """Initialize price collector."""
+        self.config = get_config()
+
+        self.update_interval = self.config.get('data.price_update_interval_seconds', 60)
+        history_days = self.config.get('data.historical_data_days', 30)
+        self.capacity = max(2, int(history_days * SECONDS_PER_DAY / self.update_interval))
+
+        self._buffers: Dict[str, PriceBuffer] = {}
+        self._uniswap = None
+
+        log.info(f"Price collector initialized ({self.capacity:,} samples per pool)")
+
+    @property
+    def uniswap(self):
+        """Uniswap interface, connected on first use."""
+        if self._uniswap is None:
+            self._uniswap = get_uniswap()
+        return self._uniswap
+
+    def _get_buffer(self, pool_name: str) -> PriceBuffer:
+        buffer = self._buffers.get(pool_name)
+        if buffer is None:
+            buffer = PriceBuffer(self.capacity)
+            self._buffers[pool_name] = buffer
+        return buffer
+
+    def fetch_current_price(self, pool_name: str) -> float:
+        """
+        Read the pool's current price on-chain and record it.
+
+        The raw pool price (token1/token0 in base units, i.e. 1.0001 ** tick)
+        is what price_to_tick and the optimizer expect, and is the scale the
+        position monitor records from pool ticks.
+
+        Args:
+            pool_name: Pool name from pools.yaml
+
+        Returns:
+            Raw price of token0 in token1
+        """
+        pool_config = self.config.get_pool_by_name(pool_name)
+        if not pool_config:
+            raise ValueError(f"Pool {pool_name} not found in config")
+
+        slot0 = self.uniswap.get_pool_slot0(pool_config['address'])
+        price = sqrt_price_x96_to_price(slot0['sqrtPriceX96'])
+
+        self.add_price(pool_name, price)
+        log.debug(f"{pool_name} price: {price}")
+        return price
+
+    def fetch_display_price(self, pool_name: str) -> float:
+        """
+        Read the pool's current price adjusted for token decimals (for display).
+
+        Args:
+            pool_name: Pool name from pools.yaml
+
+        Returns:
+            Price of token0 in token1, adjusted for token decimals
+        """
+        pool_config = self.config.get_pool_by_name(pool_name)
+        if not pool_config:
+            raise ValueError(f"Pool {pool_name} not found in config")
+
+        price = self.fetch_current_price(pool_name)
+        return price * 10 ** (pool_config.get('decimals0', 18) - pool_config.get('decimals1', 18))
+
+    def add_price(self, pool_name: str, price: float, timestamp: Optional[float] = None) -> bool:
+        """
+        Record a price sample (e.g. from an event stream or a backfill).
+
+        Args:
+            pool_name: Pool name
+            price: Raw price of token0 in token1
+            timestamp: Sample time in seconds (default: now)
+
+        Returns:
+            True if the sample was stored
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        return self._get_buffer(pool_name).append(timestamp, price)
+
+    def get_cached_price(self, pool_name: str, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        """
+        Get the last recorded price if it is still fresh.
+
+        Args:
+            pool_name: Pool name
+            max_age_seconds: Maximum age (default: price_update_interval_seconds)
+
+        Returns:
+            Price, or None if there is no fresh sample
+        """
+        buffer = self._buffers.get(pool_name)
+        latest = buffer.latest() if buffer else None
+        if latest is None:
+            return None
+
+        if max_age_seconds is None:
+            max_age_seconds = self.update_interval
+
+        timestamp, price = latest
+        if time.time() - timestamp > max_age_seconds:
+            return None
+        return price
+
+    def calculate_volatility(self, pool_name: str, window_hours: float = 24, method: str = 'welford') -> float:
+        """
+        Get daily volatility of the pool's log returns.
+
+        Args:
+            pool_name: Pool name
+            window_hours: Trailing window in hours
+            method: 'welford' (rolling sample std) or 'ewma'
+
+        Returns:
+            Daily volatility as a fraction (0.0 without enough history)
+        """
+        if method not in VOLATILITY_METHODS:
+            raise ValueError(f"Unknown volatility method: {method}")
+
+        buffer = self._buffers.get(pool_name)
+        if buffer is None:
+            return 0.0
+        return buffer.volatility(window_hours, method)
+
+    def get_price_history(self, pool_name: str, hours: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get recorded samples in time order.
+
+        Args:
+            pool_name: Pool name
+            hours: Only the trailing window (all samples if None)
+
+        Returns:
+            (timestamps, prices)
+        """
+        buffer = self._buffers.get(pool_name)
+        if buffer is None:
+            return np.zeros(0), np.zeros(0)
+        return buffer.history(hours)
+
+
+# Global price collector instance
+_price_collector = None
+
+
+def get_price_collector() -> PriceCollector:
+    """Get global price collector instance."""
+    global _price_collector
+    if _price_collector is None:
+        _price_collector = PriceCollector()
+    return _price_collector
@@ -0,0 +1,276 @@
+"""
+Local record of ERC20 allowances.
+
+Keeps the last known allowance per (token, owner, spender) so approvals are
+only sent when an allowance is actually short. Entries come from batched
+allowance() reads, from approvals we send and from Approval events in
+their receipts (and in mint receipts, for tokens that emit one on
+transferFrom), and are decremented as transfers consume them. The record
+is persisted to a JSON file per chain, so restarts don't re-read or
+re-approve. Writes happen on a background timer at most every
+save_interval seconds and at exit, not on every change; entries lost to a
+crash are read from the chain again.
+
+A stale entry (e.g. an allowance revoked elsewhere) shows up as a failed
+transaction; callers forget the entries involved so the next use reads
+them from the chain again.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+from .contracts import ContractRegistry, to_checksum_address
+from ..utils.logger import log
+
+MAX_UINT256 = 2**256 - 1
+
+# Relative cache paths are resolved against the project root, not the working directory
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_CACHE_FILE = 'data/allowances.json'
+
+# Minimum seconds between writes of the cache file
+DEFAULT_SAVE_INTERVAL = 5.0
+
+APPROVAL_TOPIC = Web3.keccak(text='Approval(address,address,uint256)')
+
+# (token, owner, spender), all checksummed
+AllowanceKey = Tuple[str, str, str]
+
+
+def allowance_key(token: str, owner: str, spender: str) -> AllowanceKey:
+    """Build a checksummed (token, owner, spender) key."""
+    return to_checksum_address(token), to_checksum_address(owner), to_checksum_address(spender)
+
+
+class AllowanceTracker:
+    """Known allowances, read in batches and persisted locally."""
+
+    def __init__(
+        self,
+        contracts: ContractRegistry,
+        chain_id: int,
+        path: Optional[str] = DEFAULT_CACHE_FILE,
+        save_interval: float = DEFAULT_SAVE_INTERVAL
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            contracts: Registry for ERC20 contracts and batched reads
+            chain_id: Chain the allowances belong to (file section)
+            path: JSON file to persist to, relative to the project root
+                (None keeps them in memory only)
+            save_interval: Minimum seconds between writes of the file
+        """
+        self.contracts = contracts
+        self.chain_id = str(chain_id)
+        self.path = PROJECT_ROOT / path if path else None
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._allowances: Dict[AllowanceKey, int] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._save_timer: Optional[threading.Timer] = None
+        self._load()
+
+        if self.path is not None:
+            atexit.register(self.flush)
+
+    def get(self, token: str, owner: str, spender: str) -> Optional[int]:
+        """
+        Get the recorded allowance without reading the chain.
+
+        Args:
+            token: Token contract address
+            owner: Token owner
+            spender: Approved spender
+
+        Returns:
+            Allowance, or None if unknown
+        """
+        return self._allowances.get(allowance_key(token, owner, spender))
+
+    def get_many(self, keys: List[AllowanceKey], refresh: bool = False) -> Dict[AllowanceKey, Optional[int]]:
+        """
+        Get several allowances, reading unknown ones in one multicall.
+
+        Args:
+            keys: (token, owner, spender) tuples
+            refresh: Read every key from the chain, not just unknown ones
+
+        Returns:
+            Dict of checksummed key -> allowance (None if the read failed)
+        """
+        keys = list(dict.fromkeys(allowance_key(*key) for key in keys))
+        missing = keys if refresh else [key for key in keys if key not in self._allowances]
+
+        if missing:
+            results = self.contracts.multicall.call([
+                (self.contracts.erc20(token), 'allowance', (owner, spender))
+                for token, owner, spender in missing
+            ])
+            with self._lock:
+                for key, allowance in zip(missing, results):
+                    if allowance is not None:
+                        self._allowances[key] = allowance
+            self._save()
+            log.debug(f"Read {len(missing)} allowances")
+
+        return {key: self._allowances.get(key) for key in keys}
+
+    def needs_approval(self, token: str, owner: str, spender: str, amount: int) -> bool:
+        """
+        Check whether spending amount needs a new approval (reads unknown allowances).
+
+        Args:
+            token: Token contract address
+            owner: Token owner
+            spender: Approved spender
+            amount: Amount about to be spent
+
+        Returns:
+            True if the allowance is short or could not be read
+        """
+        key = allowance_key(token, owner, spender)
+        allowance = self.get_many([key])[key]
+        return allowance is None or allowance < amount
+
+    def record(self, token: str, owner: str, spender: str, allowance: int):
+        """
+        Record an allowance (e.g. right after sending an approval).
+
+        Args:
+            token: Token contract address
+            owner: Token owner
+            spender: Approved spender
+            allowance: New allowance
+        """
+        with self._lock:
+            self._allowances[allowance_key(token, owner, spender)] = allowance
+        self._save()
+
+    def record_receipt(self, receipt) -> List[AllowanceKey]:
+        """
+        Record the allowances set by Approval events in a receipt.
+
+        Args:
+            receipt: Transaction receipt
+
+        Returns:
+            Keys of the allowances recorded
+        """
+        recorded = []
+        with self._lock:
+            for entry in receipt['logs']:
+                topics = entry['topics']
+                # ERC721 Approval has the same signature but indexes the token ID
+                if len(topics) != 3 or topics[0] != APPROVAL_TOPIC:
+                    continue
+                owner = to_checksum_address('0x' + bytes(topics[1])[-20:].hex())
+                spender = to_checksum_address('0x' + bytes(topics[2])[-20:].hex())
+                key = (to_checksum_address(entry['address']), owner, spender)
+                self._allowances[key] = int.from_bytes(bytes(entry['data']), 'big')
+                recorded.append(key)
+        if recorded:
+            self._save()
+        return recorded
+
+    def consume(self, token: str, owner: str, spender: str, amount: int):
+        """
+        Decrement an allowance after spender transferred amount.
+
+        Unlimited (max uint256) allowances are not decremented by the
+        token, so they are left as they are.
+
+        Args:
+            token: Token contract address
+            owner: Token owner
+            spender: Spender that transferred
+            amount: Amount transferred
+        """
+        key = allowance_key(token, owner, spender)
+        with self._lock:
+            allowance = self._allowances.get(key)
+            if allowance is None or allowance == MAX_UINT256:
+                return
+            self._allowances[key] = max(allowance - amount, 0)
+        self._save()
+
+    def forget(self, keys: List[AllowanceKey]):
+        """
+        Drop entries so their next use reads the chain.
+
+        Args:
+            keys: (token, owner, spender) tuples
+        """
+        with self._lock:
+            for key in keys:
+                self._allowances.pop(allowance_key(*key), None)
+        self._save()
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f).get(self.chain_id, {})
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not load allowance cache {self.path}: {e}")
+            return
+        for key, allowance in entries.items():
+            token, owner, spender = key.split(':')
+            self._allowances[(token, owner, spender)] = int(allowance)
+        log.debug(f"Loaded {len(entries)} allowances from {self.path}")
+
+    def flush(self):
+        """Write pending changes to the cache file now."""
+        if self.path is None:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            entries = {':'.join(key): str(allowance) for key, allowance in self._allowances.items()}
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        with self._write_lock:
+            try:
+                data = {}
+                if self.path.exists():
+                    with open(self.path) as f:
+                        data = json.load(f)
+                data[self.chain_id] = entries
+
+                # Written to a temporary file first so a crash can't truncate the cache
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except (OSError, ValueError) as e:
+                log.warning(f"Could not save allowance cache {self.path}: {e}")
+
+    def _save(self):
+        """Schedule a write of the cache file (at most one per save_interval)."""
+        if self.path is None:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            delay = max(self._last_save + self.save_interval - time.monotonic(), 0.0)
+            self._save_timer = threading.Timer(delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
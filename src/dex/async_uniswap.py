@@ -0,0 +1,223 @@
+"""
+Async Uniswap V3 reads for Base Network.
+
+Read-only sibling of UniswapV3 for asyncio services (position monitor, API).
+Transactions still go through the synchronous UniswapV3.
+"""
+from typing import Any, Dict, List
+import logging
+
+from .async_web3_client import AsyncWeb3Client, get_async_web3_client
+from .abis import ERC20_ABI, POSITION_MANAGER_ABI
+from .contracts import to_checksum_address
+from .uniswap import POSITION_PREFETCH, UniswapV3
+from ..utils.config import get_config
+from ..utils.tick_math import sqrt_price_x96_to_price
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUniswapV3:
+    """Async view calls for Uniswap V3 on Base Network."""
+
+    def __init__(self, web3_client: AsyncWeb3Client = None):
+        """
+        Initialize async Uniswap V3 interface.
+
+        Args:
+            web3_client: Async client (default: the shared one)
+        """
+        self.config = get_config()
+        self.web3_client = web3_client or get_async_web3_client()
+        self.w3 = self.web3_client.w3
+        self.contracts = self.web3_client.contracts
+        self.multicall = self.web3_client.multicall
+
+        self.position_manager_address = self.config.get('uniswap.position_manager_address')
+
+        # Token symbol and decimals, read once per token
+        self._token_metadata: Dict[str, Dict[str, Any]] = {}
+
+        logger.info("Async Uniswap V3 interface initialized on Base Network")
+
+    async def get_pool_slot0(self, pool_address: str) -> Dict[str, int]:
+        """
+        Get exact sqrtPriceX96 and tick from pool.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Dict with sqrtPriceX96 and tick
+        """
+        slot0 = await self.contracts.pool(pool_address).functions.slot0().call()
+        return {
+            'sqrtPriceX96': slot0[0],
+            'tick': slot0[1]
+        }
+
+    async def get_pool_price(self, pool_address: str) -> float:
+        """
+        Get current price from pool.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Current price (token1/token0), 0.0 on error
+        """
+        try:
+            slot0 = await self.get_pool_slot0(pool_address)
+            return sqrt_price_x96_to_price(slot0['sqrtPriceX96'])
+        except Exception as e:
+            logger.error(f"Error getting pool price: {e}")
+            return 0.0
+
+    async def get_pool_liquidity(self, pool_address: str) -> int:
+        """
+        Get current liquidity in pool.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Current liquidity, 0 on error
+        """
+        try:
+            return await self.contracts.pool(pool_address).functions.liquidity().call()
+        except Exception as e:
+            logger.error(f"Error getting pool liquidity: {e}")
+            return 0
+
+    async def get_pools_state(self, pool_addresses: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Get slot0 and liquidity of several pools in one multicall.
+
+        Args:
+            pool_addresses: Pool contract addresses
+
+        Returns:
+            Dict of checksummed pool address -> {'sqrtPriceX96', 'tick',
+            'liquidity'}; pools whose reads failed are left out
+        """
+        addresses = dict.fromkeys(map(to_checksum_address, pool_addresses))
+        contracts = [self.contracts.pool(address) for address in addresses]
+        results = await self.multicall.call(UniswapV3._pools_state_calls(contracts))
+        return UniswapV3._parse_pools_state(contracts, results)
+
+    async def get_pool_info(self, pool_address: str) -> Dict[str, Any]:
+        """
+        Get pool token addresses, fee tier and tick spacing (cached).
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Dict with token0, token1, fee, tickSpacing
+        """
+        return await self.contracts.get_pool_immutables(pool_address)
+
+    async def get_tokens_metadata(self, token_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get symbol and decimals of several tokens, reading unknown ones in one multicall.
+
+        Args:
+            token_addresses: Token contract addresses
+
+        Returns:
+            Dict of checksummed token address -> {'symbol', 'decimals'}
+        """
+        addresses = list(dict.fromkeys(map(to_checksum_address, token_addresses)))
+        missing = [address for address in addresses if address not in self._token_metadata]
+
+        if missing:
+            calls = []
+            for address in missing:
+                contract = self.contracts.get(address, ERC20_ABI)
+                calls.append((contract, 'symbol', ()))
+                calls.append((contract, 'decimals', ()))
+            results = await self.multicall.call(calls, allow_failure=False)
+
+            for i, address in enumerate(missing):
+                self._token_metadata[address] = {
+                    'symbol': results[2 * i],
+                    'decimals': results[2 * i + 1]
+                }
+
+        return {address: self._token_metadata[address] for address in addresses}
+
+    async def get_position(self, token_id: int) -> Dict[str, Any]:
+        """
+        Get details of an existing position.
+
+        Args:
+            token_id: NFT token ID
+
+        Returns:
+            Position details
+        """
+        contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        position = await contract.functions.positions(token_id).call()
+        return UniswapV3._position_to_dict(position)
+
+    async def get_positions(self, wallet: str, prefetch: int = POSITION_PREFETCH) -> List[Dict[str, Any]]:
+        """
+        Get all positions owned by a wallet.
+
+        Same two-round-trip batching as UniswapV3.get_positions.
+
+        Args:
+            wallet: Wallet address
+            prefetch: Token IDs to request before the balance is known
+
+        Returns:
+            List of position details
+        """
+        wallet = to_checksum_address(wallet)
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+
+        calls = [(pm_contract, 'balanceOf', (wallet,))]
+        calls += [(pm_contract, 'tokenOfOwnerByIndex', (wallet, i)) for i in range(prefetch)]
+        block_number, results = await self.multicall.aggregate(calls)
+
+        balance = results[0]
+        if balance is None:
+            raise ValueError(f"Could not read position balance of {wallet}")
+        token_ids = results[1:balance + 1]
+
+        if balance > prefetch:
+            token_ids += await self.multicall.call(
+                [(pm_contract, 'tokenOfOwnerByIndex', (wallet, i)) for i in range(prefetch, balance)],
+                allow_failure=False,
+                block_identifier=block_number
+            )
+
+        results = await self.multicall.call(
+            [(pm_contract, 'positions', (token_id,)) for token_id in token_ids],
+            allow_failure=False,
+            block_identifier=block_number
+        )
+
+        positions = []
+        for token_id, result in zip(token_ids, results):
+            position = UniswapV3._position_to_dict(result)
+            position['tokenId'] = token_id
+            positions.append(position)
+
+        return positions
+
+    async def close(self):
+        """Close pooled connections."""
+        await self.web3_client.close()
+
+
+# Global async Uniswap instance
+_async_uniswap = None
+
+
+def get_async_uniswap() -> AsyncUniswapV3:
+    """Get global async Uniswap V3 instance."""
+    global _async_uniswap
+    if _async_uniswap is None:
+        _async_uniswap = AsyncUniswapV3()
+    return _async_uniswap
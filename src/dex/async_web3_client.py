@@ -0,0 +1,321 @@
+"""
+Async Web3 connection for Base Network with pooled HTTP connections.
+
+Read-only sibling of Web3Client for asyncio services. Requests go through
+one aiohttp session per event loop, whose connector holds at most
+http_pool_size connections, and at most max_concurrent_requests are in
+flight at once; the rest wait their turn without holding a socket.
+
+With network.rpc_endpoints configured, requests are routed between several
+endpoints by AsyncRPCPoolProvider (see rpc_pool), each endpoint with its
+own pooled session.
+"""
+import asyncio
+import time
+from typing import Any, List, Optional, Tuple
+
+import aiohttp
+from web3 import AsyncWeb3
+from web3.middleware import async_geth_poa_middleware
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from .abis import ERC20_ABI
+from .contracts import AsyncContractRegistry, to_checksum_address
+from .rpc_pool import RPCPool, build_rpc_endpoints
+from .rpc_pool import RPCEndpoint as PoolEndpoint
+from ..utils.config import get_config
+from ..utils.logger import log
+
+DEFAULT_HTTP_POOL_SIZE = 32
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 30
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider with its own size-limited session and concurrency cap."""
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+        max_concurrent_requests: Optional[int] = None,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            endpoint_uri: RPC URL
+            pool_size: Maximum open connections
+            max_concurrent_requests: Maximum requests in flight (default: pool_size)
+            timeout: Per-request timeout in seconds
+        """
+        super().__init__(endpoint_uri)
+        self.pool_size = pool_size
+        self.max_concurrent_requests = max_concurrent_requests or pool_size
+        self.timeout = timeout
+
+        # aiohttp sessions and semaphores belong to the loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._chain_id_lock: Optional[asyncio.Lock] = None
+
+        # web3's validation middleware asks for the chain ID before every
+        # eth_call; it cannot change for an endpoint, so answer it locally
+        self._chain_id_response: Optional[RPCResponse] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                raise_for_status=True
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._chain_id_lock = asyncio.Lock()
+            self._loop = loop
+        return self._session
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method != 'eth_chainId':
+            return await self._post(method, params)
+
+        self._get_session()
+        async with self._chain_id_lock:
+            if self._chain_id_response is None:
+                response = await self._post(method, params)
+                if 'result' not in response:
+                    return response
+                self._chain_id_response = response
+        return self._chain_id_response
+
+    async def _post(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        session = self._get_session()
+        request_data = self.encode_rpc_request(method, params)
+        async with self._semaphore:
+            async with session.post(
+                self.endpoint_uri,
+                data=request_data,
+                headers=self.get_request_headers()
+            ) as response:
+                raw_response = await response.read()
+        return self.decode_rpc_response(raw_response)
+
+    async def disconnect(self):
+        """Close the HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncRPCPoolProvider(AsyncJSONBaseProvider):
+    """Async provider routing each request through an RPCPool of pooled endpoints."""
+
+    def __init__(
+        self,
+        endpoints: List[PoolEndpoint],
+        pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+        max_concurrent_requests: Optional[int] = None,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            endpoints: Endpoints to route between
+            pool_size: Maximum open connections per endpoint
+            max_concurrent_requests: Maximum requests in flight per endpoint (default: pool_size)
+            timeout: Per-request timeout in seconds
+        """
+        super().__init__()
+        self.pool = RPCPool(endpoints)
+        self.pool_size = pool_size
+        self.max_concurrent_requests = max_concurrent_requests or pool_size
+        self._providers = {
+            endpoint: PooledAsyncHTTPProvider(
+                endpoint.url,
+                pool_size=pool_size,
+                max_concurrent_requests=max_concurrent_requests,
+                timeout=timeout
+            )
+            for endpoint in endpoints
+        }
+
+    @property
+    def endpoint_uri(self) -> str:
+        """URL of the currently preferred endpoint."""
+        return self.pool.best().url
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        tried: Tuple[PoolEndpoint, ...] = ()
+        error: Any = None
+        for attempt in range(len(self.pool.endpoints)):
+            endpoint, wait = self.pool.select(tried)
+            tried += (endpoint,)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            start = time.monotonic()
+            try:
+                response = await self._providers[endpoint].make_request(method, params)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                error = e
+                endpoint.record_failure(e, rate_limited=getattr(e, 'status', None) == 429)
+                continue
+
+            rate_limit = self.pool.failover_error(response)
+            if rate_limit is not None:
+                error = rate_limit
+                endpoint.record_failure(rate_limit, rate_limited=True)
+                continue
+
+            endpoint.record_success(time.monotonic() - start)
+            if attempt > 0:
+                return self.pool.already_sent(method, params, response) or response
+            return response
+
+        raise ConnectionError(f"All {len(self.pool.endpoints)} RPC endpoints failed for {method}: {error}")
+
+    async def disconnect(self):
+        """Close every endpoint's HTTP session."""
+        for provider in self._providers.values():
+            await provider.disconnect()
+
+
+class AsyncWeb3Client:
+    """Async Web3 client for Base network (view calls only)."""
+
+    def __init__(self, rpc_url: Optional[str] = None):
+        """
+        Initialize async Web3 client.
+
+        Args:
+            rpc_url: RPC URL (defaults to config)
+        """
+        config = get_config()
+
+        self.rpc_url = rpc_url or config.rpc_url
+        self.chain_id = config.chain_id
+
+        pool_size = config.get('network.http_pool_size', DEFAULT_HTTP_POOL_SIZE)
+        max_concurrent_requests = config.get('network.max_concurrent_requests')
+        timeout = config.get('network.request_timeout_seconds', DEFAULT_REQUEST_TIMEOUT_SECONDS)
+
+        # An explicit URL pins the client to it; otherwise use the endpoint pool if configured
+        endpoints = [] if rpc_url else build_rpc_endpoints(config.get('network.rpc_endpoints'))
+        if endpoints:
+            self.provider = AsyncRPCPoolProvider(
+                endpoints,
+                pool_size=pool_size,
+                max_concurrent_requests=max_concurrent_requests,
+                timeout=timeout
+            )
+        else:
+            self.provider = PooledAsyncHTTPProvider(
+                self.rpc_url,
+                pool_size=pool_size,
+                max_concurrent_requests=max_concurrent_requests,
+                timeout=timeout
+            )
+        self.w3 = AsyncWeb3(self.provider)
+        self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+
+        # Contract objects, pool immutables and batched reads
+        self.contracts = AsyncContractRegistry(self.w3)
+        self.multicall = self.contracts.multicall
+
+        log.info(
+            f"Async Web3 client initialized ({self.provider.pool_size} connections, "
+            f"{self.provider.max_concurrent_requests} concurrent requests)"
+        )
+
+    async def is_connected(self) -> bool:
+        """Check that the RPC endpoint answers."""
+        return await self.w3.is_connected()
+
+    async def get_block_number(self) -> int:
+        """Get latest block number."""
+        return await self.w3.eth.block_number
+
+    async def get_balance(self, address: str) -> float:
+        """
+        Get ETH balance on Base.
+
+        Args:
+            address: Address to check
+
+        Returns:
+            Balance in ETH
+        """
+        balance_wei = await self.w3.eth.get_balance(to_checksum_address(address))
+        return self.w3.from_wei(balance_wei, 'ether')
+
+    async def get_token_balance(self, token_address: str, address: str) -> float:
+        """
+        Get ERC20 token balance (balance and decimals in one multicall).
+
+        Args:
+            token_address: Token contract address
+            address: Address to check
+
+        Returns:
+            Token balance
+        """
+        contract = self.contracts.get(token_address, ERC20_ABI)
+        balance, decimals = await self.multicall.call(
+            [(contract, 'balanceOf', (to_checksum_address(address),)), (contract, 'decimals', ())],
+            allow_failure=False
+        )
+        return balance / (10 ** decimals)
+
+    async def call_contract_function(
+        self,
+        contract_address: str,
+        abi: list,
+        function_name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Call contract view function.
+
+        Args:
+            contract_address: Contract address
+            abi: Contract ABI
+            function_name: Function name
+            *args: Function arguments
+            **kwargs: Additional options
+
+        Returns:
+            Function result
+        """
+        contract = self.contracts.get(contract_address, abi)
+
+        function = getattr(contract.functions, function_name)
+        return await function(*args).call(**kwargs)
+
+    async def close(self):
+        """Close pooled connections."""
+        await self.provider.disconnect()
+
+
+# Global async Web3 client instance
+_async_web3_client = None
+
+
+def get_async_web3_client() -> AsyncWeb3Client:
+    """Get global async Web3 client instance."""
+    global _async_web3_client
+    if _async_web3_client is None:
+        _async_web3_client = AsyncWeb3Client()
+    return _async_web3_client
+
+
+async def close_async_web3_client():
+    """Close the global async client's connections, if it was created."""
+    if _async_web3_client is not None:
+        await _async_web3_client.close()
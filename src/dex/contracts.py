@@ -0,0 +1,174 @@
+"""
+Cached contract objects and pool immutables.
+
+Building a web3 Contract parses its ABI, and checksumming an address hashes
+it, so doing either per call adds up on hot paths. The registry builds each
+contract once per (address, ABI) and keeps pool fields that never change
+after deployment (tokens, fee, tick spacing).
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from web3 import AsyncWeb3, Web3
+from web3.contract import Contract
+
+from .abis import ERC20_ABI, POOL_ABI
+from .multicall import AsyncMulticall, Call, Multicall
+from ..utils.logger import log
+
+POOL_IMMUTABLES = ('token0', 'token1', 'fee', 'tickSpacing')
+
+
+@lru_cache(maxsize=8192)
+def to_checksum_address(address: str) -> str:
+    """
+    Checksum an address, caching the result.
+
+    Args:
+        address: Hex address in any case
+
+    Returns:
+        EIP-55 checksummed address
+    """
+    return Web3.to_checksum_address(address)
+
+
+class ContractRegistry:
+    """Contract objects built once per (address, ABI)."""
+
+    def __init__(self, w3: Web3, multicall: Optional[Multicall] = None):
+        """
+        Initialize registry.
+
+        Args:
+            w3: Web3 instance
+            multicall: Batch reader for pool immutables (created if omitted)
+        """
+        self.w3 = w3
+        self.multicall = multicall or Multicall(w3)
+
+        # (address, id(abi)) -> (abi, contract); holding the ABI keeps its id
+        # from being reused by another list while the entry exists
+        self._contracts: Dict[Tuple[str, int], Tuple[list, Contract]] = {}
+        self._pool_immutables: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, address: str, abi: list) -> Contract:
+        """
+        Get the contract object for an address and ABI.
+
+        ABIs are identified by object identity, so pass the shared constants
+        from abis.py (or another long-lived list) rather than a fresh copy.
+
+        Args:
+            address: Contract address (any case)
+            abi: Contract ABI
+
+        Returns:
+            Contract
+        """
+        address = to_checksum_address(address)
+        key = (address, id(abi))
+        entry = self._contracts.get(key)
+        if entry is None:
+            entry = (abi, self.w3.eth.contract(address=address, abi=abi))
+            self._contracts[key] = entry
+        return entry[1]
+
+    def pool(self, address: str) -> Contract:
+        """Get a Uniswap V3 pool contract."""
+        return self.get(address, POOL_ABI)
+
+    def erc20(self, address: str) -> Contract:
+        """Get an ERC20 token contract."""
+        return self.get(address, ERC20_ABI)
+
+    def get_pool_immutables(self, pool_address: str) -> Dict[str, Any]:
+        """
+        Get token0, token1, fee and tickSpacing of a pool.
+
+        Read once (one multicall) and cached for the life of the registry.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Dict with token0, token1, fee, tickSpacing
+        """
+        return self.get_pools_immutables([pool_address])[to_checksum_address(pool_address)]
+
+    def get_pools_immutables(self, pool_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get immutables of several pools, reading the uncached ones in one multicall.
+
+        Args:
+            pool_addresses: Pool contract addresses
+
+        Returns:
+            Dict of checksummed pool address -> immutables
+        """
+        addresses, missing = self._split_cached_pools(pool_addresses)
+        if missing:
+            results = self.multicall.call(self._pool_immutables_calls(missing), allow_failure=False)
+            self._cache_pool_immutables(missing, results)
+        return {address: self._pool_immutables[address] for address in addresses}
+
+    def _split_cached_pools(self, pool_addresses: List[str]) -> Tuple[List[str], List[str]]:
+        addresses = list(dict.fromkeys(to_checksum_address(address) for address in pool_addresses))
+        return addresses, [address for address in addresses if address not in self._pool_immutables]
+
+    def _pool_immutables_calls(self, pool_addresses: List[str]) -> List[Call]:
+        return [(self.pool(address), name, ()) for address in pool_addresses for name in POOL_IMMUTABLES]
+
+    def _cache_pool_immutables(self, pool_addresses: List[str], results: List[Any]):
+        for i, address in enumerate(pool_addresses):
+            token0, token1, fee, tick_spacing = results[i * len(POOL_IMMUTABLES):(i + 1) * len(POOL_IMMUTABLES)]
+            self._pool_immutables[address] = {
+                'token0': to_checksum_address(token0),
+                'token1': to_checksum_address(token1),
+                'fee': fee,
+                'tickSpacing': tick_spacing
+            }
+            log.debug(f"Cached immutables for pool {address}")
+
+
+class AsyncContractRegistry(ContractRegistry):
+    """Contract registry on an AsyncWeb3 instance (pool immutables are awaited)."""
+
+    def __init__(self, w3: AsyncWeb3, multicall: Optional[AsyncMulticall] = None):
+        """
+        Initialize registry.
+
+        Args:
+            w3: AsyncWeb3 instance
+            multicall: Batch reader for pool immutables (created if omitted)
+        """
+        super().__init__(w3, multicall or AsyncMulticall(w3))
+
+    async def get_pool_immutables(self, pool_address: str) -> Dict[str, Any]:
+        """
+        Get token0, token1, fee and tickSpacing of a pool (cached).
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Dict with token0, token1, fee, tickSpacing
+        """
+        pools = await self.get_pools_immutables([pool_address])
+        return pools[to_checksum_address(pool_address)]
+
+    async def get_pools_immutables(self, pool_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get immutables of several pools, reading the uncached ones in one multicall.
+
+        Args:
+            pool_addresses: Pool contract addresses
+
+        Returns:
+            Dict of checksummed pool address -> immutables
+        """
+        addresses, missing = self._split_cached_pools(pool_addresses)
+        if missing:
+            results = await self.multicall.call(self._pool_immutables_calls(missing), allow_failure=False)
+            self._cache_pool_immutables(missing, results)
+        return {address: self._pool_immutables[address] for address in addresses}
@@ -0,0 +1,402 @@
+"""
+New-block-driven pool change events.
+
+Instead of re-reading every pool on a fixed interval, the tracker follows
+the chain head and publishes "pool X changed at block N" events when a
+pool's slot0 tick moves. A pool's tick only moves through swaps, and every
+Swap log carries the pool's post-swap sqrtPriceX96, liquidity and tick, so
+each new head costs one eth_getLogs for all watched pools and idle blocks
+cost nothing beyond noticing the head.
+
+Heads are followed by polling eth_blockNumber and reading logs over
+explicit block ranges rather than with eth_newFilter: filters live on one
+node, so they are lost on restarts and when an RPC pool routes the next
+poll to another endpoint, and a lost filter silently drops events. Ranges
+have no gaps to recover from.
+
+Consumers subscribe and block (get) or await (get_async) the next batch of
+changes; events published while they were busy are queued, not missed.
+Components that need other pool events (the pool mirror) register log
+handlers and get every log of their topics, in order, from the same
+eth_getLogs request.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+from web3 import Web3
+
+from .contracts import ContractRegistry, to_checksum_address
+from .view_cache import ViewCache
+from .web3_client import get_web3_client
+from ..utils.config import get_config
+from ..utils.logger import log
+
+# Half a block on Base, so changes are seen within one block
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+# Blocks per eth_getLogs when catching up (providers cap ranges)
+MAX_LOG_RANGE = 500
+
+SWAP_TOPIC = Web3.keccak(text='Swap(address,address,int256,int256,uint160,uint128,int24)')
+SWAP_DATA_TYPES = ['int256', 'int256', 'uint160', 'uint128', 'int24']
+
+
+class HeadSubscription:
+    """Queue of pool change events for one consumer."""
+
+    def __init__(self, tracker: 'HeadTracker', pools: Optional[Iterable[str]] = None):
+        """
+        Initialize subscription.
+
+        Args:
+            tracker: Tracker publishing the events
+            pools: Pools to receive events for (default: every watched pool)
+        """
+        self.tracker = tracker
+        self.pools = {to_checksum_address(pool) for pool in pools} if pools is not None else None
+
+        self._condition = threading.Condition()
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def get(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Block until at least one change is queued.
+
+        Args:
+            timeout: Seconds to wait (default: forever)
+
+        Returns:
+            Queued change events, oldest first ([] on timeout)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._events, timeout)
+            return self._drain()
+
+    async def get_async(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Wait from a coroutine until at least one change is queued.
+
+        Args:
+            timeout: Seconds to wait (default: forever)
+
+        Returns:
+            Queued change events, oldest first ([] on timeout)
+        """
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            if self._loop is not loop:
+                self._loop, self._ready = loop, asyncio.Event()
+            if self._events:
+                return self._drain()
+            self._ready.clear()
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._condition:
+            return self._drain()
+
+    def close(self):
+        """Stop receiving events."""
+        self.tracker.unsubscribe(self)
+
+    def _put(self, events: List[Dict[str, Any]]):
+        events = [event for event in events if self.pools is None or event['pool'] in self.pools]
+        if not events:
+            return
+        with self._condition:
+            self._events.extend(events)
+            self._condition.notify_all()
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._ready.set)
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+
+class HeadTracker:
+    """Follows the chain head and publishes pool tick changes."""
+
+    def __init__(
+        self,
+        w3: Web3,
+        contracts: ContractRegistry,
+        views: ViewCache,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            w3: Web3 instance
+            contracts: Registry for pool contracts
+            views: View cache (bootstrap reads; told about every head seen)
+            poll_interval: Seconds between head polls
+        """
+        self.w3 = w3
+        self.contracts = contracts
+        self.views = views
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        # Held for a whole poll, so watch() never moves the cursor mid-range
+        self._poll_lock = threading.RLock()
+        # pool address -> {'tick', 'sqrtPriceX96', 'liquidity', 'block_number'}
+        self._states: Dict[str, Dict[str, int]] = {}
+        self._subscriptions: List[HeadSubscription] = []
+        self._callbacks: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._log_handlers: List[Callable[[List[Any], int], None]] = []
+        self._topics: Set[bytes] = {SWAP_TOPIC}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.block_number: Optional[int] = None
+        self.polls = 0
+        self.log_requests = 0
+        self.changes = 0
+
+    def watch(self, pool_addresses: Iterable[str], from_block: Optional[int] = None):
+        """
+        Start tracking pools (their current state is read once, in one multicall).
+
+        Args:
+            pool_addresses: Pool contract addresses
+            from_block: Make sure logs after this block are read (for log
+                handlers that bootstrapped their own state at it)
+        """
+        with self._poll_lock:
+            self._watch(pool_addresses, from_block)
+        self._ensure_thread()
+
+    def _watch(self, pool_addresses: Iterable[str], from_block: Optional[int]):
+        new = [
+            address for address in dict.fromkeys(map(to_checksum_address, pool_addresses))
+            if address not in self._states
+        ]
+        if new:
+            contracts = [self.contracts.pool(address) for address in new]
+            calls = [(contract, name, ()) for contract in contracts for name in ('slot0', 'liquidity')]
+            block_number, results = self.views.aggregate(calls)
+
+            with self._lock:
+                for i, address in enumerate(new):
+                    slot0, liquidity = results[2 * i], results[2 * i + 1]
+                    self._states[address] = {
+                        'tick': slot0[1],
+                        'sqrtPriceX96': slot0[0],
+                        'liquidity': liquidity,
+                        'block_number': block_number
+                    }
+                if self.block_number is None or block_number < self.block_number:
+                    # Logs after the bootstrap block are the first ones applied
+                    self.block_number = block_number
+            log.info(f"Head tracker watching {len(new)} new pools from block {block_number}")
+
+        if from_block is not None:
+            with self._lock:
+                if self.block_number is None or from_block < self.block_number:
+                    self.block_number = from_block
+
+    def unwatch(self, pool_addresses: Iterable[str]):
+        """
+        Stop tracking pools.
+
+        Args:
+            pool_addresses: Pool contract addresses
+        """
+        with self._lock:
+            for address in pool_addresses:
+                self._states.pop(to_checksum_address(address), None)
+
+    def subscribe(self, pools: Optional[Iterable[str]] = None) -> HeadSubscription:
+        """
+        Queue change events for a consumer (the pools are watched).
+
+        Args:
+            pools: Pools to receive events for (default: every watched pool)
+
+        Returns:
+            Subscription to get() or get_async() events from
+        """
+        subscription = HeadSubscription(self, pools)
+        if subscription.pools:
+            self.watch(subscription.pools)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: HeadSubscription):
+        """Stop queueing events for a subscription."""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def on_change(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        """
+        Call back with each batch of changes (from the tracker thread).
+
+        Args:
+            callback: Called with the change events of one poll
+        """
+        self._callbacks.append(callback)
+
+    def paused(self) -> threading.RLock:
+        """
+        Context manager holding off polls, e.g. while registering state
+        that log handlers update together with watch(from_block=...).
+        """
+        return self._poll_lock
+
+    def on_logs(self, callback: Callable[[List[Any], int], None], topics: Iterable[bytes]):
+        """
+        Receive every log of the given topics from watched pools (from the tracker thread).
+
+        Args:
+            callback: Called with the logs of each block range, ordered by
+                block and log index (possibly empty), and the range's last
+                block; pool change events are published after it returns
+            topics: Event topics to fetch in addition to Swap (Swap logs are
+                passed too)
+        """
+        with self._poll_lock:
+            self._topics.update(topics)
+            self._log_handlers.append(callback)
+
+    def get_state(self, pool_address: str) -> Optional[Dict[str, int]]:
+        """
+        Get a watched pool's last known state without an RPC call.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            Dict with tick, sqrtPriceX96, liquidity and block_number, or
+            None if the pool is not watched
+        """
+        state = self._states.get(to_checksum_address(pool_address))
+        return dict(state) if state is not None else None
+
+    def stop(self):
+        """Stop following the head."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Polling statistics."""
+        return {
+            'block_number': self.block_number,
+            'pools': len(self._states),
+            'subscriptions': len(self._subscriptions),
+            'polls': self.polls,
+            'log_requests': self.log_requests,
+            'changes': self.changes
+        }
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='head-tracker', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._poll()
+            except Exception as e:
+                log.warning(f"Head poll failed: {e}")
+            self._stop.wait(max(self.poll_interval - (time.monotonic() - started), 0.0))
+
+    def _poll(self):
+        with self._poll_lock:
+            self._poll_head()
+
+    def _poll_head(self):
+        """Notice a new head and apply the swaps of every block since the last one."""
+        self.polls += 1
+        head = self.w3.eth.block_number
+        self.views.observe_block(head)
+        if self.block_number is None or head <= self.block_number or not self._states:
+            return
+
+        pools = list(self._states)
+        start = self.block_number + 1
+        while start <= head:
+            end = min(start + MAX_LOG_RANGE - 1, head)
+            self.log_requests += 1
+            logs = self.w3.eth.get_logs({
+                'address': pools,
+                'topics': [list(self._topics)],
+                'fromBlock': start,
+                'toBlock': end
+            })
+            logs = sorted(logs, key=lambda entry: (entry['blockNumber'], entry['logIndex']))
+            for handler in self._log_handlers:
+                handler(logs, end)
+            self._apply_swaps([entry for entry in logs if entry['topics'][0] == SWAP_TOPIC], end)
+            start = end + 1
+
+    def _apply_swaps(self, logs: List[Any], to_block: int):
+        """Fold swap logs into pool states and publish pools whose tick moved."""
+        # Only each pool's last swap per block matters
+        latest: Dict[tuple, Any] = {}
+        for entry in logs:
+            latest[(to_checksum_address(entry['address']), entry['blockNumber'])] = entry
+
+        changes = []
+        with self._lock:
+            for (pool, block_number), entry in latest.items():
+                state = self._states.get(pool)
+                if state is None or block_number <= state['block_number']:
+                    continue
+                _, _, sqrt_price_x96, liquidity, tick = self.w3.codec.decode(SWAP_DATA_TYPES, bytes(entry['data']))
+                previous_tick = state['tick']
+                state.update(tick=tick, sqrtPriceX96=sqrt_price_x96, liquidity=liquidity, block_number=block_number)
+                if tick != previous_tick:
+                    changes.append({
+                        'pool': pool,
+                        'block_number': block_number,
+                        'tick': tick,
+                        'previous_tick': previous_tick,
+                        'sqrtPriceX96': sqrt_price_x96,
+                        'liquidity': liquidity
+                    })
+            self.block_number = to_block
+            subscriptions = list(self._subscriptions)
+
+        if not changes:
+            return
+        self.changes += len(changes)
+        log.debug(f"{len(changes)} pools changed up to block {to_block}")
+        for subscription in subscriptions:
+            subscription._put(changes)
+        for callback in self._callbacks:
+            try:
+                callback(changes)
+            except Exception as e:
+                log.error(f"Head tracker callback failed: {e}")
+
+
+# Global head tracker instance
+_head_tracker = None
+
+
+def get_head_tracker() -> HeadTracker:
+    """Get global head tracker instance (on the shared Web3 client)."""
+    global _head_tracker
+    if _head_tracker is None:
+        client = get_web3_client()
+        _head_tracker = HeadTracker(
+            client.w3,
+            client.contracts,
+            client.views,
+            poll_interval=get_config().get('network.head_poll_interval_seconds', DEFAULT_POLL_INTERVAL_SECONDS)
+        )
+    return _head_tracker
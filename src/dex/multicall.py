@@ -0,0 +1,302 @@
+"""
+Multicall3 batching for contract view calls.
+
+Packs many view calls into Multicall3's aggregate3, so a batch costs one
+eth_call instead of one round trip per call. Large batches are split into
+chunks that are all read at the same block.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+from web3.contract import Contract
+
+from .abis import MULTICALL3_ABI
+from ..utils.logger import log
+
+# Multicall3 is deployed at this address on Base (and every other major chain)
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+# Calls per eth_call; keeps requests well under RPC gas and response caps
+DEFAULT_CHUNK_SIZE = 500
+
+# A call is (contract, function name, args in ABI order)
+Call = Tuple[Contract, str, Sequence[Any]]
+
+AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')
+GET_BLOCK_NUMBER_SELECTOR = bytes.fromhex('42cbb15c')
+
+
+class Multicall:
+    """Batched view calls through Multicall3."""
+
+    def __init__(
+        self,
+        w3: Web3,
+        address: str = MULTICALL3_ADDRESS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Initialize multicall reader.
+
+        Args:
+            w3: Web3 instance
+            address: Multicall3 address
+            chunk_size: Maximum calls per eth_call
+        """
+        self.w3 = w3
+        self.contract = w3.eth.contract(
+            address=Web3.to_checksum_address(address),
+            abi=MULTICALL3_ABI
+        )
+        self.chunk_size = chunk_size
+        self._block_number_call = (self.contract.address, False, GET_BLOCK_NUMBER_SELECTOR)
+
+        # (address, function name) -> (selector, input types, output types)
+        self._signatures: Dict[Tuple[str, str], Tuple[bytes, List[str], List[str]]] = {}
+
+    def call(
+        self,
+        calls: List[Call],
+        allow_failure: bool = True,
+        block_identifier: Union[int, str] = 'latest'
+    ) -> List[Any]:
+        """
+        Execute view calls in as few eth_calls as possible.
+
+        Args:
+            calls: (contract, function name, args) tuples
+            allow_failure: Return None for calls that revert (otherwise the
+                whole batch raises)
+            block_identifier: Block to read at
+
+        Returns:
+            Decoded results in call order (single outputs unwrapped, like
+            ContractFunction.call())
+        """
+        _, results = self.aggregate(calls, allow_failure, block_identifier)
+        return results
+
+    def aggregate(
+        self,
+        calls: List[Call],
+        allow_failure: bool = True,
+        block_identifier: Union[int, str] = 'latest'
+    ) -> Tuple[int, List[Any]]:
+        """
+        Execute view calls and report the block they were read at.
+
+        The first chunk also asks Multicall3 for the block number, and the
+        remaining chunks are pinned to it, so the results are consistent
+        even when the batch spans several eth_calls.
+
+        Args:
+            calls: (contract, function name, args) tuples
+            allow_failure: Return None for calls that revert
+            block_identifier: Block to read at
+
+        Returns:
+            (block number, decoded results in call order)
+        """
+        encoded = self._encode_calls(calls, allow_failure)
+
+        raw = self._execute(self._first_chunk(encoded), block_identifier)
+        block_number, raw = self._split_block_number(raw)
+
+        for chunk in self._remaining_chunks(encoded):
+            raw.extend(self._execute(chunk, block_number))
+
+        results = self._decode_results(calls, raw, allow_failure)
+        log.debug(f"Multicall: {len(calls)} calls at block {block_number}")
+        return block_number, results
+
+    def encode_call(self, contract: Contract, fn_name: str, args: Sequence[Any]) -> bytes:
+        """
+        Encode a call's calldata.
+
+        Encoded with the codec directly; ContractFunction encoding is slow
+        enough to dominate large batches.
+
+        Args:
+            contract: Contract
+            fn_name: Function name
+            args: Arguments in ABI order
+
+        Returns:
+            Selector followed by the encoded arguments
+        """
+        selector, input_types, _ = self._get_signature(contract, fn_name)
+        return selector + self.w3.codec.encode(input_types, args)
+
+    def _encode_calls(self, calls: List[Call], allow_failure: bool) -> List[Tuple[str, bool, bytes]]:
+        return [
+            (contract.address, allow_failure, self.encode_call(contract, fn_name, args))
+            for contract, fn_name, args in calls
+        ]
+
+    def _first_chunk(self, encoded: List[Tuple[str, bool, bytes]]) -> List[Tuple[str, bool, bytes]]:
+        return [self._block_number_call] + encoded[:self.chunk_size - 1]
+
+    def _remaining_chunks(self, encoded: List[Tuple[str, bool, bytes]]) -> List[List[Tuple[str, bool, bytes]]]:
+        return [
+            encoded[start:start + self.chunk_size]
+            for start in range(self.chunk_size - 1, len(encoded), self.chunk_size)
+        ]
+
+    def _split_block_number(self, raw: List[Tuple[bool, bytes]]) -> Tuple[int, List[Tuple[bool, bytes]]]:
+        return self.w3.codec.decode(['uint256'], raw[0][1])[0], raw[1:]
+
+    def _decode_results(self, calls: List[Call], raw: List[Tuple[bool, bytes]], allow_failure: bool) -> List[Any]:
+        return [
+            self._decode(contract, fn_name, success, data, allow_failure)
+            for (contract, fn_name, _), (success, data) in zip(calls, raw)
+        ]
+
+    def _execute(self, chunk: List[Tuple[str, bool, bytes]], block_identifier) -> List[Tuple[bool, bytes]]:
+        """Run one aggregate3 eth_call, halving the chunk if the node rejects it."""
+        try:
+            raw = self.w3.eth.call(self._aggregate3_tx(chunk), block_identifier)
+            return self._decode_aggregate3(raw)
+        except Exception as e:
+            if len(chunk) == 1:
+                raise
+            # Oversized requests (gas cap, response size) fail as a whole
+            log.warning(f"Multicall of {len(chunk)} calls failed ({e}), splitting")
+            middle = len(chunk) // 2
+            head = self._execute(chunk[:middle], block_identifier)
+            if chunk[0] is self._block_number_call and not isinstance(block_identifier, int):
+                # Keep the rest of the first chunk on the block the head read
+                block_identifier = self.w3.codec.decode(['uint256'], head[0][1])[0]
+            return head + self._execute(chunk[middle:], block_identifier)
+
+    def _aggregate3_tx(self, chunk: List[Tuple[str, bool, bytes]]) -> Dict[str, Any]:
+        data = AGGREGATE3_SELECTOR + self.w3.codec.encode(['(address,bool,bytes)[]'], [chunk])
+        return {'to': self.contract.address, 'data': data}
+
+    def _decode_aggregate3(self, raw: bytes) -> List[Tuple[bool, bytes]]:
+        return list(self.w3.codec.decode(['(bool,bytes)[]'], raw)[0])
+
+    def _decode(self, contract: Contract, fn_name: str, success: bool, data: bytes, allow_failure: bool) -> Any:
+        if success and data:
+            try:
+                values = self.w3.codec.decode(self._get_signature(contract, fn_name)[2], data)
+                return values[0] if len(values) == 1 else values
+            except Exception as e:
+                error = e
+        else:
+            error = 'reverted' if not success else 'empty return data'
+
+        if not allow_failure:
+            raise ValueError(f"Multicall {fn_name} on {contract.address} failed: {error}")
+        return None
+
+    def _get_signature(self, contract: Contract, fn_name: str) -> Tuple[bytes, List[str], List[str]]:
+        key = (contract.address, fn_name)
+        signature = self._signatures.get(key)
+        if signature is None:
+            fn_abi = contract.get_function_by_name(fn_name).abi
+            signature = (
+                function_abi_to_4byte_selector(fn_abi),
+                [collapse_if_tuple(arg) for arg in fn_abi['inputs']],
+                [collapse_if_tuple(output) for output in fn_abi['outputs']],
+            )
+            self._signatures[key] = signature
+        return signature
+
+
+class AsyncMulticall(Multicall):
+    """Multicall3 batching on an AsyncWeb3 instance."""
+
+    async def call(
+        self,
+        calls: List[Call],
+        allow_failure: bool = True,
+        block_identifier: Union[int, str] = 'latest'
+    ) -> List[Any]:
+        """
+        Execute view calls in as few eth_calls as possible.
+
+        Args:
+            calls: (contract, function name, args) tuples
+            allow_failure: Return None for calls that revert
+            block_identifier: Block to read at
+
+        Returns:
+            Decoded results in call order
+        """
+        _, results = await self.aggregate(calls, allow_failure, block_identifier)
+        return results
+
+    async def aggregate(
+        self,
+        calls: List[Call],
+        allow_failure: bool = True,
+        block_identifier: Union[int, str] = 'latest'
+    ) -> Tuple[int, List[Any]]:
+        """
+        Execute view calls and report the block they were read at.
+
+        Chunks after the first are pinned to the first chunk's block and
+        sent concurrently.
+
+        Args:
+            calls: (contract, function name, args) tuples
+            allow_failure: Return None for calls that revert
+            block_identifier: Block to read at
+
+        Returns:
+            (block number, decoded results in call order)
+        """
+        encoded = self._encode_calls(calls, allow_failure)
+
+        raw = await self._execute(self._first_chunk(encoded), block_identifier)
+        block_number, raw = self._split_block_number(raw)
+
+        chunks = await asyncio.gather(*(
+            self._execute(chunk, block_number) for chunk in self._remaining_chunks(encoded)
+        ))
+        for chunk in chunks:
+            raw.extend(chunk)
+
+        results = self._decode_results(calls, raw, allow_failure)
+        log.debug(f"Multicall: {len(calls)} calls at block {block_number}")
+        return block_number, results
+
+    async def _execute(self, chunk: List[Tuple[str, bool, bytes]], block_identifier) -> List[Tuple[bool, bytes]]:
+        """Run one aggregate3 eth_call, halving the chunk if the node rejects it."""
+        try:
+            raw = await self.w3.eth.call(self._aggregate3_tx(chunk), block_identifier)
+            return self._decode_aggregate3(raw)
+        except Exception as e:
+            if len(chunk) == 1:
+                raise
+            log.warning(f"Multicall of {len(chunk)} calls failed ({e}), splitting")
+            middle = len(chunk) // 2
+            if chunk[0] is self._block_number_call and not isinstance(block_identifier, int):
+                # The tail has to wait for the block the head read
+                head = await self._execute(chunk[:middle], block_identifier)
+                block_identifier = self.w3.codec.decode(['uint256'], head[0][1])[0]
+                return head + await self._execute(chunk[middle:], block_identifier)
+            head, tail = await asyncio.gather(
+                self._execute(chunk[:middle], block_identifier),
+                self._execute(chunk[middle:], block_identifier)
+            )
+            return head + tail
+
+
+# Global multicall instance
+_multicall = None
+
+
+def get_multicall(w3: Optional[Web3] = None) -> Multicall:
+    """Get global multicall instance (on the shared Web3 client by default)."""
+    global _multicall
+    if _multicall is None:
+        if w3 is None:
+            # Imported here: the Web3 client builds its own registry on this module
+            from .web3_client import get_web3_client
+            w3 = get_web3_client().w3
+        _multicall = Multicall(w3)
+    return _multicall
@@ -0,0 +1,193 @@
+"""
+Local nonce allocation per signer.
+
+The chain's pending nonce is fetched once; after that nonces are handed out
+from a local counter, so consecutive transactions (approve, approve, mint)
+can be submitted back-to-back without sleeping or re-reading the count.
+When the node reports a nonce conflict the counter is resynced from the
+chain and the transaction is retried with a fresh nonce.
+
+Allocation only touches local state under a threading lock and never
+awaits while holding it, so one manager can be shared by threads and by
+coroutines.
+"""
+import heapq
+import threading
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from web3 import AsyncWeb3, Web3
+
+from .contracts import to_checksum_address
+from ..utils.logger import log
+
+# Node errors meaning the nonce we used is stale (substrings, lower case)
+NONCE_ERRORS = (
+    'nonce too low',
+    'replacement transaction underpriced',
+    'already known',
+    'nonce has already been used',
+    'invalid nonce',
+)
+
+DEFAULT_MAX_RETRIES = 3
+
+T = TypeVar('T')
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Check whether a send failed because the nonce was already used."""
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+
+class NonceManager:
+    """Hands out nonces for one signer without a round trip per transaction."""
+
+    def __init__(self, address: str):
+        """
+        Initialize nonce manager.
+
+        Args:
+            address: Signer address
+        """
+        self.address = to_checksum_address(address)
+
+        self._lock = threading.Lock()
+        self._next_nonce: Optional[int] = None
+        # Nonces handed out but never broadcast, reused before new ones
+        self._released: List[int] = []
+
+    def next_nonce(self, w3: Web3) -> int:
+        """
+        Allocate the next nonce (fetches the pending count on first use).
+
+        Args:
+            w3: Web3 instance for the initial fetch
+
+        Returns:
+            Nonce
+        """
+        if self._next_nonce is None:
+            self._sync(w3.eth.get_transaction_count(self.address, 'pending'), force=False)
+        return self._allocate()
+
+    async def next_nonce_async(self, w3: AsyncWeb3) -> int:
+        """
+        Allocate the next nonce from a coroutine.
+
+        Args:
+            w3: AsyncWeb3 instance for the initial fetch
+
+        Returns:
+            Nonce
+        """
+        if self._next_nonce is None:
+            self._sync(await w3.eth.get_transaction_count(self.address, 'pending'), force=False)
+        return self._allocate()
+
+    def resync(self, w3: Web3):
+        """Reset the counter to the chain's pending nonce."""
+        self._sync(w3.eth.get_transaction_count(self.address, 'pending'), force=True)
+
+    async def resync_async(self, w3: AsyncWeb3):
+        """Reset the counter to the chain's pending nonce from a coroutine."""
+        self._sync(await w3.eth.get_transaction_count(self.address, 'pending'), force=True)
+
+    def release(self, nonce: int):
+        """
+        Return a nonce whose transaction was never broadcast.
+
+        Args:
+            nonce: Nonce from next_nonce()
+        """
+        with self._lock:
+            if self._next_nonce is None or nonce >= self._next_nonce:
+                return
+            if nonce == self._next_nonce - 1:
+                self._next_nonce = nonce
+            elif nonce not in self._released:
+                # Later nonces are out; this gap must be filled first
+                heapq.heappush(self._released, nonce)
+
+    def send(self, w3: Web3, submit: Callable[[int], T], max_retries: int = DEFAULT_MAX_RETRIES) -> T:
+        """
+        Submit a transaction with an allocated nonce, resyncing on conflicts.
+
+        Args:
+            w3: Web3 instance (for resyncs)
+            submit: Builds, signs and broadcasts the transaction for a nonce
+            max_retries: Resync-and-retry attempts on nonce errors
+
+        Returns:
+            Whatever submit returns (usually the transaction hash)
+        """
+        for attempt in range(max_retries + 1):
+            nonce = self.next_nonce(w3)
+            try:
+                return submit(nonce)
+            except Exception as e:
+                if is_nonce_error(e) and attempt < max_retries:
+                    log.warning(f"Nonce {nonce} rejected for {self.address} ({e}), resyncing")
+                    self.resync(w3)
+                    continue
+                if not is_nonce_error(e):
+                    self.release(nonce)
+                raise
+
+    async def send_async(self, w3: AsyncWeb3, submit: Callable[[int], Any], max_retries: int = DEFAULT_MAX_RETRIES) -> Any:
+        """
+        Submit a transaction from a coroutine (submit returns an awaitable).
+
+        Args:
+            w3: AsyncWeb3 instance (for resyncs)
+            submit: Builds, signs and broadcasts the transaction for a nonce
+            max_retries: Resync-and-retry attempts on nonce errors
+
+        Returns:
+            Whatever submit's awaitable returns
+        """
+        for attempt in range(max_retries + 1):
+            nonce = await self.next_nonce_async(w3)
+            try:
+                return await submit(nonce)
+            except Exception as e:
+                if is_nonce_error(e) and attempt < max_retries:
+                    log.warning(f"Nonce {nonce} rejected for {self.address} ({e}), resyncing")
+                    await self.resync_async(w3)
+                    continue
+                if not is_nonce_error(e):
+                    self.release(nonce)
+                raise
+
+    def _allocate(self) -> int:
+        with self._lock:
+            if self._released:
+                return heapq.heappop(self._released)
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def _sync(self, chain_nonce: int, force: bool):
+        with self._lock:
+            if self._next_nonce is not None and not force:
+                return  # Another caller synced first
+            # The counter now covers every nonce from the chain's onwards
+            self._next_nonce = chain_nonce
+            self._released = []
+            log.debug(f"Nonce for {self.address} synced to {chain_nonce}")
+
+
+# Nonce managers by signer address
+_nonce_managers: Dict[str, NonceManager] = {}
+_nonce_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(address: str) -> NonceManager:
+    """Get the shared nonce manager for a signer."""
+    address = to_checksum_address(address)
+    with _nonce_managers_lock:
+        manager = _nonce_managers.get(address)
+        if manager is None:
+            manager = NonceManager(address)
+            _nonce_managers[address] = manager
+        return manager
@@ -0,0 +1,505 @@
+"""
+In-process mirror of Uniswap V3 pool state, maintained from logs.
+
+Each mirrored pool holds sqrtPriceX96, tick, active liquidity and every
+initialized tick with its liquidityGross and liquidityNet. The state is
+read from the chain once (slot0, liquidity, the whole tickBitmap and the
+initialized ticks, all pinned to one block) and then kept current by
+applying the pool's Swap, Mint and Burn logs, which the head tracker
+fetches together with the logs it already reads. Price, tick and active
+liquidity are then memory reads.
+
+Every checksum interval the pool is read again at the last applied block
+and compared with the mirror; on drift (a missed or misapplied log) the
+fresh read replaces the mirrored state.
+"""
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from web3 import Web3
+
+from .contracts import ContractRegistry, to_checksum_address
+from .head_tracker import SWAP_DATA_TYPES, SWAP_TOPIC, HeadTracker, get_head_tracker
+from .swap_simulator import simulate_swap, solve_swap_to_ratio
+from .web3_client import get_web3_client
+from ..utils.config import get_config
+from ..utils.logger import log
+from ..utils.tick_math import MAX_TICK, MIN_TICK, sqrt_price_x96_to_price
+
+DEFAULT_CHECKSUM_INTERVAL_SECONDS = 300
+
+MINT_TOPIC = Web3.keccak(text='Mint(address,address,int24,int24,uint128,uint256,uint256)')
+BURN_TOPIC = Web3.keccak(text='Burn(address,int24,int24,uint128,uint256,uint256)')
+MINT_DATA_TYPES = ['address', 'uint128', 'uint256', 'uint256']
+BURN_DATA_TYPES = ['uint128', 'uint256', 'uint256']
+
+
+class MirroredPool:
+    """State of one pool as of block_number."""
+
+    def __init__(
+        self,
+        address: str,
+        tick_spacing: int,
+        fee: int,
+        sqrt_price_x96: int,
+        tick: int,
+        liquidity: int,
+        ticks: Dict[int, Tuple[int, int]],
+        block_number: int
+    ):
+        """
+        Initialize pool state.
+
+        Args:
+            address: Pool address
+            tick_spacing: Pool tick spacing
+            fee: Pool fee in hundredths of a bip
+            sqrt_price_x96: Current sqrt price (Q64.96)
+            tick: Current tick
+            liquidity: Active liquidity
+            ticks: Initialized tick -> (liquidityGross, liquidityNet)
+            block_number: Block the state is as of (end of block)
+        """
+        self.address = address
+        self.tick_spacing = tick_spacing
+        self.fee = fee
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.liquidity = liquidity
+        self.ticks = dict(ticks)
+        self.block_number = block_number
+
+        # Sorted initialized ticks, for next_initialized_tick
+        self._sorted_ticks = sorted(self.ticks)
+
+    def apply_swap(self, sqrt_price_x96: int, liquidity: int, tick: int):
+        """Apply a Swap event (it carries the post-swap price, liquidity and tick)."""
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.liquidity = liquidity
+        self.tick = tick
+
+    def apply_liquidity_delta(self, tick_lower: int, tick_upper: int, delta: int):
+        """
+        Apply a Mint (positive delta) or Burn (negative delta), like Pool._modifyPosition.
+
+        Args:
+            tick_lower: Position lower tick
+            tick_upper: Position upper tick
+            delta: Liquidity added (negative if removed)
+        """
+        if delta == 0:
+            return  # Burn of zero: fee poke, no state change we mirror
+        self._update_tick(tick_lower, delta, upper=False)
+        self._update_tick(tick_upper, delta, upper=True)
+        if tick_lower <= self.tick < tick_upper:
+            self.liquidity += delta
+
+    def next_initialized_tick(self, tick: int, lte: bool) -> Optional[int]:
+        """
+        Find the nearest initialized tick in one direction.
+
+        Args:
+            tick: Tick to search from
+            lte: Search at or below tick (price falling) instead of above
+
+        Returns:
+            Initialized tick, or None if there is none that way
+        """
+        if lte:
+            i = bisect.bisect_right(self._sorted_ticks, tick)
+            return self._sorted_ticks[i - 1] if i > 0 else None
+        i = bisect.bisect_right(self._sorted_ticks, tick)
+        return self._sorted_ticks[i] if i < len(self._sorted_ticks) else None
+
+    def next_initialized_tick_within_one_word(self, tick: int, lte: bool) -> Tuple[int, bool]:
+        """
+        Next tick a swap steps to, like TickBitmap.nextInitializedTickWithinOneWord.
+
+        The pool never searches past the current 256-tick bitmap word, so a
+        swap also stops at word boundaries; simulations must split their steps
+        the same way to round like the pool does.
+
+        Args:
+            tick: Current tick
+            lte: Search at or below tick (zeroForOne) instead of above
+
+        Returns:
+            (next tick, whether it is initialized)
+        """
+        compressed = tick // self.tick_spacing
+        if lte:
+            boundary = (compressed >> 8 << 8) * self.tick_spacing
+            found = self.next_initialized_tick(tick, lte=True)
+            if found is not None and found >= boundary:
+                return found, True
+            return boundary, False
+
+        boundary = (((compressed + 1) >> 8 << 8) + 255) * self.tick_spacing
+        found = self.next_initialized_tick(tick, lte=False)
+        if found is not None and found <= boundary:
+            return found, True
+        return boundary, False
+
+    def price(self, decimals0: int = 0, decimals1: int = 0) -> float:
+        """Price of token0 in token1, adjusted for token decimals."""
+        return sqrt_price_x96_to_price(self.sqrt_price_x96, decimals0, decimals1)
+
+    def state(self) -> Dict[str, int]:
+        """Current sqrtPriceX96, tick, liquidity and block_number."""
+        return {
+            'sqrtPriceX96': self.sqrt_price_x96,
+            'tick': self.tick,
+            'liquidity': self.liquidity,
+            'block_number': self.block_number
+        }
+
+    def differences(self, other: 'MirroredPool') -> List[str]:
+        """Describe where this state differs from another read of the same pool."""
+        differences = []
+        for name in ('sqrt_price_x96', 'tick', 'liquidity'):
+            if getattr(self, name) != getattr(other, name):
+                differences.append(f"{name} {getattr(self, name)} != {getattr(other, name)}")
+        for tick in sorted(set(self.ticks) | set(other.ticks)):
+            if self.ticks.get(tick) != other.ticks.get(tick):
+                differences.append(f"tick {tick} {self.ticks.get(tick)} != {other.ticks.get(tick)}")
+        return differences
+
+    def _update_tick(self, tick: int, delta: int, upper: bool):
+        gross, net = self.ticks.get(tick, (0, 0))
+        gross += delta
+        net += -delta if upper else delta
+        if gross == 0:
+            # Flipped to uninitialized
+            del self.ticks[tick]
+            self._sorted_ticks.remove(tick)
+            return
+        if tick not in self.ticks:
+            bisect.insort(self._sorted_ticks, tick)
+        self.ticks[tick] = (gross, net)
+
+
+class PoolMirror:
+    """Mirrors of several pools, fed by the head tracker's log reads."""
+
+    def __init__(
+        self,
+        w3: Web3,
+        contracts: ContractRegistry,
+        tracker: HeadTracker,
+        checksum_interval: float = DEFAULT_CHECKSUM_INTERVAL_SECONDS
+    ):
+        """
+        Initialize mirror.
+
+        Args:
+            w3: Web3 instance
+            contracts: Registry for pool contracts and batched reads
+            tracker: Head tracker delivering the pools' logs
+            checksum_interval: Seconds between comparisons against the chain
+        """
+        self.w3 = w3
+        self.contracts = contracts
+        self.tracker = tracker
+        self.checksum_interval = checksum_interval
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, MirroredPool] = {}
+        self._last_checksum = time.monotonic()
+
+        self.logs_applied = 0
+        self.checksums = 0
+        self.drifts = 0
+
+        tracker.on_logs(self._apply_logs, [MINT_TOPIC, BURN_TOPIC])
+
+    def add(self, pool_addresses: Iterable[str]):
+        """
+        Start mirroring pools (each is read from the chain once).
+
+        Args:
+            pool_addresses: Pool contract addresses
+        """
+        for address in dict.fromkeys(map(to_checksum_address, pool_addresses)):
+            if address in self._pools:
+                continue
+            pool = self._read_pool(address)
+            # Registered between polls, so the logs after the block just read
+            # are all applied from the next one on
+            with self.tracker.paused():
+                with self._lock:
+                    self._pools[address] = pool
+                self.tracker.watch([address], from_block=pool.block_number)
+            log.info(
+                f"Mirroring pool {address} from block {pool.block_number} "
+                f"({len(pool.ticks)} initialized ticks)"
+            )
+
+    def get(self, pool_address: str) -> Optional[MirroredPool]:
+        """
+        Get a mirrored pool.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            MirroredPool (read it, don't modify it), or None if not mirrored
+        """
+        return self._pools.get(to_checksum_address(pool_address))
+
+    def get_state(self, pool_address: str) -> Optional[Dict[str, int]]:
+        """
+        Get a pool's sqrtPriceX96, tick, liquidity and block_number without an RPC call.
+
+        Args:
+            pool_address: Pool contract address
+
+        Returns:
+            State dict, or None if the pool is not mirrored
+        """
+        with self._lock:
+            pool = self.get(pool_address)
+            return pool.state() if pool is not None else None
+
+    def simulate_swap(
+        self,
+        pool_address: str,
+        zero_for_one: bool,
+        amount_specified: int,
+        sqrt_price_limit_x96: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Simulate a swap against a mirrored pool without an RPC call.
+
+        Args:
+            pool_address: Pool contract address
+            zero_for_one: Swap token0 in for token1 out
+            amount_specified: Exact input if positive, exact output if negative
+            sqrt_price_limit_x96: Price the swap may not pass (default: none)
+
+        Returns:
+            Result of swap_simulator.simulate_swap, or None if the pool is
+            not mirrored
+        """
+        return self._with_pool(pool_address, simulate_swap, zero_for_one, amount_specified, sqrt_price_limit_x96)
+
+    def solve_swap_to_ratio(
+        self,
+        pool_address: str,
+        tick_lower: int,
+        tick_upper: int,
+        amount0: int,
+        amount1: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the swap after which a mint in the range uses all of both amounts.
+
+        Args:
+            pool_address: Pool contract address
+            tick_lower: Lower tick of the range to mint
+            tick_upper: Upper tick of the range to mint
+            amount0: Token0 available (raw units)
+            amount1: Token1 available (raw units)
+
+        Returns:
+            Result of swap_simulator.solve_swap_to_ratio, or None if the pool
+            is not mirrored
+        """
+        return self._with_pool(pool_address, solve_swap_to_ratio, tick_lower, tick_upper, amount0, amount1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Mirror statistics."""
+        return {
+            'pools': {
+                address: {'block_number': pool.block_number, 'initialized_ticks': len(pool.ticks)}
+                for address, pool in self._pools.items()
+            },
+            'logs_applied': self.logs_applied,
+            'checksums': self.checksums,
+            'drifts': self.drifts
+        }
+
+    def _with_pool(self, pool_address: str, fn: Callable, *args) -> Any:
+        """Call fn(pool, *args) with the pool held still, or return None if it isn't mirrored."""
+        with self._lock:
+            pool = self.get(pool_address)
+            return fn(pool, *args) if pool is not None else None
+
+    def _apply_logs(self, logs: List[Any], to_block: int):
+        """Apply a block range's logs (tracker thread), then checksum if due."""
+        with self._lock:
+            for entry in logs:
+                pool = self._pools.get(to_checksum_address(entry['address']))
+                if pool is None or entry['blockNumber'] <= pool.block_number:
+                    continue
+                self._apply_log(pool, entry)
+                self.logs_applied += 1
+            for pool in self._pools.values():
+                pool.block_number = max(pool.block_number, to_block)
+
+        if self._pools and time.monotonic() - self._last_checksum >= self.checksum_interval:
+            self._last_checksum = time.monotonic()
+            self._checksum(to_block)
+
+    def _apply_log(self, pool: MirroredPool, entry: Any):
+        topic = entry['topics'][0]
+        data = bytes(entry['data'])
+        if topic == SWAP_TOPIC:
+            _, _, sqrt_price_x96, liquidity, tick = self.w3.codec.decode(SWAP_DATA_TYPES, data)
+            pool.apply_swap(sqrt_price_x96, liquidity, tick)
+            return
+
+        # Mint and Burn index (owner, tickLower, tickUpper)
+        tick_lower = self.w3.codec.decode(['int24'], bytes(entry['topics'][2]))[0]
+        tick_upper = self.w3.codec.decode(['int24'], bytes(entry['topics'][3]))[0]
+        if topic == MINT_TOPIC:
+            amount = self.w3.codec.decode(MINT_DATA_TYPES, data)[1]
+            pool.apply_liquidity_delta(tick_lower, tick_upper, amount)
+        elif topic == BURN_TOPIC:
+            amount = self.w3.codec.decode(BURN_DATA_TYPES, data)[0]
+            pool.apply_liquidity_delta(tick_lower, tick_upper, -amount)
+
+    def _checksum(self, block_number: int):
+        """Compare every mirrored pool with the chain at block_number, replacing drifted ones."""
+        self.checksums += 1
+        for address, pool in list(self._pools.items()):
+            try:
+                chain = self._read_pool(address, block_number)
+            except Exception as e:
+                log.warning(f"Checksum read of pool {address} failed: {e}")
+                continue
+
+            differences = pool.differences(chain)
+            if differences:
+                self.drifts += 1
+                log.warning(
+                    f"Pool mirror {address} drifted at block {block_number} "
+                    f"({len(differences)} differences, first: {differences[0]}); reloaded"
+                )
+                with self._lock:
+                    self._pools[address] = chain
+            else:
+                log.debug(f"Pool mirror {address} matches the chain at block {block_number}")
+
+    def _read_pool(self, address: str, block_number: Any = 'latest') -> MirroredPool:
+        """Read a pool's full state at one block (two or three batched reads)."""
+        contract = self.contracts.pool(address)
+        multicall = self.contracts.multicall
+        immutables = self.contracts.get_pool_immutables(address)
+        tick_spacing = immutables['tickSpacing']
+
+        # Every bitmap word a tick of this spacing can be in
+        min_word = (MIN_TICK // tick_spacing) >> 8
+        max_word = (MAX_TICK // tick_spacing) >> 8
+        words = list(range(min_word, max_word + 1))
+        calls = [(contract, 'slot0', ()), (contract, 'liquidity', ())]
+        calls += [(contract, 'tickBitmap', (word,)) for word in words]
+        block_number, results = multicall.aggregate(calls, allow_failure=False, block_identifier=block_number)
+        slot0, liquidity, bitmap = results[0], results[1], results[2:]
+
+        initialized = [
+            ((word << 8) + bit) * tick_spacing
+            for word, bits in zip(words, bitmap) if bits
+            for bit in range(256) if bits >> bit & 1
+        ]
+        tick_infos = multicall.call(
+            [(contract, 'ticks', (tick,)) for tick in initialized],
+            allow_failure=False,
+            block_identifier=block_number
+        ) if initialized else []
+
+        return MirroredPool(
+            address,
+            tick_spacing,
+            immutables['fee'],
+            sqrt_price_x96=slot0[0],
+            tick=slot0[1],
+            liquidity=liquidity,
+            ticks={tick: (info[0], info[1]) for tick, info in zip(initialized, tick_infos)},
+            block_number=block_number
+        )
+
+
+# Global pool mirror instance
+_pool_mirror = None
+
+
+def get_pool_mirror() -> PoolMirror:
+    """Get global pool mirror, mirroring the enabled pools in pools.yaml."""
+    global _pool_mirror
+    if _pool_mirror is None:
+        config = get_config()
+        client = get_web3_client()
+        mirror = PoolMirror(
+            client.w3,
+            client.contracts,
+            get_head_tracker(),
+            checksum_interval=config.get('data.pool_mirror_checksum_seconds', DEFAULT_CHECKSUM_INTERVAL_SECONDS)
+        )
+        mirror.add(pool['address'] for pool in config.get_enabled_pools())
+        _pool_mirror = mirror
+    return _pool_mirror
+
+
+def simulate_mirrored_swap(
+    pool_address: str,
+    zero_for_one: bool,
+    amount_specified: int,
+    sqrt_price_limit_x96: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Simulate a swap if a pool mirror is running and mirrors the pool (never starts one).
+
+    Args:
+        pool_address: Pool contract address
+        zero_for_one: Swap token0 in for token1 out
+        amount_specified: Exact input if positive, exact output if negative
+        sqrt_price_limit_x96: Price the swap may not pass (default: none)
+
+    Returns:
+        Simulation result, or None if the pool is not mirrored
+    """
+    if _pool_mirror is None:
+        return None
+    return _pool_mirror.simulate_swap(pool_address, zero_for_one, amount_specified, sqrt_price_limit_x96)
+
+
+def solve_mirrored_swap_to_ratio(
+    pool_address: str,
+    tick_lower: int,
+    tick_upper: int,
+    amount0: int,
+    amount1: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Solve a swap-to-ratio if a pool mirror is running and mirrors the pool (never starts one).
+
+    Args:
+        pool_address: Pool contract address
+        tick_lower: Lower tick of the range to mint
+        tick_upper: Upper tick of the range to mint
+        amount0: Token0 available (raw units)
+        amount1: Token1 available (raw units)
+
+    Returns:
+        Solver result, or None if the pool is not mirrored
+    """
+    if _pool_mirror is None:
+        return None
+    return _pool_mirror.solve_swap_to_ratio(pool_address, tick_lower, tick_upper, amount0, amount1)
+
+
+def get_mirrored_state(pool_address: str) -> Optional[Dict[str, int]]:
+    """
+    Get a pool's mirrored state if a pool mirror is running (never starts one).
+
+    Args:
+        pool_address: Pool contract address
+
+    Returns:
+        Dict with sqrtPriceX96, tick, liquidity and block_number, or None
+        if no mirror is running or it doesn't mirror the pool
+    """
+    return _pool_mirror.get_state(pool_address) if _pool_mirror is not None else None
@@ -0,0 +1,291 @@
+"""
+Batched confirmation tracking for in-flight transactions.
+
+wait_for_transaction_receipt polls one hash at a time and blocks its
+caller. The tracker keeps every pending hash in one place and polls them
+together: a single JSON-RPC batch request (eth_blockNumber plus one
+eth_getTransactionReceipt per hash) about once per block, from a
+background thread. Each tracked hash gets a Future that resolves with the
+formatted receipt (or TimeExhausted), so one executor can keep dozens of
+transactions in flight and collect them as they land.
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+
+from ..utils.logger import log
+
+# Base produces a block every 2 seconds
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+DEFAULT_TIMEOUT_SECONDS = 120
+
+# Receipts per batch request; providers cap batch sizes
+DEFAULT_BATCH_SIZE = 100
+
+# Resolved hashes remembered for status()
+RESOLVED_HISTORY = 10000
+
+
+class ReceiptTracker:
+    """Polls receipts of many pending transactions in one batched request."""
+
+    def __init__(
+        self,
+        w3: Web3,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_block: Optional[Callable[[int], None]] = None
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            w3: Web3 instance on an HTTP provider (batches go to its endpoint)
+                or an RPCPoolProvider (batches are routed by the pool)
+            poll_interval: Seconds between polls (about one block)
+            timeout: Default seconds before a transaction times out
+            batch_size: Maximum receipts requested per HTTP request
+            on_block: Called with the head block number each poll reads
+                (from the polling thread)
+        """
+        self.w3 = w3
+        self.endpoint_uri = str(w3.provider.endpoint_uri)
+        # RPCPoolProvider routes and rate-limits batches itself
+        self._provider_batch = getattr(w3.provider, 'make_batch_request', None)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.on_block = on_block
+
+        self._session = requests.Session()
+        self._session.headers.update(w3.provider.get_request_headers())
+        self._ids = itertools.count()
+
+        self._condition = threading.Condition()
+        # tx hash -> {'future', 'deadline', 'callbacks', 'submitted'}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # tx hash -> 'confirmed' | 'failed' | 'timed_out'
+        self._resolved: 'OrderedDict[str, str]' = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+
+        self.block_number: Optional[int] = None
+        self.polls = 0
+        self.requests = 0
+
+    def track(
+        self,
+        tx_hash: str,
+        callback: Optional[Callable[[AttributeDict], None]] = None,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Start tracking a transaction.
+
+        Args:
+            tx_hash: Transaction hash
+            callback: Called with the receipt when it lands (from the
+                polling thread; not called on timeout)
+            timeout: Seconds before the Future fails with TimeExhausted
+                (default: tracker timeout)
+
+        Returns:
+            Future resolving to the receipt; use asyncio.wrap_future() to
+            await it from a coroutine
+        """
+        tx_hash = self._normalize(tx_hash)
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+
+        with self._condition:
+            entry = self._pending.get(tx_hash)
+            if entry is None:
+                entry = {'future': Future(), 'deadline': deadline, 'callbacks': [], 'submitted': time.monotonic()}
+                self._pending[tx_hash] = entry
+                self._ensure_thread()
+                self._condition.notify()
+            else:
+                # Tracked twice: keep the later deadline, share the Future
+                entry['deadline'] = max(entry['deadline'], deadline)
+            if callback is not None:
+                entry['callbacks'].append(callback)
+            return entry['future']
+
+    def wait(self, tx_hash: str, timeout: Optional[float] = None) -> AttributeDict:
+        """
+        Block until a transaction's receipt lands.
+
+        Args:
+            tx_hash: Transaction hash
+            timeout: Seconds to wait (default: tracker timeout)
+
+        Returns:
+            Transaction receipt
+
+        Raises:
+            TimeExhausted: If no receipt arrived in time
+        """
+        return self.track(tx_hash, timeout=timeout).result()
+
+    def wait_all(self, tx_hashes: List[str], timeout: Optional[float] = None) -> List[AttributeDict]:
+        """
+        Block until every transaction's receipt lands (polled together).
+
+        Args:
+            tx_hashes: Transaction hashes
+            timeout: Seconds to wait for each (default: tracker timeout)
+
+        Returns:
+            Receipts in the order of tx_hashes
+
+        Raises:
+            TimeExhausted: If any receipt did not arrive in time
+        """
+        futures = [self.track(tx_hash, timeout=timeout) for tx_hash in tx_hashes]
+        return [future.result() for future in futures]
+
+    def status(self, tx_hash: Optional[str] = None) -> Any:
+        """
+        Report tracking status.
+
+        Args:
+            tx_hash: Transaction to report on (default: summary of all)
+
+        Returns:
+            For a hash: 'pending', 'confirmed', 'failed', 'timed_out' or
+            'unknown'. Otherwise a dict of counts and poll statistics.
+        """
+        with self._condition:
+            if tx_hash is not None:
+                tx_hash = self._normalize(tx_hash)
+                if tx_hash in self._pending:
+                    return 'pending'
+                return self._resolved.get(tx_hash, 'unknown')
+
+            summary = {'pending': len(self._pending), 'confirmed': 0, 'failed': 0, 'timed_out': 0}
+            for state in self._resolved.values():
+                summary[state] += 1
+            summary.update({
+                'block_number': self.block_number,
+                'polls': self.polls,
+                'requests': self.requests
+            })
+            return summary
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='receipt-tracker', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                hashes = list(self._pending)
+
+            try:
+                self._poll(hashes)
+            except Exception as e:
+                log.warning(f"Receipt poll of {len(hashes)} transactions failed: {e}")
+
+            # Wake for the next block, or earlier if a deadline comes first
+            next_deadline = self._expire()
+            time.sleep(max(min(self.poll_interval, next_deadline - time.monotonic()), 0.05))
+
+    def _poll(self, hashes: List[str]):
+        """One round: every pending receipt, in as few batch requests as the batch size allows."""
+        self.polls += 1
+        for start in range(0, len(hashes), self.batch_size):
+            chunk = hashes[start:start + self.batch_size]
+            calls = [('eth_getTransactionReceipt', [tx_hash]) for tx_hash in chunk]
+            if start == 0:
+                calls.append(('eth_blockNumber', []))
+
+            results = self._batch_request(calls)
+
+            if start == 0 and results[-1] is not None:
+                self.block_number = int(results[-1], 16)
+                if self.on_block is not None:
+                    self.on_block(self.block_number)
+            for tx_hash, raw in zip(chunk, results):
+                if raw is not None:
+                    self._resolve(tx_hash, AttributeDict.recursive(receipt_formatter(raw)))
+
+    def _batch_request(self, calls: List[tuple]) -> List[Any]:
+        """Send calls as one JSON-RPC batch; results in call order (None for errors)."""
+        self.requests += 1
+        if self._provider_batch is not None:
+            # Already matched to calls by the pool
+            responses = self._provider_batch(calls)
+        else:
+            ids = [next(self._ids) for _ in calls]
+            payload = [
+                {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': request_id}
+                for request_id, (method, params) in zip(ids, calls)
+            ]
+            response = self._session.post(self.endpoint_uri, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+
+            # Responses to a batch may come back in any order
+            by_id = {item.get('id'): item for item in response.json()}
+            responses = [by_id.get(request_id, {}) for request_id in ids]
+
+        for item in responses:
+            if 'error' in item:
+                log.debug(f"Batched RPC error: {item['error']}")
+        return [item.get('result') for item in responses]
+
+    def _resolve(self, tx_hash: str, receipt: AttributeDict):
+        with self._condition:
+            entry = self._pending.pop(tx_hash, None)
+            if entry is None:
+                return
+            self._remember(tx_hash, 'confirmed' if receipt['status'] == 1 else 'failed')
+
+        log.debug(f"Receipt for {tx_hash} after {time.monotonic() - entry['submitted']:.1f}s")
+        entry['future'].set_result(receipt)
+        for callback in entry['callbacks']:
+            try:
+                callback(receipt)
+            except Exception as e:
+                log.error(f"Receipt callback for {tx_hash} failed: {e}")
+
+    def _expire(self) -> float:
+        """Fail timed-out entries; returns the earliest remaining deadline."""
+        now = time.monotonic()
+        with self._condition:
+            expired = [tx_hash for tx_hash, entry in self._pending.items() if entry['deadline'] <= now]
+            entries = [self._pending.pop(tx_hash) for tx_hash in expired]
+            for tx_hash in expired:
+                self._remember(tx_hash, 'timed_out')
+            next_deadline = min((entry['deadline'] for entry in self._pending.values()), default=float('inf'))
+
+        for tx_hash, entry in zip(expired, entries):
+            log.warning(f"Transaction {tx_hash} not confirmed in time")
+            entry['future'].set_exception(TimeExhausted(
+                f"Transaction {tx_hash} is not in the chain after "
+                f"{now - entry['submitted']:.1f} seconds"
+            ))
+
+        return next_deadline
+
+    def _remember(self, tx_hash: str, state: str):
+        self._resolved[tx_hash] = state
+        while len(self._resolved) > RESOLVED_HISTORY:
+            self._resolved.popitem(last=False)
+
+    @staticmethod
+    def _normalize(tx_hash) -> str:
+        if isinstance(tx_hash, (bytes, bytearray)):
+            tx_hash = '0x' + bytes(tx_hash).hex()
+        tx_hash = tx_hash.lower()
+        return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
@@ -0,0 +1,439 @@
+"""
+Multi-endpoint RPC pool with rate limits, latency-aware routing and failover.
+
+Each endpoint has its own requests-per-second token bucket and keeps an
+exponentially weighted moving average (EWMA) of its latency and error
+rate. A call goes to the healthy endpoint with the lowest expected cost
+(latency, penalized by errors, plus any wait for a rate-limit token).
+Connection errors, timeouts, HTTP 429/5xx and rate-limit JSON-RPC errors
+are retried on the next best endpoint; rate limits and repeated failures
+also put the endpoint in an exponentially growing cooldown. Other JSON-RPC errors (reverts, nonce
+errors) are answers, not endpoint failures, and are returned as they are.
+
+RPCPoolProvider is the synchronous web3 provider; the async one lives in
+async_web3_client. Stats for every pool in the process are available
+from get_rpc_pool_stats().
+"""
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+from web3.providers.rpc import HTTPProvider
+from web3.types import RPCResponse
+
+from ..utils.logger import log
+
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 30
+
+# Weight of the newest sample in the latency and error-rate averages
+EWMA_ALPHA = 0.2
+
+# An endpoint failing every call costs this many times its latency
+ERROR_PENALTY = 10.0
+
+# The error rate also halves every this many seconds, so an endpoint that
+# stopped getting traffic after failing is eventually tried again
+ERROR_HALF_LIFE_SECONDS = 10.0
+
+# Cooldown after being rate limited or failing twice in a row, doubled per
+# further consecutive failure (a single failure only raises the error rate)
+COOLDOWN_AFTER_FAILURES = 2
+BASE_COOLDOWN_SECONDS = 1.0
+MAX_COOLDOWN_SECONDS = 60.0
+
+# JSON-RPC errors meaning the endpoint is overloaded, not that the call is bad
+RATE_LIMIT_CODES = (-32005, 429)
+RATE_LIMIT_ERRORS = (
+    'rate limit',
+    'too many requests',
+    'limit exceeded',
+    'exceeded the quota',
+    'capacity',
+    'try again later',
+)
+
+
+class TokenBucket:
+    """Requests-per-second limiter; reserving may go into debt and returns the wait."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket size (default: one second of tokens)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until tokens would be available (without reserving them)."""
+        with self._lock:
+            self._refill()
+            return max(tokens - self._tokens, 0.0) / self.rate
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, borrowing against future refills if needed.
+
+        Args:
+            tokens: Tokens to take (capped at the bucket size)
+
+        Returns:
+            Seconds the caller must wait before using them
+        """
+        tokens = min(tokens, self.burst)
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(-self._tokens, 0.0) / self.rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RPCEndpoint:
+    """One RPC URL with its rate limit and health statistics."""
+
+    def __init__(
+        self,
+        url: str,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: Optional[float] = None,
+        name: Optional[str] = None
+    ):
+        """
+        Initialize endpoint.
+
+        Args:
+            url: HTTP(S) RPC URL
+            requests_per_second: Rate limit of the endpoint
+            burst: Requests allowed at once (default: one second's worth)
+            name: Label for stats (default: the URL's host; paths often hold API keys)
+        """
+        self.url = url
+        self.name = name or urlsplit(url).netloc or url
+        self.bucket = TokenBucket(requests_per_second, burst)
+
+        self._lock = threading.Lock()
+        self.latency: Optional[float] = None  # EWMA, seconds
+        self._error_rate = 0.0                # EWMA of failures (0-1), as of _error_time
+        self._error_time = time.monotonic()
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the endpoint is out of cooldown."""
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def error_rate(self) -> float:
+        """Recent share of failed calls (0-1), decayed over time."""
+        return self._error_rate * 0.5 ** ((time.monotonic() - self._error_time) / ERROR_HALF_LIFE_SECONDS)
+
+    def cost(self) -> float:
+        """Expected seconds for a call: latency penalized by errors, plus rate-limit wait."""
+        latency = self.latency if self.latency is not None else 0.0
+        return latency * (1 + ERROR_PENALTY * self.error_rate) + self.bucket.wait_time()
+
+    def record_success(self, latency: float):
+        """Update statistics after a successful call."""
+        with self._lock:
+            self.requests += 1
+            self.latency = latency if self.latency is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+            )
+            self._set_error_rate(self.error_rate * (1 - EWMA_ALPHA))
+            self.consecutive_failures = 0
+
+    def record_failure(self, error: Any, rate_limited: bool = False):
+        """Update statistics after a failed call, starting a cooldown if it keeps failing."""
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            if rate_limited:
+                self.rate_limited += 1
+            self._set_error_rate(EWMA_ALPHA + (1 - EWMA_ALPHA) * self.error_rate)
+            self.consecutive_failures += 1
+            self.last_error = str(error)[:200]
+
+            strikes = self.consecutive_failures - (1 if rate_limited else COOLDOWN_AFTER_FAILURES)
+            if strikes < 0:
+                log.debug(f"RPC endpoint {self.name} failed ({error})")
+                return
+            cooldown = min(BASE_COOLDOWN_SECONDS * 2 ** strikes, MAX_COOLDOWN_SECONDS)
+            self.cooldown_until = time.monotonic() + cooldown
+        log.warning(f"RPC endpoint {self.name} failed ({error}), cooling down {cooldown:.0f}s")
+
+    def _set_error_rate(self, error_rate: float):
+        self._error_rate = error_rate
+        self._error_time = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistics for dashboards."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'healthy': self.healthy,
+                'cooldown_seconds': round(max(self.cooldown_until - time.monotonic(), 0.0), 2),
+                'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+                'error_rate': round(self.error_rate, 4),
+                'requests': self.requests,
+                'failures': self.failures,
+                'rate_limited': self.rate_limited,
+                'requests_per_second': self.bucket.rate,
+                'last_error': self.last_error
+            }
+
+
+class RPCPool:
+    """Routing and health bookkeeping shared by the sync and async providers."""
+
+    def __init__(self, endpoints: List[RPCEndpoint]):
+        """
+        Initialize pool.
+
+        Args:
+            endpoints: Endpoints to route between
+        """
+        if not endpoints:
+            raise ValueError("RPC pool needs at least one endpoint")
+        self.endpoints = endpoints
+        _pools.add(self)
+
+    def select(self, exclude: Tuple[RPCEndpoint, ...] = ()) -> Tuple[RPCEndpoint, float]:
+        """
+        Pick the endpoint for the next call and reserve a rate-limit token on it.
+
+        Args:
+            exclude: Endpoints already tried for this call
+
+        Returns:
+            (endpoint, seconds to wait before calling it)
+        """
+        candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude] or self.endpoints
+        healthy = [endpoint for endpoint in candidates if endpoint.healthy]
+        if healthy:
+            endpoint = min(healthy, key=lambda endpoint: endpoint.cost())
+        else:
+            # Everything is cooling down: use whichever recovers first
+            endpoint = min(candidates, key=lambda endpoint: endpoint.cooldown_until)
+        return endpoint, endpoint.bucket.reserve()
+
+    def best(self) -> RPCEndpoint:
+        """The endpoint the next call would go to (nothing reserved)."""
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+        return min(healthy, key=lambda endpoint: endpoint.cost()) if healthy else self.endpoints[0]
+
+    @staticmethod
+    def failover_error(response: RPCResponse) -> Optional[str]:
+        """Return the error of a response that should be retried elsewhere, if any."""
+        error = response.get('error') if isinstance(response, dict) else None
+        if not error:
+            return None
+        if isinstance(error, dict):
+            code, message = error.get('code'), str(error.get('message', ''))
+        else:
+            code, message = None, str(error)
+        if code in RATE_LIMIT_CODES or any(pattern in message.lower() for pattern in RATE_LIMIT_ERRORS):
+            return message or str(code)
+        return None
+
+    @staticmethod
+    def already_sent(method: str, params: Any, response: RPCResponse) -> Optional[RPCResponse]:
+        """
+        Turn "already known" from a failover resend into the original success.
+
+        A send that timed out may still have reached the first endpoint;
+        reporting the resend as an error would make the nonce manager
+        sign a second transaction.
+        """
+        if method != 'eth_sendRawTransaction' or 'error' not in response:
+            return None
+        if 'already known' not in str(response['error']).lower():
+            return None
+        return {'jsonrpc': '2.0', 'id': response.get('id'), 'result': Web3.keccak(HexBytes(params[0])).hex()}
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint statistics."""
+        return [endpoint.stats() for endpoint in self.endpoints]
+
+
+# Every pool in the process, for get_rpc_pool_stats()
+_pools: 'weakref.WeakSet[RPCPool]' = weakref.WeakSet()
+
+
+class RPCPoolProvider(JSONBaseProvider):
+    """Synchronous web3 provider routing each request through an RPCPool."""
+
+    def __init__(self, endpoints: List[RPCEndpoint], timeout: float = DEFAULT_REQUEST_TIMEOUT_SECONDS):
+        """
+        Initialize provider.
+
+        Args:
+            endpoints: Endpoints to route between
+            timeout: Per-request timeout in seconds
+        """
+        super().__init__()
+        self.pool = RPCPool(endpoints)
+        self.timeout = timeout
+        self._providers = {
+            endpoint: HTTPProvider(endpoint.url, request_kwargs={'timeout': timeout})
+            for endpoint in endpoints
+        }
+        self._sessions: Dict[RPCEndpoint, requests.Session] = {}
+
+    @property
+    def endpoint_uri(self) -> str:
+        """URL of the currently preferred endpoint."""
+        return self.pool.best().url
+
+    def make_request(self, method: str, params: Any) -> RPCResponse:
+        tried: Tuple[RPCEndpoint, ...] = ()
+        error: Any = None
+        for attempt in range(len(self.pool.endpoints)):
+            endpoint, wait = self.pool.select(tried)
+            tried += (endpoint,)
+            if wait > 0:
+                time.sleep(wait)
+
+            start = time.monotonic()
+            try:
+                response = self._providers[endpoint].make_request(method, params)
+            except (requests.RequestException, OSError) as e:
+                error = e
+                endpoint.record_failure(e, rate_limited=self._is_rate_limited(e))
+                continue
+
+            rate_limit = self.pool.failover_error(response)
+            if rate_limit is not None:
+                error = rate_limit
+                endpoint.record_failure(rate_limit, rate_limited=True)
+                continue
+
+            endpoint.record_success(time.monotonic() - start)
+            if attempt > 0:
+                return self.pool.already_sent(method, params, response) or response
+            return response
+
+        raise ConnectionError(f"All {len(self.pool.endpoints)} RPC endpoints failed for {method}: {error}")
+
+    def make_batch_request(self, calls: List[Tuple[str, Any]]) -> List[RPCResponse]:
+        """
+        Send several calls as one JSON-RPC batch (routed and failed over as a whole).
+
+        Args:
+            calls: (method, params) tuples
+
+        Returns:
+            Responses in call order
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': next(self.request_counter)}
+            for method, params in calls
+        ]
+        tried: Tuple[RPCEndpoint, ...] = ()
+        error: Any = None
+        for _ in range(len(self.pool.endpoints)):
+            endpoint, wait = self.pool.select(tried)
+            tried += (endpoint,)
+            # Providers bill each call of a batch; take a token per call
+            wait = max(wait, endpoint.bucket.reserve(len(calls) - 1)) if len(calls) > 1 else wait
+            if wait > 0:
+                time.sleep(wait)
+
+            start = time.monotonic()
+            try:
+                response = self._session(endpoint).post(endpoint.url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                results = response.json()
+            except (requests.RequestException, OSError, ValueError) as e:
+                error = e
+                endpoint.record_failure(e, rate_limited=self._is_rate_limited(e))
+                continue
+
+            if not isinstance(results, list):
+                # Whole batch rejected (e.g. a rate-limit error object)
+                error = results
+                endpoint.record_failure(results, rate_limited=self.pool.failover_error(results) is not None)
+                continue
+
+            endpoint.record_success(time.monotonic() - start)
+            by_id = {item.get('id'): item for item in results}
+            return [by_id.get(call['id'], {'error': 'missing from batch response'}) for call in payload]
+
+        raise ConnectionError(f"All {len(self.pool.endpoints)} RPC endpoints failed for a batch: {error}")
+
+    def _session(self, endpoint: RPCEndpoint) -> requests.Session:
+        session = self._sessions.get(endpoint)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.get_request_headers())
+            self._sessions[endpoint] = session
+        return session
+
+    @staticmethod
+    def get_request_headers() -> Dict[str, str]:
+        return {'Content-Type': 'application/json'}
+
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        response = getattr(error, 'response', None)
+        return response is not None and response.status_code == 429
+
+
+def build_rpc_endpoints(entries: Any) -> List[RPCEndpoint]:
+    """
+    Build endpoints from config (network.rpc_endpoints).
+
+    Args:
+        entries: List of URLs or {url, requests_per_second, burst, name}
+            dicts, or a comma-separated string of URLs. Entries whose URL is
+            an unset ${VAR} are skipped.
+
+    Returns:
+        Endpoints (empty if none are configured)
+    """
+    if not entries:
+        return []
+    if isinstance(entries, str):
+        entries = [url.strip() for url in entries.split(',')]
+
+    endpoints = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'url': entry}
+        url = str(entry.get('url') or '')
+        if not url or url.startswith('${'):
+            continue
+        endpoints.append(RPCEndpoint(
+            url,
+            requests_per_second=float(entry.get('requests_per_second', DEFAULT_REQUESTS_PER_SECOND)),
+            burst=entry.get('burst'),
+            name=entry.get('name')
+        ))
+    return endpoints
+
+
+def get_rpc_pool_stats() -> List[List[Dict[str, Any]]]:
+    """Per-endpoint statistics of every RPC pool in this process."""
+    return [pool.stats() for pool in list(_pools)]
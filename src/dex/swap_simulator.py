@@ -0,0 +1,221 @@
+"""
+Offline Uniswap V3 swap simulation over mirrored pool state.
+
+Replays UniswapV3Pool.swap step by step on a MirroredPool: each step swaps
+up to the next initialized tick (or bitmap word boundary) with the exact
+SwapMath/SqrtPriceMath integer port, and crossing an initialized tick
+applies its liquidityNet. The result matches what the pool (and so the
+on-chain Quoter) would return at the mirrored block, without an RPC call.
+
+solve_swap_to_ratio builds on it to size the swap before a mint: it
+searches for the input that leaves balances in exactly the ratio the new
+range takes at the post-swap price, so one swap and one mint use all the
+capital.
+"""
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..utils.tick_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    compute_swap_step,
+    get_liquidity_for_amount0,
+    get_liquidity_for_amount1,
+    get_liquidity_for_amounts,
+    get_mint_amounts,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+)
+
+if TYPE_CHECKING:
+    from .pool_mirror import MirroredPool
+
+
+def simulate_swap(
+    pool: 'MirroredPool',
+    zero_for_one: bool,
+    amount_specified: int,
+    sqrt_price_limit_x96: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Simulate a swap against a pool's current state without changing it.
+
+    Args:
+        pool: Mirrored pool state
+        zero_for_one: Swap token0 in for token1 out (price falls)
+        amount_specified: Exact input amount if positive, exact output
+            amount if negative (raw token units)
+        sqrt_price_limit_x96: Price the swap may not pass (default: none)
+
+    Returns:
+        Dict with amount_in (including fee), amount_out, fee_amount, the
+        ending sqrtPriceX96, tick and liquidity, ticks_crossed,
+        price_impact (relative move of the pool price) and block_number
+
+    Raises:
+        ValueError: If amount_specified is zero or the price limit is on
+            the wrong side of the current price
+    """
+    if amount_specified == 0:
+        raise ValueError("Swap amount must not be zero")
+
+    if sqrt_price_limit_x96 is None:
+        sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+    if zero_for_one:
+        if not MIN_SQRT_RATIO < sqrt_price_limit_x96 < pool.sqrt_price_x96:
+            raise ValueError(f"Price limit {sqrt_price_limit_x96} must be below the current price")
+    elif not pool.sqrt_price_x96 < sqrt_price_limit_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"Price limit {sqrt_price_limit_x96} must be above the current price")
+
+    exact_input = amount_specified > 0
+    remaining = amount_specified
+    amount_in = amount_out = fee_total = 0
+    sqrt_price_x96 = pool.sqrt_price_x96
+    tick = pool.tick
+    liquidity = pool.liquidity
+    ticks_crossed = 0
+
+    while remaining != 0 and sqrt_price_x96 != sqrt_price_limit_x96:
+        step_start = sqrt_price_x96
+        tick_next, initialized = pool.next_initialized_tick_within_one_word(tick, lte=zero_for_one)
+        tick_next = min(max(tick_next, MIN_TICK), MAX_TICK)
+        sqrt_price_next = get_sqrt_ratio_at_tick(tick_next)
+
+        if zero_for_one:
+            target = max(sqrt_price_next, sqrt_price_limit_x96)
+        else:
+            target = min(sqrt_price_next, sqrt_price_limit_x96)
+
+        sqrt_price_x96, step_in, step_out, step_fee = compute_swap_step(
+            sqrt_price_x96, target, liquidity, remaining, pool.fee
+        )
+
+        if exact_input:
+            remaining -= step_in + step_fee
+        else:
+            remaining += step_out
+        amount_in += step_in + step_fee
+        amount_out += step_out
+        fee_total += step_fee
+
+        if sqrt_price_x96 == sqrt_price_next:
+            if initialized:
+                liquidity_net = pool.ticks[tick_next][1]
+                liquidity += -liquidity_net if zero_for_one else liquidity_net
+                ticks_crossed += 1
+            tick = tick_next - 1 if zero_for_one else tick_next
+        elif sqrt_price_x96 != step_start:
+            tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+
+    start_price = pool.sqrt_price_x96 * pool.sqrt_price_x96
+    end_price = sqrt_price_x96 * sqrt_price_x96
+
+    return {
+        'amount_in': amount_in,
+        'amount_out': amount_out,
+        'fee_amount': fee_total,
+        'sqrtPriceX96': sqrt_price_x96,
+        'tick': tick,
+        'liquidity': liquidity,
+        'ticks_crossed': ticks_crossed,
+        'price_impact': abs(end_price - start_price) / start_price,
+        'block_number': pool.block_number
+    }
+
+
+def solve_swap_to_ratio(
+    pool: 'MirroredPool',
+    tick_lower: int,
+    tick_upper: int,
+    amount0: int,
+    amount1: int
+) -> Dict[str, Any]:
+    """
+    Find the swap that lets a mint in [tick_lower, tick_upper] use all of amount0 and amount1.
+
+    The ratio a range takes depends on the price, which the swap itself
+    moves, so the input is found by bisection over simulated swaps: a swap
+    is too small while the sold token could still back more liquidity than
+    the bought one at the post-swap price. That is monotonic in the input,
+    so about log2(amount) simulations find the exact amount.
+
+    Args:
+        pool: Mirrored pool state
+        tick_lower: Lower tick of the range to mint
+        tick_upper: Upper tick of the range to mint
+        amount0: Token0 available (raw units)
+        amount1: Token1 available (raw units)
+
+    Returns:
+        Dict with zero_for_one, amount_in and amount_out of the swap (0 if
+        none is needed), price_impact, the post-swap sqrtPriceX96 and tick,
+        amount0/amount1 held after the swap, and the mint's liquidity,
+        mint_amount0 and mint_amount1 at the post-swap price
+    """
+    sqrt_ratio_a_x96 = get_sqrt_ratio_at_tick(tick_lower)
+    sqrt_ratio_b_x96 = get_sqrt_ratio_at_tick(tick_upper)
+
+    def after_swap(zero_for_one: bool, amount_in: int) -> Dict[str, Any]:
+        if amount_in == 0:
+            return {
+                'zero_for_one': zero_for_one, 'amount_in': 0, 'amount_out': 0, 'price_impact': 0.0,
+                'sqrtPriceX96': pool.sqrt_price_x96, 'tick': pool.tick, 'amount0': amount0, 'amount1': amount1
+            }
+        swap = simulate_swap(pool, zero_for_one, amount_in)
+        held0, held1 = (
+            (amount0 - swap['amount_in'], amount1 + swap['amount_out']) if zero_for_one
+            else (amount0 + swap['amount_out'], amount1 - swap['amount_in'])
+        )
+        return {
+            'zero_for_one': zero_for_one, 'amount_in': swap['amount_in'], 'amount_out': swap['amount_out'],
+            'price_impact': swap['price_impact'], 'sqrtPriceX96': swap['sqrtPriceX96'], 'tick': swap['tick'],
+            'amount0': held0, 'amount1': held1
+        }
+
+    def sold_in_excess(state: Dict[str, Any]) -> bool:
+        sqrt_price_x96 = state['sqrtPriceX96']
+        if sqrt_price_x96 <= sqrt_ratio_a_x96:
+            return not state['zero_for_one']  # Range takes token0 only
+        if sqrt_price_x96 >= sqrt_ratio_b_x96:
+            return state['zero_for_one']  # Range takes token1 only
+        liquidity0 = get_liquidity_for_amount0(sqrt_price_x96, sqrt_ratio_b_x96, state['amount0'])
+        liquidity1 = get_liquidity_for_amount1(sqrt_ratio_a_x96, sqrt_price_x96, state['amount1'])
+        return liquidity0 > liquidity1 if state['zero_for_one'] else liquidity1 > liquidity0
+
+    def mint_liquidity(state: Dict[str, Any]) -> int:
+        return get_liquidity_for_amounts(
+            state['sqrtPriceX96'], sqrt_ratio_a_x96, sqrt_ratio_b_x96, state['amount0'], state['amount1']
+        )
+
+    best = after_swap(True, 0)
+    for zero_for_one, available in ((True, amount0), (False, amount1)):
+        start = after_swap(zero_for_one, 0)
+        if available == 0 or not sold_in_excess(start):
+            continue
+
+        # Largest input that still leaves the sold token in excess, and the one after it
+        low, high = 0, available
+        best = after_swap(zero_for_one, high)
+        if not sold_in_excess(best):
+            low_state = start
+            while high - low > 1:
+                middle = (low + high) // 2
+                state = after_swap(zero_for_one, middle)
+                if sold_in_excess(state):
+                    low, low_state = middle, state
+                else:
+                    high, best = middle, state
+            if mint_liquidity(low_state) >= mint_liquidity(best):
+                best = low_state
+        break
+
+    liquidity, mint_amount0, mint_amount1 = get_mint_amounts(
+        best['sqrtPriceX96'], tick_lower, tick_upper, best['amount0'], best['amount1'], pool.tick_spacing
+    )
+    best.update({
+        'liquidity': liquidity,
+        'mint_amount0': mint_amount0,
+        'mint_amount1': mint_amount1
+    })
+    return best
@@ -9,6 +9,9 @@ from web3.contract import Contract
 import time
 
 from .web3_client import Web3Client, get_web3_client
+from .allowances import DEFAULT_CACHE_FILE, MAX_UINT256, AllowanceTracker, allowance_key
+from .contracts import to_checksum_address
+from .pool_mirror import get_mirrored_state, simulate_mirrored_swap, solve_mirrored_swap_to_ratio
 from .abis import (
     ERC20_ABI,
     POOL_ABI,
@@ -16,9 +19,34 @@ from .abis import (
     ROUTER_ABI,
 )
 from ..utils.config import get_config
+from ..utils.tick_math import (
+    get_amounts_for_liquidity,
+    get_mint_amounts,
+    get_sqrt_ratio_at_tick,
+    sqrt_price_x96_to_price
+)
 
 logger = logging.getLogger(__name__)
 
+# Token IDs requested speculatively alongside balanceOf in get_positions
+POSITION_PREFETCH = 256
+
+UINT128_MAX = 2**128 - 1
+
+# Intrinsic gas every transaction pays before executing anything
+TX_BASE_GAS = 21000
+
+# Gas limit for a rebalance bundle (the unbundled path's per-step limits summed)
+REBALANCE_GAS_LIMIT = 1000000
+
+# Gas limit for closing a position (decreaseLiquidity + collect limits summed)
+CLOSE_GAS_LIMIT = 500000
+
+# NonfungiblePositionManager events read from rebalance receipts
+TRANSFER_TOPIC = Web3.keccak(text='Transfer(address,address,uint256)')
+COLLECT_TOPIC = Web3.keccak(text='Collect(uint256,address,uint256,uint256)')
+INCREASE_LIQUIDITY_TOPIC = Web3.keccak(text='IncreaseLiquidity(uint256,uint128,uint256,uint256)')
+
 
 class UniswapV3:
     """Interface for Uniswap V3 on Base Network."""
@@ -35,6 +63,22 @@ class UniswapV3:
         self.position_manager_address = self.config.get('uniswap.position_manager_address')
         self.quoter_address = self.config.get('uniswap.quoter_address')
         
+        # Cached contract objects and batched view calls (one eth_call per batch)
+        self.contracts = self.web3_client.contracts
+        self.multicall = self.contracts.multicall
+        
+        # View results for the current head block; repeated reads within a
+        # block (monitor, strategy, API) cost no RPC calls
+        self.views = self.web3_client.views
+        
+        # Known allowances (persisted), so approvals are only sent when short
+        self.allowances = AllowanceTracker(
+            self.contracts,
+            self.web3_client.chain_id,
+            self.config.get('data.allowance_cache_file', DEFAULT_CACHE_FILE)
+        )
+        self.max_approval = self.config.get('uniswap.max_approval', False)
+        
         logger.info("Uniswap V3 interface initialized on Base Network")
         logger.info(f"Position Manager: {self.position_manager_address}")
         logger.info(f"Router: {self.router_address}")
@@ -52,18 +96,11 @@ class UniswapV3:
         logger.debug(f"Getting price for pool: {pool_address}")
         
         try:
-            contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(pool_address),
-                abi=POOL_ABI
-            )
-            
-            # Get slot0 which contains sqrtPriceX96
-            slot0 = contract.functions.slot0().call()
-            sqrt_price_x96 = slot0[0]
+            sqrt_price_x96 = self.get_pool_slot0(pool_address)['sqrtPriceX96']
             
             # Convert sqrtPriceX96 to actual price
-            # price = (sqrtPriceX96 / 2^96) ^ 2
-            price = (sqrt_price_x96 / (2 ** 96)) ** 2
+            # price = sqrtPriceX96^2 / 2^192, squared in integer math
+            price = sqrt_price_x96_to_price(sqrt_price_x96)
             
             logger.debug(f"Pool price: {price}")
             return price
@@ -72,6 +109,78 @@ class UniswapV3:
             logger.error(f"Error getting pool price: {e}")
             return 0.0
     
+    def get_pool_slot0(self, pool_address: str) -> Dict[str, int]:
+        """
+        Get exact sqrtPriceX96 and tick from pool.
+        
+        Mirrored pools are answered from memory; others are read (once per
+        block).
+        
+        Args:
+            pool_address: Pool contract address
+            
+        Returns:
+            Dict with sqrtPriceX96 and tick
+        """
+        mirrored = get_mirrored_state(pool_address)
+        if mirrored is not None:
+            return {
+                'sqrtPriceX96': mirrored['sqrtPriceX96'],
+                'tick': mirrored['tick']
+            }
+        
+        contract = self.contracts.get(pool_address, POOL_ABI)
+        
+        slot0 = self.views.call(contract, 'slot0')
+        
+        return {
+            'sqrtPriceX96': slot0[0],
+            'tick': slot0[1]
+        }
+    
+    def get_mint_amounts(
+        self,
+        pool_address: str,
+        tick_lower: int,
+        tick_upper: int,
+        token0_amount: int,
+        token1_amount: int,
+        tick_spacing: int = 1
+    ) -> Dict[str, int]:
+        """
+        Compute the exact liquidity and token amounts a mint would use.
+        
+        Uses the integer TickMath/LiquidityAmounts port, so the only RPC
+        call is the slot0 read.
+        
+        Args:
+            pool_address: Pool contract address
+            tick_lower: Lower tick of range
+            tick_upper: Upper tick of range
+            token0_amount: Desired amount of token0
+            token1_amount: Desired amount of token1
+            tick_spacing: Pool tick spacing
+            
+        Returns:
+            Dict with liquidity, amount0 and amount1
+        """
+        slot0 = self.get_pool_slot0(pool_address)
+        
+        liquidity, amount0, amount1 = get_mint_amounts(
+            slot0['sqrtPriceX96'],
+            tick_lower,
+            tick_upper,
+            token0_amount,
+            token1_amount,
+            tick_spacing
+        )
+        
+        return {
+            'liquidity': liquidity,
+            'amount0': amount0,
+            'amount1': amount1
+        }
+    
     def get_pool_liquidity(self, pool_address: str) -> int:
         """
         Get current liquidity in pool.
@@ -85,12 +194,13 @@ class UniswapV3:
         logger.debug(f"Getting liquidity for pool: {pool_address}")
         
         try:
-            contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(pool_address),
-                abi=POOL_ABI
-            )
+            mirrored = get_mirrored_state(pool_address)
+            if mirrored is not None:
+                return mirrored['liquidity']
             
-            liquidity = contract.functions.liquidity().call()
+            contract = self.contracts.get(pool_address, POOL_ABI)
+            
+            liquidity = self.views.call(contract, 'liquidity')
             
             logger.debug(f"Pool liquidity: {liquidity}")
             return liquidity
@@ -99,6 +209,71 @@ class UniswapV3:
             logger.error(f"Error getting pool liquidity: {e}")
             return 0
     
+    def get_pools_state(self, pool_addresses: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Get slot0 and liquidity of several pools (mirrored ones from memory,
+        the rest in one multicall).
+        
+        Args:
+            pool_addresses: Pool contract addresses
+            
+        Returns:
+            Dict of checksummed pool address -> {'sqrtPriceX96', 'tick',
+            'liquidity'}; pools whose reads failed are left out
+        """
+        states = {}
+        contracts = []
+        for address in dict.fromkeys(map(to_checksum_address, pool_addresses)):
+            mirrored = get_mirrored_state(address)
+            if mirrored is not None:
+                states[address] = {key: mirrored[key] for key in ('sqrtPriceX96', 'tick', 'liquidity')}
+            else:
+                contracts.append(self.contracts.pool(address))
+        
+        if contracts:
+            results = self.views.call_many(self._pools_state_calls(contracts), allow_failure=True)
+            states.update(self._parse_pools_state(contracts, results))
+        return states
+    
+    @staticmethod
+    def _pools_state_calls(contracts: List[Contract]) -> list:
+        """Multicall calls reading slot0 and liquidity of each pool."""
+        calls = []
+        for contract in contracts:
+            calls.append((contract, 'slot0', ()))
+            calls.append((contract, 'liquidity', ()))
+        return calls
+    
+    @staticmethod
+    def _parse_pools_state(contracts: List[Contract], results: list) -> Dict[str, Dict[str, int]]:
+        """Map _pools_state_calls results to per-pool state dicts."""
+        states = {}
+        for i, contract in enumerate(contracts):
+            slot0, liquidity = results[2 * i], results[2 * i + 1]
+            if slot0 is None or liquidity is None:
+                logger.warning(f"Could not read state of pool {contract.address}")
+                continue
+            states[contract.address] = {
+                'sqrtPriceX96': slot0[0],
+                'tick': slot0[1],
+                'liquidity': liquidity
+            }
+        return states
+    
+    def get_pool_info(self, pool_address: str) -> Dict[str, Any]:
+        """
+        Get pool token addresses, fee tier and tick spacing.
+        
+        These never change after deployment, so they are read once and cached.
+        
+        Args:
+            pool_address: Pool contract address
+            
+        Returns:
+            Dict with token0, token1, fee, tickSpacing
+        """
+        return self.contracts.get_pool_immutables(pool_address)
+    
     def get_position(
         self,
         token_id: int
@@ -114,13 +289,47 @@ class UniswapV3:
         """
         logger.debug(f"Getting position: {token_id}")
         
-        contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.position_manager_address),
-            abi=POSITION_MANAGER_ABI
-        )
+        contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        
+        position = self.views.call(contract, 'positions', (token_id,))
+        
+        return self._position_to_dict(position)
+    
+    def get_position_amounts(self, token_id: int, pool_address: str) -> Dict[str, int]:
+        """
+        Tokens closing a position would return at the current pool price.
         
-        position = contract.functions.positions(token_id).call()
+        The liquidity's amounts at the pool's sqrtPrice (mirrored, or read
+        from slot0) plus the fees already owed to the position. Fees accrued
+        since the position was last touched are only credited when it is
+        closed, so the actual amounts can be slightly higher.
         
+        Args:
+            token_id: NFT token ID
+            pool_address: Pool the position is in
+            
+        Returns:
+            Dict with liquidity and amount0/amount1 (raw units)
+        """
+        position = self.get_position(token_id)
+        sqrt_price_x96 = self.get_pool_slot0(pool_address)['sqrtPriceX96']
+        
+        amount0, amount1 = get_amounts_for_liquidity(
+            sqrt_price_x96,
+            get_sqrt_ratio_at_tick(position['tickLower']),
+            get_sqrt_ratio_at_tick(position['tickUpper']),
+            position['liquidity']
+        )
+        
+        return {
+            'liquidity': position['liquidity'],
+            'amount0': amount0 + position['tokensOwed0'],
+            'amount1': amount1 + position['tokensOwed1']
+        }
+    
+    @staticmethod
+    def _position_to_dict(position) -> Dict[str, Any]:
+        """Map a positions() result tuple to a dict."""
         return {
             'nonce': position[0],
             'operator': position[1],
@@ -136,7 +345,14 @@ class UniswapV3:
             'tokensOwed1': position[11]
         }
     
-    def approve_token(self, token_address: str, spender_address: str, amount: int, skip_check: bool = False) -> Optional[str]:
+    def approve_token(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: int,
+        skip_check: bool = False,
+        wait: bool = True
+    ) -> Optional[str]:
         """
         Approve tokens for spending.
         
@@ -145,57 +361,121 @@ class UniswapV3:
             spender_address: Spender contract address
             amount: Amount to approve
             skip_check: If True, skip allowance check and approve directly
+            wait: Wait for the approval to be mined (transactions sent
+                after it with the next nonce can't be mined before it, so
+                callers following up with a dependent transaction can skip this)
             
         Returns:
             Transaction hash or None if already approved
         """
         logger.info(f"Approving {amount} tokens for {spender_address}")
         
-        contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
-        )
+        contract = self.contracts.get(token_address, ERC20_ABI)
         
         wallet = self.web3_client.address
         
-        # Check current allowance (unless skip_check=True)
+        # Check current allowance (unless skip_check=True); known
+        # allowances come from the local record without an RPC call
         if not skip_check:
             try:
-                current_allowance = contract.functions.allowance(wallet, spender_address).call()
-                if current_allowance >= amount:
-                    logger.info(f"Already approved {current_allowance}, no need to approve again")
+                if not self.allowances.needs_approval(token_address, wallet, spender_address, amount):
+                    logger.info("Already approved, no need to approve again")
                     return None
             except Exception as e:
                 logger.warning(f"Could not check allowance (rate limit?), approving anyway: {e}")
                 # Continue with approval
         
-        # Build approval transaction  
-        import time
-        time.sleep(0.5)  # Small delay to avoid nonce conflicts
-        nonce = self.w3.eth.get_transaction_count(wallet, 'pending')
+        # Build, sign and send approval transaction (nonce allocated locally)
+        gas_price = self.w3.eth.gas_price
+        tx_hash = self.web3_client.sign_and_send(
+            lambda nonce: contract.functions.approve(spender_address, amount).build_transaction({
+                'from': wallet,
+                'nonce': nonce,
+                'gas': 100000,
+                'gasPrice': gas_price
+            })
+        )
         
-        tx = contract.functions.approve(spender_address, amount).build_transaction({
-            'from': wallet,
-            'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': self.w3.eth.gas_price
-        })
+        logger.info(f"Approval tx: {tx_hash}")
         
-        # Sign and send
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.web3_client.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        # Recorded right away: transactions sent after it can't be mined before it
+        self.allowances.record(token_address, wallet, spender_address, amount)
         
-        logger.info(f"Approval tx: {tx_hash.hex()}")
+        if not wait:
+            return tx_hash
         
         # Wait for confirmation
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.web3_client.receipts.wait(tx_hash)
         
         if receipt['status'] == 1:
             logger.info("Approval successful")
+            # The Approval event has the exact allowance the token stored
+            self.allowances.record_receipt(receipt)
         else:
             logger.error("Approval failed")
+            self.allowances.forget([(token_address, wallet, spender_address)])
             
-        return tx_hash.hex()
+        return tx_hash
+    
+    def ensure_allowances(self, spender_address: str, amounts: Dict[str, int]) -> List[str]:
+        """
+        Approve only the tokens whose allowance for spender is short.
+        
+        Unknown allowances are read in one multicall; known ones come from
+        the local record. Approvals are not waited for (a transaction sent
+        after them can't be mined first).
+        
+        Args:
+            spender_address: Spender contract address
+            amounts: Token address -> amount about to be spent
+            
+        Returns:
+            Approval transaction hashes (empty if nothing was short)
+        """
+        wallet = self.web3_client.address
+        needed = {allowance_key(token, wallet, spender_address): amount for token, amount in amounts.items()}
+        
+        try:
+            allowances = self.allowances.get_many(list(needed))
+        except Exception as e:
+            logger.warning(f"Could not check allowances (rate limit?), approving anyway: {e}")
+            allowances = {}
+        
+        tx_hashes = []
+        for (token, _, spender), amount in needed.items():
+            allowance = allowances.get((token, wallet, spender))
+            if allowance is not None and allowance >= amount:
+                logger.debug(f"Allowance of {token} covers {amount}, not approving")
+                continue
+            approval = MAX_UINT256 if self.max_approval else amount
+            tx_hashes.append(self.approve_token(token, spender, approval, skip_check=True, wait=False))
+        
+        return tx_hashes
+    
+    def _update_mint_allowances(self, receipt, token0: str, token1: str, amount0: int, amount1: int):
+        """
+        Update allowances after a mint: recorded from Approval events where the
+        tokens emit them on transferFrom, otherwise consumed by what the mint
+        pulled; forgotten if it failed.
+        """
+        wallet = self.web3_client.address
+        spender = self.position_manager_address
+        
+        if receipt['status'] != 1:
+            # Possibly a stale allowance; read it again next time
+            self.allowances.forget([(token0, wallet, spender), (token1, wallet, spender)])
+            return
+        
+        # The Position Manager pulls what IncreaseLiquidity reports, at most the desired amounts
+        for log in receipt['logs']:
+            topics = log['topics']
+            if log['address'].lower() == spender.lower() and topics and topics[0] == INCREASE_LIQUIDITY_TOPIC:
+                _, amount0, amount1 = self.w3.codec.decode(['uint128', 'uint256', 'uint256'], log['data'])
+        
+        recorded = set(self.allowances.record_receipt(receipt))
+        for token, amount in ((token0, amount0), (token1, amount1)):
+            if allowance_key(token, wallet, spender) not in recorded:
+                self.allowances.consume(token, wallet, spender, amount)
     
     def add_liquidity(
         self,
@@ -232,17 +512,8 @@ class UniswapV3:
         logger.info(f"Tick range: [{tick_lower}, {tick_upper}]")
         
         # Use provided token addresses (no RPC calls needed)
-        token0 = Web3.to_checksum_address(token0_address)
-        token1 = Web3.to_checksum_address(token1_address)
-        
-        # Approve tokens (skip allowance check to avoid rate limits)
-        logger.info("Approving token0...")
-        self.approve_token(token0, self.position_manager_address, token0_amount, skip_check=True)
-        time.sleep(1)  # Wait for approval to be mined
-        
-        logger.info("Approving token1...")
-        self.approve_token(token1, self.position_manager_address, token1_amount, skip_check=True)
-        time.sleep(1)  # Wait for approval to be mined
+        token0 = to_checksum_address(token0_address)
+        token1 = to_checksum_address(token1_address)
         
         # Set deadline
         if deadline is None:
@@ -265,19 +536,7 @@ class UniswapV3:
         }
         
         # Get Position Manager contract
-        pm_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.position_manager_address),
-            abi=POSITION_MANAGER_ABI
-        )
-        
-        # Build transaction
-        time.sleep(0.5)  # Short delay before getting nonce
-        tx = pm_contract.functions.mint(mint_params).build_transaction({
-            'from': wallet,
-            'nonce': self.w3.eth.get_transaction_count(wallet, 'pending'),
-            'gas': 500000,
-            'gasPrice': self.w3.eth.gas_price
-        })
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
         
         if dry_run:
             logger.info("🔍 DRY RUN - Would mint position with parameters:")
@@ -292,28 +551,42 @@ class UniswapV3:
                 'receipt': None
             }
         
-        # Sign and send
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.web3_client.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        # Approve only what the known allowances don't cover. The approvals
+        # and the mint take consecutive nonces, so the mint can be sent right
+        # away: it can't be mined before the approvals.
+        self.ensure_allowances(self.position_manager_address, {token0: token0_amount, token1: token1_amount})
+        
+        # Build, sign and send (fixed gas limit: estimating would fail
+        # until the approvals are mined)
+        gas_price = self.w3.eth.gas_price
+        tx_hash = self.web3_client.sign_and_send(
+            lambda nonce: pm_contract.functions.mint(mint_params).build_transaction({
+                'from': wallet,
+                'nonce': nonce,
+                'gas': 500000,
+                'gasPrice': gas_price
+            })
+        )
         
-        logger.info(f"Mint tx: {tx_hash.hex()}")
+        logger.info(f"Mint tx: {tx_hash}")
         
         # Wait for confirmation
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.web3_client.receipts.wait(tx_hash)
+        self._update_mint_allowances(receipt, token0, token1, token0_amount, token1_amount)
         
         if receipt['status'] == 1:
             logger.info("Position minted successfully!")
             # Parse logs to get tokenId (simplified - in production parse the Transfer event)
             return {
                 'success': True,
-                'tx_hash': tx_hash.hex(),
+                'tx_hash': tx_hash,
                 'receipt': receipt
             }
         else:
             logger.error("Position mint failed")
             return {
                 'success': False,
-                'tx_hash': tx_hash.hex(),
+                'tx_hash': tx_hash,
                 'receipt': receipt
             }
     
@@ -354,21 +627,10 @@ class UniswapV3:
             'deadline': deadline
         }
         
-        pm_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.position_manager_address),
-            abi=POSITION_MANAGER_ABI
-        )
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
         
         wallet = self.web3_client.address
         
-        # Build transaction
-        tx = pm_contract.functions.decreaseLiquidity(decrease_params).build_transaction({
-            'from': wallet,
-            'nonce': self.w3.eth.get_transaction_count(wallet),
-            'gas': 300000,
-            'gasPrice': self.w3.eth.gas_price
-        })
-        
         if dry_run:
             logger.info("🔍 DRY RUN - Would remove liquidity with parameters:")
             logger.info(f"  Token ID: {token_id}")
@@ -383,17 +645,24 @@ class UniswapV3:
                 'amount1': 0
             }
         
-        # Sign and send
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.web3_client.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        # Build, sign and send
+        gas_price = self.w3.eth.gas_price
+        tx_hash = self.web3_client.sign_and_send(
+            lambda nonce: pm_contract.functions.decreaseLiquidity(decrease_params).build_transaction({
+                'from': wallet,
+                'nonce': nonce,
+                'gas': 300000,
+                'gasPrice': gas_price
+            })
+        )
         
-        logger.info(f"Decrease liquidity tx: {tx_hash.hex()}")
+        logger.info(f"Decrease liquidity tx: {tx_hash}")
         
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.web3_client.receipts.wait(tx_hash)
         
         return {
             'success': receipt['status'] == 1,
-            'tx_hash': tx_hash.hex(),
+            'tx_hash': tx_hash,
             'receipt': receipt
         }
     
@@ -421,67 +690,457 @@ class UniswapV3:
             'amount1Max': 2**128 - 1
         }
         
-        pm_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.position_manager_address),
-            abi=POSITION_MANAGER_ABI
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        
+        gas_price = self.w3.eth.gas_price
+        tx_hash = self.web3_client.sign_and_send(
+            lambda nonce: pm_contract.functions.collect(collect_params).build_transaction({
+                'from': wallet,
+                'nonce': nonce,
+                'gas': 200000,
+                'gasPrice': gas_price
+            })
         )
         
-        tx = pm_contract.functions.collect(collect_params).build_transaction({
-            'from': wallet,
-            'nonce': self.w3.eth.get_transaction_count(wallet),
-            'gas': 200000,
-            'gasPrice': self.w3.eth.gas_price
-        })
+        logger.info(f"Collect fees tx: {tx_hash}")
+        
+        receipt = self.web3_client.receipts.wait(tx_hash)
+        
+        return {
+            'success': receipt['status'] == 1,
+            'tx_hash': tx_hash,
+            'receipt': receipt
+        }
+    
+    def build_rebalance_bundle(
+        self,
+        token_id: int,
+        liquidity: int,
+        tick_lower: int,
+        tick_upper: int,
+        token0_address: str,
+        token1_address: str,
+        fee: int,
+        token0_amount: int,
+        token1_amount: int,
+        deadline: Optional[int] = None,
+        value: int = 0,
+        sweep_tokens: Optional[List[str]] = None
+    ) -> List[bytes]:
+        """
+        Encode a rebalance as Position Manager multicall payloads.
+        
+        The old position's liquidity is decreased and everything owed is
+        collected to the wallet, then the new position is minted from the
+        wallet (so the Position Manager needs allowances for the mint amounts).
+        
+        Args:
+            token_id: NFT token ID of the position to close
+            liquidity: Liquidity to remove (0 only collects)
+            tick_lower: Lower tick of the new range
+            tick_upper: Upper tick of the new range
+            token0_address: Token0 contract address
+            token1_address: Token1 contract address
+            fee: Pool fee tier
+            token0_amount: Amount of token0 for the new position
+            token1_amount: Amount of token1 for the new position
+            deadline: Transaction deadline (default: 20 minutes from now)
+            value: ETH sent with the bundle (adds refundETH for the unused part)
+            sweep_tokens: Tokens to sweep from the Position Manager back to the wallet
+        
+        Returns:
+            Encoded calls for multicall(bytes[])
+        """
+        if deadline is None:
+            deadline = int(time.time()) + 1200
+        
+        wallet = self.web3_client.address
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        
+        calls = self._close_calls(pm_contract, token_id, liquidity, deadline)
+        
+        calls.append(pm_contract.encodeABI(fn_name='mint', args=[{
+            'token0': to_checksum_address(token0_address),
+            'token1': to_checksum_address(token1_address),
+            'fee': fee,
+            'tickLower': tick_lower,
+            'tickUpper': tick_upper,
+            'amount0Desired': token0_amount,
+            'amount1Desired': token1_amount,
+            'amount0Min': 0,  # Accept any amount (for micro testing)
+            'amount1Min': 0,
+            'recipient': wallet,
+            'deadline': deadline
+        }]))
+        
+        for token in sweep_tokens or []:
+            calls.append(pm_contract.encodeABI(fn_name='sweepToken', args=[to_checksum_address(token), 0, wallet]))
+        
+        if value > 0:
+            calls.append(pm_contract.encodeABI(fn_name='refundETH', args=[]))
+        
+        return [bytes.fromhex(call[2:]) for call in calls]
+    
+    def _close_calls(self, pm_contract: Contract, token_id: int, liquidity: int, deadline: int) -> List[str]:
+        """Encode decreaseLiquidity (if any liquidity is left) and collect-all to the wallet."""
+        calls = []
+        
+        # decreaseLiquidity reverts on zero liquidity; collect still picks up fees
+        if liquidity > 0:
+            calls.append(pm_contract.encodeABI(fn_name='decreaseLiquidity', args=[{
+                'tokenId': token_id,
+                'liquidity': liquidity,
+                'amount0Min': 0,  # Accept any amount (set higher in production)
+                'amount1Min': 0,
+                'deadline': deadline
+            }]))
+        
+        calls.append(pm_contract.encodeABI(fn_name='collect', args=[{
+            'tokenId': token_id,
+            'recipient': self.web3_client.address,
+            'amount0Max': UINT128_MAX,  # Collect all
+            'amount1Max': UINT128_MAX
+        }]))
+        
+        return calls
+    
+    def close_position(
+        self,
+        token_id: int,
+        deadline: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Remove all liquidity from a position and collect everything owed in one transaction.
+        
+        decreaseLiquidity and collect go through the Position Manager's
+        multicall, so the exact amounts received are known from one receipt
+        (for sizing the swap before the next mint).
+        
+        Args:
+            token_id: NFT token ID of the position to close
+            deadline: Transaction deadline (default: 20 minutes from now)
+            dry_run: If True, encode the calls without sending them
+        
+        Returns:
+            Dict with success, tx_hash, receipt and amount0/amount1 collected
+        """
+        if deadline is None:
+            deadline = int(time.time()) + 1200
+        
+        wallet = self.web3_client.address
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        
+        liquidity = self.views.call(pm_contract, 'positions', (token_id,))[7]
+        calls = [bytes.fromhex(call[2:]) for call in self._close_calls(pm_contract, token_id, liquidity, deadline)]
+        
+        if dry_run:
+            logger.info(f"🔍 DRY RUN - Would close position {token_id} (liquidity {liquidity}) and collect all")
+            return {
+                'success': True,
+                'dry_run': True,
+                'tx_hash': 'dry-run-no-tx',
+                'receipt': None,
+                'amount0': 0,
+                'amount1': 0
+            }
         
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.web3_client.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        gas_price = self.w3.eth.gas_price
+        tx_hash = self.web3_client.sign_and_send(
+            lambda nonce: pm_contract.functions.multicall(calls).build_transaction({
+                'from': wallet,
+                'nonce': nonce,
+                'gas': CLOSE_GAS_LIMIT,
+                'gasPrice': gas_price
+            })
+        )
         
-        logger.info(f"Collect fees tx: {tx_hash.hex()}")
+        logger.info(f"Close position tx: {tx_hash}")
         
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.web3_client.receipts.wait(tx_hash)
+        if receipt['status'] != 1:
+            logger.error(f"Closing position {token_id} failed")
+            return {
+                'success': False,
+                'tx_hash': tx_hash,
+                'receipt': receipt
+            }
         
+        collected = self._parse_rebalance_receipt(token_id, receipt)
         return {
-            'success': receipt['status'] == 1,
-            'tx_hash': tx_hash.hex(),
+            'success': True,
+            'tx_hash': tx_hash,
+            'receipt': receipt,
+            'amount0': collected['amount0'],
+            'amount1': collected['amount1']
+        }
+    
+    def rebalance_position(
+        self,
+        token_id: int,
+        tick_lower: int,
+        tick_upper: int,
+        token0_amount: int,
+        token1_amount: int,
+        token0_address: str,
+        token1_address: str,
+        fee: int,
+        deadline: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Close a position and mint a new range in a single transaction.
+        
+        decreaseLiquidity, collect and mint go through the Position
+        Manager's multicall instead of three transactions waited on one by
+        one. Approvals are only sent when the current allowance is short,
+        with consecutive nonces right before the bundle, so the whole
+        rebalance lands in one block.
+        
+        Args:
+            token_id: NFT token ID of the position to close
+            tick_lower: Lower tick of the new range
+            tick_upper: Upper tick of the new range
+            token0_amount: Amount of token0 for the new position
+            token1_amount: Amount of token1 for the new position
+            token0_address: Token0 contract address
+            token1_address: Token1 contract address
+            fee: Pool fee tier
+            deadline: Transaction deadline (default: 20 minutes from now)
+            dry_run: If True, encode the bundle without sending it
+        
+        Returns:
+            Dict with success, tx_hash, receipt, token_id of the new position,
+            amount0/amount1 collected from the old one and a gas report
+        """
+        logger.info(f"Rebalancing position {token_id} into [{tick_lower}, {tick_upper}]")
+        
+        token0 = to_checksum_address(token0_address)
+        token1 = to_checksum_address(token1_address)
+        wallet = self.web3_client.address
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        
+        liquidity = self.views.call(pm_contract, 'positions', (token_id,))[7]
+        
+        calls = self.build_rebalance_bundle(
+            token_id, liquidity, tick_lower, tick_upper, token0, token1, fee,
+            token0_amount, token1_amount, deadline
+        )
+        
+        if dry_run:
+            logger.info("🔍 DRY RUN - Would send rebalance bundle:")
+            logger.info(f"  Remove liquidity: {liquidity} from position {token_id}")
+            logger.info(f"  Mint: {token0_amount} token0, {token1_amount} token1 in [{tick_lower}, {tick_upper}]")
+            logger.info(f"  Calls: {len(calls)} in one transaction")
+            logger.info("✅ Dry run complete - no transaction sent")
+            return {
+                'success': True,
+                'dry_run': True,
+                'tx_hash': 'dry-run-no-tx',
+                'receipt': None,
+                'token_id': None,
+                'amount0': 0,
+                'amount1': 0
+            }
+        
+        approvals = len(self.ensure_allowances(self.position_manager_address, {token0: token0_amount, token1: token1_amount}))
+        
+        # Fixed gas limit (the per-step limits of the unbundled path):
+        # estimating would fail until any approvals are mined
+        gas_price = self.w3.eth.gas_price
+        tx_hash = self.web3_client.sign_and_send(
+            lambda nonce: pm_contract.functions.multicall(calls).build_transaction({
+                'from': wallet,
+                'nonce': nonce,
+                'gas': REBALANCE_GAS_LIMIT,
+                'gasPrice': gas_price
+            })
+        )
+        
+        logger.info(f"Rebalance bundle tx: {tx_hash}")
+        
+        receipt = self.web3_client.receipts.wait(tx_hash)
+        self._update_mint_allowances(receipt, token0, token1, token0_amount, token1_amount)
+        
+        if receipt['status'] != 1:
+            logger.error("Rebalance bundle failed")
+            return {
+                'success': False,
+                'tx_hash': tx_hash,
+                'receipt': receipt
+            }
+        
+        result = self._parse_rebalance_receipt(token_id, receipt)
+        result['gas'] = self._rebalance_gas_report(receipt, approvals, len(calls))
+        logger.info(
+            f"Rebalanced {token_id} -> {result['token_id']}: {result['gas']['gas_used']} gas in "
+            f"{result['gas']['transactions']} tx (separate transactions: estimated "
+            f">= {result['gas']['multi_tx_gas_estimate']} gas in {result['gas']['multi_tx_transactions']} tx)"
+        )
+        result.update({
+            'success': True,
+            'tx_hash': tx_hash,
             'receipt': receipt
+        })
+        return result
+    
+    def _parse_rebalance_receipt(self, old_token_id: int, receipt) -> Dict[str, Any]:
+        """Read the minted token ID and the collected amounts from a bundle receipt."""
+        position_manager = self.position_manager_address.lower()
+        token_id = None
+        amount0 = amount1 = 0
+        
+        for log in receipt['logs']:
+            if log['address'].lower() != position_manager:
+                continue
+            topics = log['topics']
+            if topics[0] == TRANSFER_TOPIC and int.from_bytes(topics[1], 'big') == 0:
+                token_id = int.from_bytes(topics[3], 'big')
+            elif topics[0] == COLLECT_TOPIC and int.from_bytes(topics[1], 'big') == old_token_id:
+                _, amount0, amount1 = self.w3.codec.decode(['address', 'uint256', 'uint256'], log['data'])
+        
+        return {
+            'token_id': token_id,
+            'amount0': amount0,
+            'amount1': amount1
+        }
+    
+    @staticmethod
+    def _rebalance_gas_report(receipt, approvals: int, calls: int) -> Dict[str, int]:
+        """
+        Gas of a bundle, and an estimate of the same calls sent one per transaction.
+        
+        The unbundled figure is not measured: mint can't be estimated on its
+        own until decreaseLiquidity and collect are mined. It adds the
+        intrinsic gas of each extra transaction to the bundle's gas, which is
+        a lower bound, since separate transactions also pay again for the
+        cold contract and storage accesses that the bundle pays for once.
+        """
+        gas_used = receipt['gasUsed']
+        return {
+            'gas_used': gas_used,
+            'transactions': 1 + approvals,
+            'multi_tx_gas_estimate': gas_used + (calls - 1) * TX_BASE_GAS,
+            'multi_tx_transactions': calls + approvals,
+            'approvals': approvals
         }
     
     def get_positions(
         self,
-        wallet: Optional[str] = None
+        wallet: Optional[str] = None,
+        prefetch: int = POSITION_PREFETCH
     ) -> List[Dict[str, Any]]:
         """
         Get all positions owned by a wallet.
         
+        Reads are batched through Multicall3. The first batch fetches the
+        balance together with the first `prefetch` token IDs speculatively
+        (indexes past the balance just revert), and the second fetches the
+        positions, so wallets with up to `prefetch` positions take two round
+        trips (none when the same block was already read). Both batches read
+        the same block.
+        
         Args:
             wallet: Wallet address (default: connected wallet)
+            prefetch: Token IDs to request before the balance is known
             
         Returns:
             List of position details
         """
         if wallet is None:
             wallet = self.web3_client.address
+        wallet = to_checksum_address(wallet)
         
         logger.debug(f"Getting positions for wallet: {wallet}")
         
-        pm_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.position_manager_address),
-            abi=POSITION_MANAGER_ABI
-        )
+        pm_contract = self.contracts.get(self.position_manager_address, POSITION_MANAGER_ABI)
+        
+        calls = [(pm_contract, 'balanceOf', (wallet,))]
+        calls += [(pm_contract, 'tokenOfOwnerByIndex', (wallet, i)) for i in range(prefetch)]
+        block_number, results = self.views.aggregate(calls, allow_failure=True)
         
-        # Get number of positions
-        balance = pm_contract.functions.balanceOf(wallet).call()
+        balance = results[0]
+        if balance is None:
+            raise ValueError(f"Could not read position balance of {wallet}")
+        token_ids = results[1:balance + 1]
+        
+        # Positions beyond the prefetch, read at the same block
+        if balance > prefetch:
+            token_ids += self.views.aggregate(
+                [(pm_contract, 'tokenOfOwnerByIndex', (wallet, i)) for i in range(prefetch, balance)],
+                block_number=block_number
+            )[1]
+        
+        _, results = self.views.aggregate(
+            [(pm_contract, 'positions', (token_id,)) for token_id in token_ids],
+            block_number=block_number
+        )
         
         positions = []
-        for i in range(balance):
-            token_id = pm_contract.functions.tokenOfOwnerByIndex(wallet, i).call()
-            position = self.get_position(token_id)
+        for token_id, result in zip(token_ids, results):
+            position = self._position_to_dict(result)
             position['tokenId'] = token_id
             positions.append(position)
         
         logger.info(f"Found {len(positions)} positions")
         return positions
     
+    def simulate_swap(
+        self,
+        pool_address: str,
+        zero_for_one: bool,
+        amount_specified: int,
+        sqrt_price_limit_x96: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Simulate a swap offline against the local pool mirror.
+        
+        Walks the mirrored initialized ticks with the exact pool math, so the
+        result is what the Quoter would return at the mirrored block, with no
+        RPC call.
+        
+        Args:
+            pool_address: Pool contract address
+            zero_for_one: Swap token0 in for token1 out
+            amount_specified: Exact input if positive, exact output if negative (raw units)
+            sqrt_price_limit_x96: Price the swap may not pass (default: none)
+            
+        Returns:
+            Dict with amount_in, amount_out, fee_amount, sqrtPriceX96, tick,
+            liquidity, ticks_crossed, price_impact and block_number, or None
+            if the pool is not mirrored
+        """
+        return simulate_mirrored_swap(pool_address, zero_for_one, amount_specified, sqrt_price_limit_x96)
+    
+    def plan_swap_to_ratio(
+        self,
+        pool_address: str,
+        tick_lower: int,
+        tick_upper: int,
+        amount0: int,
+        amount1: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Size the swap that lets one mint in a range use all of both amounts.
+        
+        Solved offline against the local pool mirror, accounting for the
+        swap's own price impact.
+        
+        Args:
+            pool_address: Pool contract address
+            tick_lower: Lower tick of the range to mint
+            tick_upper: Upper tick of the range to mint
+            amount0: Token0 available (raw units)
+            amount1: Token1 available (raw units)
+            
+        Returns:
+            Dict with zero_for_one, amount_in, amount_out, price_impact,
+            post-swap sqrtPriceX96/tick, amount0/amount1 held after the swap
+            and the mint's liquidity, mint_amount0 and mint_amount1; None if
+            the pool is not mirrored
+        """
+        return solve_mirrored_swap_to_ratio(pool_address, tick_lower, tick_upper, amount0, amount1)
+    
     def swap_tokens(
         self,
         token_in: str,
@@ -489,7 +1148,9 @@ class UniswapV3:
         amount_in: float,
         fee_tier: str = 'medium',
         slippage: float = 1.0,
-        dry_run: bool = False
+        dry_run: bool = False,
+        amount_out_minimum: int = 0,
+        amount_in_raw: Optional[int] = None
     ) -> dict:
         """
         Swap tokens using Uniswap V3 router.
@@ -501,6 +1162,9 @@ class UniswapV3:
             fee_tier: Fee tier ('lowest', 'low', 'medium', 'high')
             slippage: Maximum slippage tolerance in percent
             dry_run: If True, simulate without executing
+            amount_out_minimum: Minimum output in raw units (0 accepts any)
+            amount_in_raw: Exact input in raw units (used instead of amount_in,
+                e.g. for a solver's amount, so nothing is lost to float rounding)
             
         Returns:
             Dict with swap result
@@ -518,7 +1182,9 @@ class UniswapV3:
                 amount_in=amount_in,
                 fee_tier=fee_tier,
                 slippage=slippage,
-                dry_run=dry_run
+                dry_run=dry_run,
+                amount_out_minimum=amount_out_minimum,
+                amount_in_raw=amount_in_raw
             )
             
             if result is None:
@@ -0,0 +1,189 @@
+"""
+Block-keyed read-through cache for contract view calls.
+
+A view call's result can only change when a new block is produced, so
+results are cached under (block number, contract, calldata) and the whole
+cache is dropped when a newer head is observed. Heads are observed for free
+from the block number every multicall read reports, and from anything else
+that learns it (receipt polls, head trackers) via observe_block().
+
+Without a head subscription we cannot know the moment the next block
+lands, so cached results are served for at most max_head_age seconds
+after the head was last seen (about one block time); the next read after
+that goes to the chain and re-observes the head.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from web3.contract import Contract
+
+from .multicall import Call, Multicall
+
+# Base produces a block every 2 seconds
+DEFAULT_MAX_HEAD_AGE_SECONDS = 2.0
+
+# Entries kept for the current head; results within one block rarely need more
+DEFAULT_MAX_ENTRIES = 10000
+
+# (contract address, calldata)
+ViewKey = Tuple[str, bytes]
+
+_MISSING = object()
+
+
+class ViewCache:
+    """View call results for the current head block, with hit-rate counters."""
+
+    def __init__(
+        self,
+        multicall: Multicall,
+        max_head_age: float = DEFAULT_MAX_HEAD_AGE_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            multicall: Reader for misses (reports the block it read at)
+            max_head_age: Seconds a head is trusted after it was last seen
+            max_entries: Maximum results cached for one block
+        """
+        self.multicall = multicall
+        self.max_head_age = max_head_age
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: Dict[ViewKey, Any] = {}
+        self.head: Optional[int] = None
+        self._head_seen = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def call(self, contract: Contract, fn_name: str, args: Tuple = ()) -> Any:
+        """
+        Read a view function, from the cache when the head hasn't moved.
+
+        Args:
+            contract: Contract (from the ContractRegistry)
+            fn_name: View function name
+            args: Arguments in ABI order
+
+        Returns:
+            Decoded result, like ContractFunction.call()
+
+        Raises:
+            ValueError: If the call reverts
+        """
+        return self.call_many([(contract, fn_name, args)])[0]
+
+    def call_many(self, calls: List[Call], allow_failure: bool = False) -> List[Any]:
+        """
+        Read several view functions; misses are read together in one multicall.
+
+        Args:
+            calls: (contract, function name, args) tuples
+            allow_failure: Return None for calls that revert (not cached)
+                instead of raising
+
+        Returns:
+            Decoded results in call order
+        """
+        _, results = self.aggregate(calls, allow_failure)
+        return results
+
+    def aggregate(
+        self,
+        calls: List[Call],
+        allow_failure: bool = False,
+        block_number: Optional[int] = None
+    ) -> Tuple[int, List[Any]]:
+        """
+        Read several view functions and report the block the results are from.
+
+        Cached and fetched results always come from the same block: if the
+        head moved while the misses were read, the hits are read again too.
+
+        Args:
+            calls: (contract, function name, args) tuples
+            allow_failure: Return None for calls that revert instead of raising
+            block_number: Block to read at (default: the head); only the
+                current head is served from and stored in the cache
+
+        Returns:
+            (block number, decoded results in call order)
+        """
+        keys = [self._key(contract, fn_name, args) for contract, fn_name, args in calls]
+
+        with self._lock:
+            head = self.head if self._head_fresh() else None
+            if block_number is not None and block_number != head:
+                head = None
+            results = [self._entries.get(key, _MISSING) if head is not None else _MISSING for key in keys]
+        missing = [i for i, result in enumerate(results) if result is _MISSING]
+
+        if not missing:
+            with self._lock:
+                self.hits += len(calls)
+            return head, results
+
+        read_at = block_number if block_number is not None else 'latest'
+        fetched_block, fetched = self.multicall.aggregate([calls[i] for i in missing], allow_failure, read_at)
+        self.observe_block(fetched_block)
+        if head is not None and fetched_block != head and len(missing) < len(calls):
+            # The head moved under the hits: read them at the new block as well
+            missing = list(range(len(calls)))
+            fetched = self.multicall.call(calls, allow_failure, block_identifier=fetched_block)
+
+        with self._lock:
+            self.hits += len(calls) - len(missing)
+            self.misses += len(missing)
+            for i, result in zip(missing, fetched):
+                results[i] = result
+                if result is not None and self.head == fetched_block:
+                    self._store(keys[i], result)
+
+        return fetched_block, results
+
+    def observe_block(self, block_number: int):
+        """
+        Record a head seen elsewhere; a newer one drops every cached result.
+
+        Args:
+            block_number: Latest block number
+        """
+        with self._lock:
+            if self.head is None or block_number > self.head:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.head = block_number
+                self._head_seen = time.monotonic()
+            elif block_number == self.head:
+                self._head_seen = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate counters."""
+        lookups = self.hits + self.misses
+        return {
+            'head': self.head,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations
+        }
+
+    def _head_fresh(self) -> bool:
+        return self.head is not None and time.monotonic() - self._head_seen < self.max_head_age
+
+    def _key(self, contract: Contract, fn_name: str, args: Tuple) -> ViewKey:
+        return contract.address, self.multicall.encode_call(contract, fn_name, args)
+
+    def _store(self, key: ViewKey, result: Any):
+        if len(self._entries) >= self.max_entries:
+            # Oldest first; entries only live for one block anyway
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = result
@@ -1,10 +1,15 @@
 """
 Web3 connection and transaction management for Base Network.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from eth_account import Account
+from .contracts import ContractRegistry, to_checksum_address
+from .nonce_manager import get_nonce_manager
+from .receipts import DEFAULT_POLL_INTERVAL_SECONDS, ReceiptTracker
+from .rpc_pool import DEFAULT_REQUEST_TIMEOUT_SECONDS, RPCPoolProvider, build_rpc_endpoints
+from .view_cache import DEFAULT_MAX_HEAD_AGE_SECONDS, ViewCache
 from ..utils.config import get_config
 from ..utils.logger import log
 
@@ -26,8 +31,18 @@ class Web3Client:
         self.private_key = private_key or config.private_key
         self.chain_id = config.chain_id
         
-        # Initialize Web3
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # Initialize Web3: an explicit URL pins the client to it, otherwise
+        # calls are routed between the configured endpoints if there are any
+        endpoints = [] if rpc_url else build_rpc_endpoints(config.get('network.rpc_endpoints'))
+        if endpoints:
+            provider = RPCPoolProvider(
+                endpoints,
+                timeout=config.get('network.request_timeout_seconds', DEFAULT_REQUEST_TIMEOUT_SECONDS)
+            )
+            self.rpc_url = ', '.join(endpoint.name for endpoint in endpoints)
+        else:
+            provider = Web3.HTTPProvider(self.rpc_url)
+        self.w3 = Web3(provider)
         
         # Base is EVM-compatible, may need POA middleware
         self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
@@ -36,6 +51,26 @@ class Web3Client:
         self.account = Account.from_key(self.private_key)
         self.address = self.account.address
         
+        # Contract objects and pool immutables, built once
+        self.contracts = ContractRegistry(self.w3)
+        
+        # Nonces are allocated locally (shared by every client of this signer)
+        self.nonces = get_nonce_manager(self.address)
+        
+        # View call results for the current head block
+        self.views = ViewCache(
+            self.contracts.multicall,
+            max_head_age=config.get('network.view_cache_max_age_seconds', DEFAULT_MAX_HEAD_AGE_SECONDS)
+        )
+        
+        # Receipts of every in-flight transaction, polled in one batch per
+        # block; the heads those polls see also invalidate the view cache
+        self.receipts = ReceiptTracker(
+            self.w3,
+            poll_interval=config.get('network.receipt_poll_interval_seconds', DEFAULT_POLL_INTERVAL_SECONDS),
+            on_block=self.views.observe_block
+        )
+        
         log.info(f"Web3 client initialized for address: {self.address}")
         
         # Check connection
@@ -71,30 +106,9 @@ class Web3Client:
         """
         addr = address or self.address
         
-        # ERC20 ABI (simplified)
-        erc20_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "type": "function"
-            }
-        ]
-        
-        contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=erc20_abi
-        )
+        contract = self.contracts.erc20(token_address)
         
-        balance = contract.functions.balanceOf(Web3.to_checksum_address(addr)).call()
+        balance = contract.functions.balanceOf(to_checksum_address(addr)).call()
         decimals = contract.functions.decimals().call()
         
         return balance / (10 ** decimals)
@@ -138,34 +152,54 @@ class Web3Client:
         Returns:
             Transaction hash
         """
-        nonce = self.w3.eth.get_transaction_count(self.address)
-        
-        transaction = {
-            'from': self.address,
-            'to': Web3.to_checksum_address(to),
-            'value': value,
-            'nonce': nonce,
-            'chainId': self.chain_id,
-            'gasPrice': gas_price or self.get_gas_price()
-        }
-        
-        if data:
-            transaction['data'] = data
-        
-        # Estimate gas if not provided
-        if gas_limit is None:
-            estimated_gas = self.estimate_gas(transaction)
-            gas_limit = int(estimated_gas * 1.2)  # 20% buffer
+        def build(nonce: int) -> Dict[str, Any]:
+            transaction = {
+                'from': self.address,
+                'to': to_checksum_address(to),
+                'value': value,
+                'nonce': nonce,
+                'chainId': self.chain_id,
+                'gasPrice': gas_price or self.get_gas_price()
+            }
+            
+            if data:
+                transaction['data'] = data
+            
+            # Estimate gas if not provided
+            if gas_limit is None:
+                estimated_gas = self.estimate_gas(transaction)
+                transaction['gas'] = int(estimated_gas * 1.2)  # 20% buffer
+            else:
+                transaction['gas'] = gas_limit
+            
+            return transaction
+        
+        tx_hash = self.sign_and_send(build)
+        
+        log.info(f"Transaction sent: {tx_hash}")
+        
+        return tx_hash
+    
+    def sign_and_send(self, build_transaction: Callable[[int], Dict[str, Any]]) -> str:
+        """
+        Sign and broadcast a transaction with a locally allocated nonce.
         
-        transaction['gas'] = gas_limit
+        The nonce comes from the signer's NonceManager, so transactions can
+        be sent back-to-back without waiting for earlier ones to be mined.
+        On a nonce conflict the manager resyncs and the transaction is
+        rebuilt with a fresh nonce.
         
-        # Sign and send
-        signed_txn = self.account.sign_transaction(transaction)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        Args:
+            build_transaction: Returns the transaction dict for a nonce
         
-        log.info(f"Transaction sent: {tx_hash.hex()}")
+        Returns:
+            Transaction hash
+        """
+        def submit(nonce: int) -> str:
+            signed_txn = self.account.sign_transaction(build_transaction(nonce))
+            return self.w3.eth.send_raw_transaction(signed_txn.rawTransaction).hex()
         
-        return tx_hash.hex()
+        return self.nonces.send(self.w3, submit)
     
     def wait_for_transaction(self, tx_hash: str, timeout: int = 120) -> Dict[str, Any]:
         """
@@ -179,7 +213,7 @@ class Web3Client:
             Transaction receipt
         """
         log.info(f"Waiting for transaction: {tx_hash}")
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        receipt = self.receipts.wait(tx_hash, timeout=timeout)
         
         if receipt['status'] == 1:
             log.info(f"Transaction confirmed: {tx_hash}")
@@ -209,10 +243,7 @@ class Web3Client:
         Returns:
             Function result
         """
-        contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(contract_address),
-            abi=abi
-        )
+        contract = self.contracts.get(contract_address, abi)
         
         function = getattr(contract.functions, function_name)
         return function(*args).call(**kwargs)
@@ -242,33 +273,32 @@ class Web3Client:
         Returns:
             Transaction hash
         """
-        contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(contract_address),
-            abi=abi
-        )
+        contract = self.contracts.get(contract_address, abi)
         
         function = getattr(contract.functions, function_name)
-        transaction = function(*args).build_transaction({
-            'from': self.address,
-            'value': value,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-            'chainId': self.chain_id,
-            'gasPrice': self.get_gas_price()
-        })
-        
-        if gas_limit:
-            transaction['gas'] = gas_limit
-        else:
-            estimated_gas = self.estimate_gas(transaction)
-            transaction['gas'] = int(estimated_gas * 1.2)
         
-        signed_txn = self.account.sign_transaction(transaction)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        
-        log.info(f"Contract function executed: {function_name} - TX: {tx_hash.hex()}")
-        
-        return tx_hash.hex()
-
+        def build(nonce: int) -> Dict[str, Any]:
+            transaction = function(*args).build_transaction({
+                'from': self.address,
+                'value': value,
+                'nonce': nonce,
+                'chainId': self.chain_id,
+                'gasPrice': self.get_gas_price()
+            })
+            
+            if gas_limit:
+                transaction['gas'] = gas_limit
+            else:
+                estimated_gas = self.estimate_gas(transaction)
+                transaction['gas'] = int(estimated_gas * 1.2)
+            
+            return transaction
+        
+        tx_hash = self.sign_and_send(build)
+        
+        log.info(f"Contract function executed: {function_name} - TX: {tx_hash}")
+        
+        return tx_hash
 
 # Global Web3 client instance
 _web3_client = None
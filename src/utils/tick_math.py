@@ -0,0 +1,604 @@
+"""
+Exact integer Uniswap V3 math (TickMath, SqrtPriceMath, SwapMath, LiquidityAmounts).
+
+Pure-Python port of the on-chain libraries operating on Q64.96 fixed point
+integers, so results match the contracts bit for bit. Unlike the float
+helpers in math.py this never drifts from what the pool computes, which lets
+us derive exact mint/burn amounts locally instead of asking the chain.
+"""
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# TickMath bounds
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+Q128 = 1 << 128
+MAX_UINT128 = (1 << 128) - 1
+MAX_UINT160 = (1 << 160) - 1
+MAX_UINT256 = (1 << 256) - 1
+
+# Multipliers used by getSqrtRatioAtTick: 1 / sqrt(1.0001) ** (2 ** i) as Q128.128
+_TICK_MULTIPLIERS = (
+    0xfff97272373d413259a46990580e213a,
+    0xfff2e50f5f656932ef12357cf3c7fdcc,
+    0xffe5caca7e10e4e61c3624eaa0941cd0,
+    0xffcb9843d60f6159c9db58835c926644,
+    0xff973b41fa98c081472e6896dfb254c0,
+    0xff2ea16466c96a3843ec78b326b52861,
+    0xfe5dee046a99a2a811c461f1969c3053,
+    0xfcbe86c7900a88aedcffc83b479aa3a4,
+    0xf987a7253ac413176f2b074cf7815e54,
+    0xf3392b0822b70005940c7a398e4b70f3,
+    0xe7159475a2c29b7443b29c7fa6e889d9,
+    0xd097f3bdfd2022b8845ad8f792aa5825,
+    0xa9f746462d870fdf8a65dc1f90e061e5,
+    0x70d869a156d2a1b890bb3df62baf32f7,
+    0x31be135f97d08fd981231505542fcfa6,
+    0x9aa508b5b7a84e1c677de54f3e99bc9,
+    0x5d6af8dedb81196699c329225ee604,
+    0x2216e584f5fa1ea926041bedfe98,
+    0x48a170391f7dc42444e8fa2,
+)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """
+    Calculate sqrt(1.0001 ** tick) * 2 ** 96 exactly as TickMath does.
+
+    Args:
+        tick: Tick value
+
+    Returns:
+        sqrtPriceX96 (Q64.96)
+    """
+    abs_tick = -tick if tick < 0 else tick
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} out of bounds")
+
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 0x100000000000000000000000000000000
+    for i, multiplier in enumerate(_TICK_MULTIPLIERS, start=1):
+        if abs_tick & (1 << i):
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Round up when converting Q128.128 down to Q128.96
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """
+    Calculate the greatest tick whose sqrt ratio is <= sqrt_price_x96.
+
+    Args:
+        sqrt_price_x96: sqrtPriceX96 (Q64.96)
+
+    Returns:
+        Tick value
+    """
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"sqrtPriceX96 {sqrt_price_x96} out of bounds")
+
+    ratio = sqrt_price_x96 << 32
+    msb = ratio.bit_length() - 1
+
+    if msb >= 128:
+        r = ratio >> (msb - 127)
+    else:
+        r = ratio << (127 - msb)
+
+    log_2 = (msb - 128) << 64
+    for shift in range(63, 49, -1):
+        r = (r * r) >> 127
+        f = r >> 128
+        log_2 |= f << shift
+        r >>= f
+
+    log_sqrt10001 = log_2 * 255738958999603826347141  # 128.128 number
+
+    tick_low = (log_sqrt10001 - 3402992956809132418596140100660247210) >> 128
+    tick_high = (log_sqrt10001 + 291339464771989622907027621153398088495) >> 128
+
+    if tick_low == tick_high:
+        return tick_low
+    return tick_high if get_sqrt_ratio_at_tick(tick_high) <= sqrt_price_x96 else tick_low
+
+
+class SqrtRatioTable:
+    """
+    Precomputed getSqrtRatioAtTick values for one tick spacing.
+
+    The full table for small spacings is large (1.7M entries for spacing 1),
+    so it is filled lazily in fixed-size blocks: the first lookup in a block
+    computes the whole block, every later lookup in it is a list index.
+    """
+
+    BLOCK_SIZE = 1024
+
+    def __init__(self, tick_spacing: int):
+        """
+        Initialize table.
+
+        Args:
+            tick_spacing: Pool tick spacing
+        """
+        if tick_spacing <= 0:
+            raise ValueError(f"Invalid tick spacing: {tick_spacing}")
+
+        self.tick_spacing = tick_spacing
+        self.min_index = -(MAX_TICK // tick_spacing)
+        self.max_index = MAX_TICK // tick_spacing
+        self._blocks: Dict[int, List[int]] = {}
+
+    def _block(self, block_id: int) -> List[int]:
+        """Get (computing on first use) one block of the table."""
+        block = self._blocks.get(block_id)
+        if block is None:
+            start = block_id * self.BLOCK_SIZE
+            stop = min(start + self.BLOCK_SIZE, self.max_index + 1)
+            start = max(start, self.min_index)
+            offset = start - block_id * self.BLOCK_SIZE
+            block = [0] * offset + [
+                get_sqrt_ratio_at_tick(index * self.tick_spacing) for index in range(start, stop)
+            ]
+            self._blocks[block_id] = block
+        return block
+
+    def get(self, tick: int) -> int:
+        """
+        Get sqrtPriceX96 for a tick.
+
+        Ticks that are not multiples of the spacing fall back to the direct
+        computation.
+
+        Args:
+            tick: Tick value
+
+        Returns:
+            sqrtPriceX96
+        """
+        index, remainder = divmod(tick, self.tick_spacing)
+        if remainder or not self.min_index <= index <= self.max_index:
+            return get_sqrt_ratio_at_tick(tick)
+
+        block_id, offset = divmod(index, self.BLOCK_SIZE)
+        return self._block(block_id)[offset]
+
+    def warm(self, tick_lower: int, tick_upper: int):
+        """
+        Precompute all blocks covering [tick_lower, tick_upper].
+
+        Args:
+            tick_lower: Lower tick
+            tick_upper: Upper tick
+        """
+        first = max(tick_lower // self.tick_spacing, self.min_index) // self.BLOCK_SIZE
+        last = min(tick_upper // self.tick_spacing, self.max_index) // self.BLOCK_SIZE
+        for block_id in range(first, last + 1):
+            self._block(block_id)
+
+    def __len__(self) -> int:
+        """Number of computed entries."""
+        return sum(len(block) for block in self._blocks.values())
+
+
+@lru_cache(maxsize=None)
+def get_sqrt_ratio_table(tick_spacing: int) -> SqrtRatioTable:
+    """Get the shared sqrt ratio table for a tick spacing."""
+    return SqrtRatioTable(tick_spacing)
+
+
+# FullMath / UnsafeMath helpers
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    """floor(a * b / denominator) with full precision (FullMath.mulDiv)."""
+    if denominator == 0:
+        raise ZeroDivisionError("mulDiv denominator is zero")
+    result = (a * b) // denominator
+    if result > MAX_UINT256:
+        raise OverflowError("mulDiv overflow")
+    return result
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """ceil(a * b / denominator) with full precision (FullMath.mulDivRoundingUp)."""
+    result = mul_div(a, b, denominator)
+    if (a * b) % denominator:
+        result += 1
+        if result > MAX_UINT256:
+            raise OverflowError("mulDivRoundingUp overflow")
+    return result
+
+
+def div_rounding_up(x: int, y: int) -> int:
+    """ceil(x / y) (UnsafeMath.divRoundingUp)."""
+    return x // y + (1 if x % y else 0)
+
+
+# SqrtPriceMath
+
+def _sort(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int) -> Tuple[int, int]:
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        return sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    return sqrt_ratio_a_x96, sqrt_ratio_b_x96
+
+
+def get_amount0_delta(
+    sqrt_ratio_a_x96: int,
+    sqrt_ratio_b_x96: int,
+    liquidity: int,
+    round_up: bool
+) -> int:
+    """
+    Amount of token0 between two prices for a liquidity (SqrtPriceMath.getAmount0Delta).
+
+    Args:
+        sqrt_ratio_a_x96: A sqrt price
+        sqrt_ratio_b_x96: Another sqrt price
+        liquidity: Liquidity amount (uint128)
+        round_up: Whether to round the amount up or down
+
+    Returns:
+        Amount of token0
+    """
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+    if sqrt_ratio_a_x96 <= 0:
+        raise ValueError("sqrt ratio must be positive")
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+
+    if round_up:
+        return div_rounding_up(
+            mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b_x96),
+            sqrt_ratio_a_x96
+        )
+    return mul_div(numerator1, numerator2, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(
+    sqrt_ratio_a_x96: int,
+    sqrt_ratio_b_x96: int,
+    liquidity: int,
+    round_up: bool
+) -> int:
+    """
+    Amount of token1 between two prices for a liquidity (SqrtPriceMath.getAmount1Delta).
+
+    Args:
+        sqrt_ratio_a_x96: A sqrt price
+        sqrt_ratio_b_x96: Another sqrt price
+        liquidity: Liquidity amount (uint128)
+        round_up: Whether to round the amount up or down
+
+    Returns:
+        Amount of token1
+    """
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+    return mul_div(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+
+
+def get_amount0_delta_signed(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int) -> int:
+    """Signed token0 delta for a signed liquidity change (as used by Pool.modifyPosition)."""
+    if liquidity < 0:
+        return -get_amount0_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, -liquidity, False)
+    return get_amount0_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, True)
+
+
+def get_amount1_delta_signed(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int) -> int:
+    """Signed token1 delta for a signed liquidity change (as used by Pool.modifyPosition)."""
+    if liquidity < 0:
+        return -get_amount1_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, -liquidity, False)
+    return get_amount1_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, True)
+
+
+def get_next_sqrt_price_from_amount0_rounding_up(
+    sqrt_price_x96: int,
+    liquidity: int,
+    amount: int,
+    add: bool
+) -> int:
+    """Price after adding or removing token0 (SqrtPriceMath.getNextSqrtPriceFromAmount0RoundingUp)."""
+    if amount == 0:
+        return sqrt_price_x96
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price_x96
+
+    if add:
+        if product <= MAX_UINT256 and numerator1 + product <= MAX_UINT256:
+            return mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 + product)
+        # Overflow path of the contract, rounded the same way
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount)
+
+    if product > MAX_UINT256 or numerator1 <= product:
+        raise ValueError("Not enough token0 liquidity for the output")
+    result = mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 - product)
+    if result > MAX_UINT160:
+        raise OverflowError("sqrt price overflows uint160")
+    return result
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(
+    sqrt_price_x96: int,
+    liquidity: int,
+    amount: int,
+    add: bool
+) -> int:
+    """Price after adding or removing token1 (SqrtPriceMath.getNextSqrtPriceFromAmount1RoundingDown)."""
+    if add:
+        result = sqrt_price_x96 + mul_div(amount, Q96, liquidity)
+        if result > MAX_UINT160:
+            raise OverflowError("sqrt price overflows uint160")
+        return result
+
+    quotient = mul_div_rounding_up(amount, Q96, liquidity)
+    if sqrt_price_x96 <= quotient:
+        raise ValueError("Not enough token1 liquidity for the output")
+    return sqrt_price_x96 - quotient
+
+
+def get_next_sqrt_price_from_input(sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool) -> int:
+    """Price after swapping amount_in in (SqrtPriceMath.getNextSqrtPriceFromInput)."""
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("sqrt price and liquidity must be positive")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96, liquidity, amount_in, True)
+    return get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96, liquidity, amount_in, True)
+
+
+def get_next_sqrt_price_from_output(sqrt_price_x96: int, liquidity: int, amount_out: int, zero_for_one: bool) -> int:
+    """Price after swapping amount_out out (SqrtPriceMath.getNextSqrtPriceFromOutput)."""
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("sqrt price and liquidity must be positive")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96, liquidity, amount_out, False)
+    return get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96, liquidity, amount_out, False)
+
+
+# SwapMath
+
+def compute_swap_step(
+    sqrt_ratio_current_x96: int,
+    sqrt_ratio_target_x96: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int
+) -> Tuple[int, int, int, int]:
+    """
+    One step of a swap within a single liquidity range (SwapMath.computeSwapStep).
+
+    Args:
+        sqrt_ratio_current_x96: Current pool sqrt price
+        sqrt_ratio_target_x96: Price the step may not pass (next tick or the limit)
+        liquidity: Active liquidity
+        amount_remaining: Amount still to swap: positive for exact input,
+            negative for exact output
+        fee_pips: Pool fee in hundredths of a bip (500 = 0.05%)
+
+    Returns:
+        (sqrt price after the step, amount in, amount out, fee amount)
+    """
+    zero_for_one = sqrt_ratio_current_x96 >= sqrt_ratio_target_x96
+    exact_in = amount_remaining >= 0
+
+    if exact_in:
+        amount_remaining_less_fee = mul_div(amount_remaining, 1000000 - fee_pips, 1000000)
+        if zero_for_one:
+            amount_in = get_amount0_delta(sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, True)
+        else:
+            amount_in = get_amount1_delta(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, True)
+        if amount_remaining_less_fee >= amount_in:
+            sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+        else:
+            sqrt_ratio_next_x96 = get_next_sqrt_price_from_input(
+                sqrt_ratio_current_x96, liquidity, amount_remaining_less_fee, zero_for_one
+            )
+    else:
+        if zero_for_one:
+            amount_out = get_amount1_delta(sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, False)
+        else:
+            amount_out = get_amount0_delta(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, False)
+        if -amount_remaining >= amount_out:
+            sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+        else:
+            sqrt_ratio_next_x96 = get_next_sqrt_price_from_output(
+                sqrt_ratio_current_x96, liquidity, -amount_remaining, zero_for_one
+            )
+
+    reached_target = sqrt_ratio_target_x96 == sqrt_ratio_next_x96
+
+    # Amounts of a step that stopped short of the target are recomputed from the price reached
+    if zero_for_one:
+        if not (reached_target and exact_in):
+            amount_in = get_amount0_delta(sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, True)
+        if not (reached_target and not exact_in):
+            amount_out = get_amount1_delta(sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, False)
+    else:
+        if not (reached_target and exact_in):
+            amount_in = get_amount1_delta(sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, True)
+        if not (reached_target and not exact_in):
+            amount_out = get_amount0_delta(sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, False)
+
+    # Output can't exceed what was asked for
+    if not exact_in and amount_out > -amount_remaining:
+        amount_out = -amount_remaining
+
+    if exact_in and sqrt_ratio_next_x96 != sqrt_ratio_target_x96:
+        # Input ran out inside the range: whatever wasn't swapped is the fee
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 1000000 - fee_pips)
+
+    return sqrt_ratio_next_x96, amount_in, amount_out, fee_amount
+
+
+# LiquidityAmounts (periphery)
+
+def _to_uint128(x: int) -> int:
+    if x > MAX_UINT128:
+        raise OverflowError("liquidity overflows uint128")
+    return x
+
+
+def get_liquidity_for_amount0(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, amount0: int) -> int:
+    """Liquidity received for an amount of token0 (LiquidityAmounts.getLiquidityForAmount0)."""
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+    intermediate = mul_div(sqrt_ratio_a_x96, sqrt_ratio_b_x96, Q96)
+    return _to_uint128(mul_div(amount0, intermediate, sqrt_ratio_b_x96 - sqrt_ratio_a_x96))
+
+
+def get_liquidity_for_amount1(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, amount1: int) -> int:
+    """Liquidity received for an amount of token1 (LiquidityAmounts.getLiquidityForAmount1)."""
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+    return _to_uint128(mul_div(amount1, Q96, sqrt_ratio_b_x96 - sqrt_ratio_a_x96))
+
+
+def get_liquidity_for_amounts(
+    sqrt_ratio_x96: int,
+    sqrt_ratio_a_x96: int,
+    sqrt_ratio_b_x96: int,
+    amount0: int,
+    amount1: int
+) -> int:
+    """
+    Maximum liquidity for the given amounts at the current price
+    (LiquidityAmounts.getLiquidityForAmounts).
+
+    Args:
+        sqrt_ratio_x96: Current pool sqrt price
+        sqrt_ratio_a_x96: Sqrt price at one range boundary
+        sqrt_ratio_b_x96: Sqrt price at the other range boundary
+        amount0: Amount of token0 available
+        amount1: Amount of token1 available
+
+    Returns:
+        Liquidity
+    """
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+
+    if sqrt_ratio_x96 <= sqrt_ratio_a_x96:
+        return get_liquidity_for_amount0(sqrt_ratio_a_x96, sqrt_ratio_b_x96, amount0)
+    elif sqrt_ratio_x96 < sqrt_ratio_b_x96:
+        liquidity0 = get_liquidity_for_amount0(sqrt_ratio_x96, sqrt_ratio_b_x96, amount0)
+        liquidity1 = get_liquidity_for_amount1(sqrt_ratio_a_x96, sqrt_ratio_x96, amount1)
+        return min(liquidity0, liquidity1)
+    else:
+        return get_liquidity_for_amount1(sqrt_ratio_a_x96, sqrt_ratio_b_x96, amount1)
+
+
+def get_amount0_for_liquidity(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int) -> int:
+    """Token0 value of a liquidity over a range (LiquidityAmounts.getAmount0ForLiquidity)."""
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+    return mul_div(liquidity << 96, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_for_liquidity(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int) -> int:
+    """Token1 value of a liquidity over a range (LiquidityAmounts.getAmount1ForLiquidity)."""
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+    return mul_div(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+
+
+def get_amounts_for_liquidity(
+    sqrt_ratio_x96: int,
+    sqrt_ratio_a_x96: int,
+    sqrt_ratio_b_x96: int,
+    liquidity: int
+) -> Tuple[int, int]:
+    """
+    Token amounts represented by a liquidity at the current price
+    (LiquidityAmounts.getAmountsForLiquidity).
+
+    Args:
+        sqrt_ratio_x96: Current pool sqrt price
+        sqrt_ratio_a_x96: Sqrt price at one range boundary
+        sqrt_ratio_b_x96: Sqrt price at the other range boundary
+        liquidity: Liquidity
+
+    Returns:
+        (amount0, amount1)
+    """
+    sqrt_ratio_a_x96, sqrt_ratio_b_x96 = _sort(sqrt_ratio_a_x96, sqrt_ratio_b_x96)
+
+    if sqrt_ratio_x96 <= sqrt_ratio_a_x96:
+        return get_amount0_for_liquidity(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity), 0
+    elif sqrt_ratio_x96 < sqrt_ratio_b_x96:
+        return (
+            get_amount0_for_liquidity(sqrt_ratio_x96, sqrt_ratio_b_x96, liquidity),
+            get_amount1_for_liquidity(sqrt_ratio_a_x96, sqrt_ratio_x96, liquidity)
+        )
+    else:
+        return 0, get_amount1_for_liquidity(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity)
+
+
+def get_mint_amounts(
+    sqrt_price_x96: int,
+    tick_lower: int,
+    tick_upper: int,
+    amount0_desired: int,
+    amount1_desired: int,
+    tick_spacing: int = 1
+) -> Tuple[int, int, int]:
+    """
+    Exact (liquidity, amount0, amount1) a NonfungiblePositionManager.mint would produce.
+
+    Mirrors LiquidityManagement.addLiquidity: liquidity from the desired
+    amounts, then the pool rounds the owed amounts up.
+
+    Args:
+        sqrt_price_x96: Current pool sqrt price
+        tick_lower: Lower tick of the range
+        tick_upper: Upper tick of the range
+        amount0_desired: Desired token0 amount
+        amount1_desired: Desired token1 amount
+        tick_spacing: Pool tick spacing (selects the cached sqrt ratio table)
+
+    Returns:
+        (liquidity, amount0, amount1)
+    """
+    table = get_sqrt_ratio_table(tick_spacing)
+    sqrt_ratio_a_x96 = table.get(tick_lower)
+    sqrt_ratio_b_x96 = table.get(tick_upper)
+
+    liquidity = get_liquidity_for_amounts(
+        sqrt_price_x96, sqrt_ratio_a_x96, sqrt_ratio_b_x96, amount0_desired, amount1_desired
+    )
+
+    if sqrt_price_x96 <= sqrt_ratio_a_x96:
+        amount0 = get_amount0_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, True)
+        amount1 = 0
+    elif sqrt_price_x96 < sqrt_ratio_b_x96:
+        amount0 = get_amount0_delta(sqrt_price_x96, sqrt_ratio_b_x96, liquidity, True)
+        amount1 = get_amount1_delta(sqrt_ratio_a_x96, sqrt_price_x96, liquidity, True)
+    else:
+        amount0 = 0
+        amount1 = get_amount1_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, True)
+
+    return liquidity, amount0, amount1
+
+
+def sqrt_price_x96_to_price(sqrt_price_x96: int, decimals0: int = 0, decimals1: int = 0) -> float:
+    """
+    Convert sqrtPriceX96 to a float price (token1/token0).
+
+    The square is taken in integer arithmetic first, so the only rounding is
+    the final conversion to float.
+
+    Args:
+        sqrt_price_x96: sqrtPriceX96 (Q64.96)
+        decimals0: Token0 decimals (0 for the raw pool price)
+        decimals1: Token1 decimals (0 for the raw pool price)
+
+    Returns:
+        Price as token1/token0
+    """
+    numerator = sqrt_price_x96 * sqrt_price_x96 * 10 ** decimals0
+    denominator = (1 << 192) * 10 ** decimals1
+    return numerator / denominator
@@ -0,0 +1,169 @@
+"""
+Vectorized (NumPy) versions of the liquidity math in src/utils/math.py.
+
+Every function mirrors its scalar counterpart in ``math.py`` but accepts
+arrays (or anything broadcastable to arrays) and returns arrays. The
+in-range / below-range / above-range branching is done with boolean masks
+instead of ``if``/``elif`` so whole price histories or position books can be
+evaluated in a single call.
+"""
+from typing import Tuple
+import numpy as np
+
+# Natural log of the Uniswap V3 tick base (1.0001)
+LOG_TICK_BASE = np.log(1.0001)
+
+
+def price_to_tick(prices, tick_spacing: int = 1) -> np.ndarray:
+    """
+    Convert prices to ticks.
+
+    Args:
+        prices: Prices as token1/token0
+        tick_spacing: Tick spacing (e.g., 60 for 0.3% fee tier)
+
+    Returns:
+        Array of int64 tick values
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    ticks = np.floor(np.log(prices) / LOG_TICK_BASE)
+    # np.round uses round-half-to-even, same as Python's round()
+    return (np.round(ticks / tick_spacing) * tick_spacing).astype(np.int64)
+
+
+def tick_to_price(ticks) -> np.ndarray:
+    """
+    Convert ticks to prices.
+
+    Args:
+        ticks: Tick values
+
+    Returns:
+        Array of prices as token1/token0
+    """
+    return np.exp(np.asarray(ticks, dtype=np.float64) * LOG_TICK_BASE)
+
+
+def get_tick_range(
+    current_prices,
+    price_range_percent,
+    tick_spacing: int = 60
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate tick ranges around current prices.
+
+    Args:
+        current_prices: Current prices (token1/token0)
+        price_range_percent: Range as percent (e.g., 0.05 = 5%), scalar or per-price
+        tick_spacing: Tick spacing
+
+    Returns:
+        (lower_ticks, upper_ticks)
+    """
+    current_prices = np.asarray(current_prices, dtype=np.float64)
+    price_range_percent = np.asarray(price_range_percent, dtype=np.float64)
+
+    lower_ticks = price_to_tick(current_prices * (1 - price_range_percent), tick_spacing)
+    upper_ticks = price_to_tick(current_prices * (1 + price_range_percent), tick_spacing)
+
+    return lower_ticks, upper_ticks
+
+
+def calculate_liquidity(
+    amount0,
+    amount1,
+    price_current,
+    price_lower,
+    price_upper
+) -> np.ndarray:
+    """
+    Calculate liquidity for given amounts and price ranges.
+
+    Args:
+        amount0: Amounts of token0
+        amount1: Amounts of token1
+        price_current: Current prices
+        price_lower: Lower price bounds
+        price_upper: Upper price bounds
+
+    Returns:
+        Array of liquidity values
+    """
+    amount0, amount1, price_current, price_lower, price_upper = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in
+          (amount0, amount1, price_current, price_lower, price_upper))
+    )
+
+    sqrt_price_current = np.sqrt(price_current)
+    sqrt_price_lower = np.sqrt(price_lower)
+    sqrt_price_upper = np.sqrt(price_upper)
+
+    below = price_current <= price_lower
+    above = price_current >= price_upper
+
+    # Branches that don't apply to an element may divide by zero; those
+    # results are discarded by the masks below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Only token0
+        liquidity_below = amount0 / (1 / sqrt_price_lower - 1 / sqrt_price_upper)
+        # Only token1
+        liquidity_above = amount1 / (sqrt_price_upper - sqrt_price_lower)
+        # Mixed
+        liquidity0 = amount0 / (1 / sqrt_price_current - 1 / sqrt_price_upper)
+        liquidity1 = amount1 / (sqrt_price_current - sqrt_price_lower)
+        liquidity_in_range = np.minimum(liquidity0, liquidity1)
+
+    return np.where(below, liquidity_below, np.where(above, liquidity_above, liquidity_in_range))
+
+
+def calculate_amounts_from_liquidity(
+    liquidity,
+    price_current,
+    price_lower,
+    price_upper
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate token amounts for given liquidity and price ranges.
+
+    Args:
+        liquidity: Liquidity amounts
+        price_current: Current prices
+        price_lower: Lower price bounds
+        price_upper: Upper price bounds
+
+    Returns:
+        (amount0, amount1) arrays
+    """
+    liquidity, price_current, price_lower, price_upper = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in
+          (liquidity, price_current, price_lower, price_upper))
+    )
+
+    # Clamping the current price into [lower, upper] collapses the three
+    # branches of the scalar version into one formula:
+    #   below range -> sqrt_p = sqrt_lower -> amount1 = 0
+    #   above range -> sqrt_p = sqrt_upper -> amount0 = 0
+    sqrt_price_lower = np.sqrt(price_lower)
+    sqrt_price_upper = np.sqrt(price_upper)
+    sqrt_price = np.clip(np.sqrt(price_current), sqrt_price_lower, sqrt_price_upper)
+
+    amount0 = liquidity * (1 / sqrt_price - 1 / sqrt_price_upper)
+    amount1 = liquidity * (sqrt_price - sqrt_price_lower)
+
+    return amount0, amount1
+
+
+def in_range_mask(ticks, tick_lower, tick_upper) -> np.ndarray:
+    """
+    Boolean mask of ticks that fall inside [tick_lower, tick_upper].
+
+    Args:
+        ticks: Current ticks
+        tick_lower: Lower ticks of positions
+        tick_upper: Upper ticks of positions
+
+    Returns:
+        Boolean array, True where in range
+    """
+    ticks = np.asarray(ticks)
+    return (ticks >= np.asarray(tick_lower)) & (ticks <= np.asarray(tick_upper))
@@ -40,6 +40,13 @@ class ServiceManager:
         self.processes.append(("API Server", process))
         return process
     
+    def start_monitor_workers(self, count: int):
+        """Start extra monitor worker processes (they split the positions through shard leases)"""
+        for i in range(count):
+            print(f"📊 Starting monitor worker {i + 2}...")
+            process = subprocess.Popen([sys.executable, str(backend_dir / "start_monitor.py")])
+            self.processes.append((f"Monitor Worker {i + 2}", process))
+    
     async def start_monitoring_service(self):
         """Start the monitoring service"""
         print("📊 Starting position monitoring service...")
@@ -99,6 +106,12 @@ class ServiceManager:
             except Exception as e:
                 print(f"⚠️  API server health check failed: {e}")
             
+            # Extra monitor workers share the database with the API server
+            workers = int(os.getenv("MONITOR_WORKERS", 1))
+            if workers > 1:
+                os.environ.setdefault("MONITOR_SHARDS", str(4 * workers))
+                self.start_monitor_workers(workers - 1)
+            
             # Start monitoring service
             print("📊 Starting monitoring service...")
             await self.start_monitoring_service()